@@ -0,0 +1,76 @@
+'''
+Benchmark of the writer's code paths on a large layer.
+
+Usage::
+
+    python benchmarks/writer_benchmark.py [num_points]
+'''
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from gmplot.google_map_plotter import GoogleMapPlotter
+from gmplot.utility import StringIO, _format_LatLng
+from gmplot.writer import _Writer
+
+def _time(function, repeat=3):
+    '''
+    Time the given function.
+
+    Args:
+        function (callable): Function to time.
+
+    Optional:
+
+    Args:
+        repeat (int): Number of times to run the function. Defaults to 3.
+
+    Returns:
+        float: Best run time, in seconds.
+    '''
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def _write_layer(write_points, num_points):
+    '''
+    Write a layer of points the way the drawables do, using the given function to write the points themselves.
+
+    Args:
+        write_points (callable): Function that writes the given lines with the given writer.
+        num_points (int): Number of points in the layer.
+    '''
+    lines = ['%s,' % _format_LatLng(37.428 + i * 1e-6, -122.145 + i * 1e-6, 6) for i in range(num_points)]
+
+    def write_layer():
+        with StringIO() as f:
+            with _Writer(f) as w:
+                w.write('path: [')
+                w.indent()
+                write_points(w, lines)
+                w.dedent()
+                w.write(']')
+
+    return write_layer
+
+def main(num_points):
+    print('Writing a %d-point layer:' % num_points)
+
+    # Content with a trailing newline is forced through `inspect.cleandoc()` (the multi-line template path),
+    # which is what every single-line write used to go through:
+    baseline = _time(_write_layer(lambda w, lines: [w.write(line + '\n') for line in lines], num_points))
+    print('    write(), template path:    %.3fs' % baseline)
+
+    for name, write_points in [
+        ('write(), single-line path', lambda w, lines: [w.write(line) for line in lines]),
+        ('write_lines()', lambda w, lines: w.write_lines(lines))
+    ]:
+        elapsed = _time(_write_layer(write_points, num_points))
+        print('    %-26s %.3fs (%.1fx faster)' % (name + ':', elapsed, baseline / elapsed))
+
+    gmap = GoogleMapPlotter(37.428, -122.145, 16)
+    gmap.plot([37.428 + i * 1e-6 for i in range(num_points)], [-122.145 + i * 1e-6 for i in range(num_points)])
+    print('GoogleMapPlotter.get() with a %d-point plot(): %.3fs' % (num_points, _time(gmap.get)))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -1 +1,4 @@
 from .google_map_plotter import GoogleMapPlotter
+from .batch import render_many
+from .gazetteer import Gazetteer
+from .geocode_cache import GeocodeCache
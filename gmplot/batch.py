@@ -0,0 +1,129 @@
+import io
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from gmplot.context import _Context
+
+_ICON_FOLDER = 'icons'
+# Note: This is the folder (within the output folder) that holds the icons shared by all maps.
+
+def _render_map(name, plotter, out_dir):
+    '''
+    Render a map to its file, referencing the shared icon files rather than embedding the icons.
+
+    Args:
+        name (str): File name of the map, relative to the output folder.
+        plotter (GoogleMapPlotter): Plotter of the map.
+        out_dir (str): Output folder.
+
+    Returns:
+        (int, set): Size of the map's file, in bytes, along with the paths of the icons it references.
+    '''
+    path = os.path.join(out_dir, name)
+    folder = os.path.dirname(path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    icon_url = os.path.relpath(os.path.join(out_dir, _ICON_FOLDER), folder).replace(os.sep, '/') + '/'
+    context = _Context(icon_url)
+    with io.open(path, 'w', encoding='utf-8') as f:
+        plotter._write_html(f, context)
+
+    return os.path.getsize(path), context.icon_paths
+
+def render_many(plotters, out_dir, workers=None):
+    '''
+    Render many maps to HTML files at once, in parallel processes.
+
+    Instead of each map embedding its own copy of the marker icons, the icons are written once to an 'icons' folder
+    within the output folder, and shared by all of the maps.
+
+    Args:
+        plotters (dict or iterable): File name of each map (relative to the output folder) along with its
+            :class:`GoogleMapPlotter`, either as a dict or as an iterable of (name, plotter) pairs.
+            Plotters are only taken from the iterable as workers free up, so a generator keeps
+            a bounded number of plotters in memory, no matter how many maps there are.
+        out_dir (str): Output folder.
+
+    Optional:
+
+    Args:
+        workers (int): Number of worker processes to render the maps with.
+            If 1, the maps are rendered in the current process. Defaults to the number of CPUs.
+
+    Returns:
+        dict: Rendering statistics, with the following keys:
+            - num_maps (int): Number of maps rendered.
+            - num_bytes (int): Total size of the rendered maps, in bytes.
+            - seconds (float): Time spent rendering, in seconds.
+            - maps_per_second (float): Throughput, in maps per second.
+
+    Usage::
+
+        import gmplot
+        apikey = '' # (your API key here)
+
+        def get_plotters():
+            for vehicle, (lats, lngs) in vehicle_paths.items():
+                gmap = gmplot.GoogleMapPlotter(37.766956, -122.438481, 13, apikey=apikey)
+                gmap.plot(lats, lngs)
+                gmap.marker(lats[-1], lngs[-1], color='red')
+                yield '%s.html' % vehicle, gmap
+
+        if __name__ == '__main__':
+            stats = gmplot.render_many(get_plotters(), 'maps', workers=8)
+            print('%(num_maps)d maps at %(maps_per_second).1f maps/s' % stats)
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('`workers` must be positive!')
+
+    if isinstance(plotters, dict):
+        plotters = plotters.items()
+
+    icon_dir = os.path.join(out_dir, _ICON_FOLDER)
+    if not os.path.isdir(icon_dir):
+        os.makedirs(icon_dir)
+
+    start_time = time.time()
+    num_maps = 0
+    num_bytes = 0
+    icon_paths = set()
+
+    def add_result(result):
+        size, paths = result
+        for path in paths - icon_paths:
+            shutil.copyfile(path, os.path.join(icon_dir, os.path.basename(path)))
+        icon_paths.update(paths)
+        return size
+
+    if workers == 1:
+        for name, plotter in plotters:
+            num_bytes += add_result(_render_map(name, plotter, out_dir))
+            num_maps += 1
+    else:
+        # Keep a couple of maps queued per worker, taking the next plotter whenever a map is done:
+        with ProcessPoolExecutor(workers) as executor:
+            pending = set()
+            for name, plotter in plotters:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        num_bytes += add_result(future.result())
+                        num_maps += 1
+                pending.add(executor.submit(_render_map, name, plotter, out_dir))
+
+            for future in pending:
+                num_bytes += add_result(future.result())
+                num_maps += 1
+
+    seconds = time.time() - start_time
+    return {
+        'num_maps': num_maps,
+        'num_bytes': num_bytes,
+        'seconds': seconds,
+        'maps_per_second': num_maps / seconds if seconds > 0 else float('inf')
+    }
@@ -0,0 +1,140 @@
+import numpy as np
+
+def _get_points_within(lats, lngs, bounds):
+    '''
+    Find the points within the given bounds.
+
+    Args:
+        lats ([float]): Latitude of each point.
+        lngs ([float]): Longitude of each point.
+        bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+    Returns:
+        numpy.ndarray: Boolean mask of the points within the bounds (including the points on their edges).
+    '''
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    return (lats >= bounds['south']) & (lats <= bounds['north']) & (lngs >= bounds['west']) & (lngs <= bounds['east'])
+
+def _do_bounds_intersect(box, bounds):
+    '''
+    Check whether a box intersects the given bounds.
+
+    Args:
+        box (dict): Box, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``,
+            which crosses the antimeridian if its west is east of its east.
+        bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+    Returns:
+        bool: True if the box intersects the bounds (including if they only touch), False otherwise.
+    '''
+    if box['south'] > bounds['north'] or box['north'] < bounds['south']:
+        return False
+
+    if box['west'] <= box['east']:
+        return box['west'] <= bounds['east'] and box['east'] >= bounds['west']
+    return box['west'] <= bounds['east'] or box['east'] >= bounds['west']
+
+def _clip_path(lats, lngs, bounds):
+    '''
+    Clip a path to the given bounds, with the `Liang-Barsky algorithm`_.
+
+    All of the path's segments are clipped at once, then the visible runs of segments are joined back into paths.
+
+    Args:
+        lats ([float]): Latitude of each vertex.
+        lngs ([float]): Longitude of each vertex.
+        bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+    Returns:
+        [(numpy.ndarray, numpy.ndarray)]: Latitudes and longitudes of each part of the path within the bounds.
+
+    .. _Liang-Barsky algorithm: https://en.wikipedia.org/wiki/Liang%E2%80%93Barsky_algorithm
+    '''
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    if len(lats) < 2:
+        return [(lats, lngs)] if _get_points_within(lats, lngs, bounds).all() else []
+
+    start_lats, start_lngs = lats[:-1], lngs[:-1]
+    delta_lats, delta_lngs = np.diff(lats), np.diff(lngs)
+
+    # Narrow each segment down to the part that's on the inner side of each edge of the bounds:
+    t_start = np.zeros(len(delta_lats))
+    t_end = np.ones(len(delta_lats))
+    visible = np.ones(len(delta_lats), dtype=bool)
+    for p, q in [
+        (-delta_lngs, start_lngs - bounds['west']),
+        (delta_lngs, bounds['east'] - start_lngs),
+        (-delta_lats, start_lats - bounds['south']),
+        (delta_lats, bounds['north'] - start_lats)
+    ]:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = q / p
+        t_start = np.where(p < 0, np.maximum(t_start, t), t_start)
+        t_end = np.where(p > 0, np.minimum(t_end, t), t_end)
+        visible &= (p != 0) | (q >= 0)
+    visible &= t_start <= t_end
+
+    # Start a new part at each visible segment that isn't joined to the previous one through a vertex within the bounds:
+    indices = np.flatnonzero(visible)
+    if len(indices) == 0:
+        return []
+    joined = np.zeros(len(indices), dtype=bool)
+    joined[1:] = (np.diff(indices) == 1) & (t_end[indices[:-1]] == 1) & (t_start[indices[1:]] == 0)
+
+    # Each part is the start of its first segment, followed by the end of each of its segments:
+    get_points = lambda t: (start_lats[indices] + t * delta_lats[indices], start_lngs[indices] + t * delta_lngs[indices])
+    segment_start_lats, segment_start_lngs = get_points(t_start[indices])
+    segment_end_lats, segment_end_lngs = get_points(t_end[indices])
+
+    emitted = np.column_stack((~joined, np.ones(len(indices), dtype=bool))).ravel()
+    clipped_lats = np.column_stack((segment_start_lats, segment_end_lats)).ravel()[emitted]
+    clipped_lngs = np.column_stack((segment_start_lngs, segment_end_lngs)).ravel()[emitted]
+
+    part_starts = np.flatnonzero(~joined)
+    part_starts += np.arange(len(part_starts))
+    return list(zip(np.split(clipped_lats, part_starts[1:]), np.split(clipped_lngs, part_starts[1:])))
+
+def _clip_polygon(lats, lngs, bounds):
+    '''
+    Clip a polygon to the given bounds, with the `Sutherland-Hodgman algorithm`_.
+
+    The polygon is clipped against each edge of the bounds in turn, with all of its vertices processed at once.
+
+    Args:
+        lats ([float]): Latitude of each vertex.
+        lngs ([float]): Longitude of each vertex.
+        bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): Latitudes and longitudes of the clipped polygon, which are empty if
+            the polygon is completely outside of the bounds. Parts of the polygon that are only joined
+            outside of the bounds stay joined along the edges of the bounds.
+
+    .. _Sutherland-Hodgman algorithm: https://en.wikipedia.org/wiki/Sutherland%E2%80%93Hodgman_algorithm
+    '''
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+
+    for edge, sign, is_lat in [('west', 1, False), ('east', -1, False), ('south', 1, True), ('north', -1, True)]:
+        if len(lats) == 0:
+            break
+
+        # Signed distance of each vertex to the edge, which is positive on the inner side:
+        distances = sign * ((lats if is_lat else lngs) - bounds[edge])
+        inside = distances >= 0
+        previous_lats, previous_lngs, previous_distances = np.roll(lats, 1), np.roll(lngs, 1), np.roll(distances, 1)
+
+        # Each vertex emits the intersection of its incoming edge with the bound if it crosses it, then itself if it's inside:
+        crossing = inside != np.roll(inside, 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = previous_distances / (previous_distances - distances)
+            intersection_lats = previous_lats + t * (lats - previous_lats)
+            intersection_lngs = previous_lngs + t * (lngs - previous_lngs)
+
+        emitted = np.column_stack((crossing, inside)).ravel()
+        lats = np.column_stack((intersection_lats, lats)).ravel()[emitted]
+        lngs = np.column_stack((intersection_lngs, lngs)).ravel()[emitted]
+
+    return lats, lngs
@@ -0,0 +1,127 @@
+from collections import namedtuple
+
+import numpy as np
+
+from gmplot.utility import _TILE_SIZE, _get_lat_lngs, _get_world_coordinates
+
+_Clusters = namedtuple('Clusters', ['zoom', 'lats', 'lngs', 'counts', 'indices'])
+'''
+Clusters of points at a given zoom level.
+
+Attributes:
+    zoom (int): Zoom level of the clusters.
+    lats (numpy.ndarray): Latitude of each cluster's centroid.
+    lngs (numpy.ndarray): Longitude of each cluster's centroid.
+    counts (numpy.ndarray): Number of points in each cluster.
+    indices (numpy.ndarray): Index of the first point in each cluster (which is the point itself for single-point clusters).
+'''
+
+def _get_clusters(lats, lngs, min_zoom, max_zoom, radius):
+    '''
+    Cluster points at each zoom level.
+
+    Points are clustered on a grid in Web Mercator pixel space, where each grid cell is about ``radius`` pixels wide.
+    Each zoom level is clustered from the clusters of the next (more zoomed-in) zoom level, weighted by their size,
+    so clusters are hierarchical: each cluster is made of whole clusters of the next zoom level. The grids of
+    successive zoom levels don't nest though (the number of cells is rounded up at each level), so a cluster
+    is placed by its centroid rather than by the grid cells of its points.
+
+    Args:
+        lats ([float]): Latitude of each point.
+        lngs ([float]): Longitude of each point.
+        min_zoom (int): Lowest zoom level to cluster at.
+        max_zoom (int): Highest zoom level to cluster at.
+        radius (int): Size of the clustering grid cells, in pixels.
+
+    Returns:
+        [_Clusters]: Clusters at each zoom level, from ``min_zoom`` to ``max_zoom``.
+    '''
+    x, y = _get_world_coordinates(lats, lngs)
+    counts = np.ones(len(x), dtype=np.int64)
+    indices = np.arange(len(x), dtype=np.int64)
+
+    levels = []
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        # Find the grid cell of each cluster from the previous zoom level:
+        num_cells = int(np.ceil(_TILE_SIZE * 2 ** zoom / float(radius)))
+        cell_x = np.minimum((x * num_cells).astype(np.int64), num_cells - 1)
+        cell_y = np.clip((y * num_cells).astype(np.int64), 0, num_cells - 1)
+        cells, first_indices, cluster_indices = np.unique(cell_x * num_cells + cell_y, return_index=True, return_inverse=True)
+        cluster_indices = cluster_indices.ravel()
+
+        # Merge the clusters in each grid cell, placing the new cluster at their weighted centroid:
+        new_counts = np.bincount(cluster_indices, weights=counts).astype(np.int64)
+        x = np.bincount(cluster_indices, weights=x * counts) / new_counts
+        y = np.bincount(cluster_indices, weights=y * counts) / new_counts
+        indices = indices[first_indices]
+        counts = new_counts
+
+        cluster_lats, cluster_lngs = _get_lat_lngs(x, y)
+        levels.append(_Clusters(zoom, cluster_lats, cluster_lngs, counts, indices))
+
+    return levels[::-1]
+
+def _bin_points(lats, lngs, weights, zoom=None, degrees=None):
+    '''
+    Bin points into the cells of a grid, summing their weights.
+
+    Args:
+        lats ([float]): Latitude of each point.
+        lngs ([float]): Longitude of each point.
+        weights ([float]): Weight of each point.
+
+    Optional:
+
+    Args:
+        zoom (int): Zoom level to bin the points into the pixels of the map at (on a grid in Web Mercator pixel space),
+            from 0 to 22.
+        degrees (float): Size of the grid cells in degrees, to bin the points on a lat/lng grid instead.
+            Exactly one of ``zoom`` and ``degrees`` must be given.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray): Latitude, longitude and total weight of each occupied cell,
+            located at the weighted centroid of its points. Cells with a total weight of 0 are left out.
+    '''
+    MAX_ZOOM = 22
+    MAX_NUM_CELLS = 2 ** 31
+    # Note: This is the highest zoom level of Google Maps, and the most cells per axis
+    #       for which each cell's index (row * number of cells + column) still fits in 64 bits.
+
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+
+    if (zoom is None) == (degrees is None):
+        raise ValueError('Either a zoom level or a cell size in degrees must be given to aggregate with!')
+
+    # Find the grid cell of each point:
+    if zoom is not None:
+        if isinstance(zoom, bool) or int(zoom) != zoom or not 0 <= zoom <= MAX_ZOOM:
+            raise ValueError('The zoom level to aggregate at must be an integer from 0 to %d!' % MAX_ZOOM)
+
+        num_cells = _TILE_SIZE * 2 ** int(zoom)
+        x, y = _get_world_coordinates(lats, lngs)
+        cell_x = np.clip((x * num_cells).astype(np.int64), 0, num_cells - 1)
+        cell_y = np.clip((y * num_cells).astype(np.int64), 0, num_cells - 1)
+    else:
+        if not degrees > 0:
+            raise ValueError('The cell size to aggregate with must be positive!')
+
+        num_cells = int(np.ceil(360.0 / degrees)) + 1
+        if num_cells > MAX_NUM_CELLS:
+            raise ValueError('The cell size to aggregate with is too small!')
+
+        cell_x = np.floor((lngs + 180.0) / degrees).astype(np.int64)
+        cell_y = np.floor((lats + 90.0) / degrees).astype(np.int64)
+
+    _, cell_indices = np.unique(cell_y * num_cells + cell_x, return_inverse=True)
+    cell_indices = cell_indices.ravel()
+
+    # Sum the weights of each cell, placing it at the weighted centroid of its points:
+    cell_weights = np.bincount(cell_indices, weights=weights)
+    is_occupied = cell_weights != 0
+    cell_weights = cell_weights[is_occupied]
+    cell_lats = np.bincount(cell_indices, weights=lats * weights)[is_occupied] / cell_weights
+    cell_lngs = np.bincount(cell_indices, weights=lngs * weights)[is_occupied] / cell_weights
+
+    return cell_lats, cell_lngs, cell_weights
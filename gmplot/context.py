@@ -1,9 +1,45 @@
+import os
+
+from gmplot.utility import _get_embeddable_image
+
 class _Context(object):
     '''Context used to keep track of what was drawn to the map.'''
 
-    def __init__(self):
+    def __init__(self, icon_url=None):
+        '''
+        Optional:
+
+        Args:
+            icon_url (str): Base URL of the folder that holds shared icon files, relative to the map.
+                By default, icons are embedded in the map itself.
+        '''
         self.color_cache = set()
         '''Cache of colors written so far.'''
 
         self.num_info_markers = 0
         '''Number of markers with info windows written so far.'''
+
+        self.icon_url = icon_url
+        '''Base URL of the shared icon files, or None if icons are embedded.'''
+
+        self.icon_paths = set()
+        '''Paths of the shared icon files referenced so far.'''
+
+        self.icons = {}
+        '''Icons referenced by the layers of a split map's data file so far, by name.'''
+
+    def get_icon_url(self, path):
+        '''
+        Get the URL to write for an icon.
+
+        Args:
+            path (str): Path of the icon.
+
+        Returns:
+            str: URL of the shared icon file, or the icon itself as an embeddable base64 image URL if icons are embedded.
+        '''
+        if self.icon_url is None:
+            return _get_embeddable_image(path)
+
+        self.icon_paths.add(path)
+        return self.icon_url + os.path.basename(path)
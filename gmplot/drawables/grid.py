@@ -1,8 +1,14 @@
 import math
 
-from gmplot.drawables.polyline import _Polyline
+from gmplot.color import _get_hex_color
 
 class _Grid(object):
+    '''
+    Grid drawn by the page itself from its bounds and increments.
+
+    Only the divisions within view are drawn, so grids of any size or fineness stay cheap to write and display.
+    '''
+
     def __init__(self, bounds, lat_increment, lng_increment, precision, **kwargs):
         '''
         Args:
@@ -19,28 +25,18 @@ class _Grid(object):
             alpha (float): Opacity of the grid, ranging from 0 to 1.
             width (int): Width of the grid lines, in pixels.
         '''
-        # Set up the bounding box:
-        self._bounding_box = _Polyline(*zip(*[
-            (bounds['south'], bounds['west']),
-            (bounds['north'], bounds['west']),
-            (bounds['north'], bounds['east']),
-            (bounds['south'], bounds['east']),
-            (bounds['south'], bounds['west'])
-        ]), precision=precision, **kwargs)
+        self._bounds = bounds
+        self._lat_increment = lat_increment
+        self._lng_increment = lng_increment
+        self._precision = precision
+        color = kwargs.get('color')
+        self._color = _get_hex_color(color) if color is not None else None
+        self._alpha = kwargs.get('alpha')
+        self._width = kwargs.get('width')
 
         get_num_divisions = lambda start, end, increment: int(math.ceil((end - start) / increment))
-
-        # Set up the latitudinal divisions:
-        self._lat_divisions = []
-        for lat_index in range(1, get_num_divisions(bounds['south'], bounds['north'], lat_increment)):
-            lat = bounds['south'] + float(lat_index) * lat_increment
-            self._lat_divisions.append(_Polyline(*zip(*[(lat, bounds['west']), (lat, bounds['east'])]), precision=precision, **kwargs))
-
-        # Set up the longitudinal divisions:
-        self._lng_divisions = []
-        for lng_index in range(1, get_num_divisions(bounds['west'], bounds['east'], lng_increment)):
-            lng = bounds['west'] + float(lng_index) * lng_increment
-            self._lng_divisions.append(_Polyline(*zip(*[(bounds['south'], lng), (bounds['north'], lng)]), precision=precision, **kwargs))
+        self._num_lat_divisions = get_num_divisions(bounds['south'], bounds['north'], lat_increment)
+        self._num_lng_divisions = get_num_divisions(bounds['west'], bounds['east'], lng_increment)
 
     def write(self, w):
         '''
@@ -49,7 +45,80 @@ class _Grid(object):
         Args:
             w (_Writer): Writer used to write the grid.
         '''
-        self._bounding_box.write(w)
-        [lat_division.write(w) for lat_division in self._lat_divisions]
-        [lng_division.write(w) for lng_division in self._lng_divisions]
+        w.write('''
+            (function(bounds, increments, numDivisions, style) {
+                var createLine = function(path) {
+                    var options = {clickable: false, geodesic: true, path: path, map: map};
+                    for (var key in style) options[key] = style[key];
+                    return new google.maps.Polyline(options);
+                };
+
+                // Draw the bounding box:
+                createLine([
+                    {lat: bounds.south, lng: bounds.west},
+                    {lat: bounds.north, lng: bounds.west},
+                    {lat: bounds.north, lng: bounds.east},
+                    {lat: bounds.south, lng: bounds.east},
+                    {lat: bounds.south, lng: bounds.west}
+                ]);
+
+                // Draw the divisions within view, reusing the ones that were already drawn:
+                var divisions = {};
+                var update = function() {
+                    var view = map.getBounds();
+                    if (!view) return;
+                    var south = view.getSouthWest().lat(), west = view.getSouthWest().lng();
+                    var north = view.getNorthEast().lat(), east = view.getNorthEast().lng();
+                    if (west > east) {
+                        // (the view wraps around the antimeridian, so all longitudes are potentially within view)
+                        west = bounds.west;
+                        east = bounds.east;
+                    }
+
+                    var visible = {};
+                    var getVisibleIndices = function(start, end, origin, increment, numDivisions) {
+                        return [Math.max(Math.ceil((start - origin) / increment), 1), Math.min(Math.floor((end - origin) / increment), numDivisions - 1)];
+                    };
+
+                    var latIndices = getVisibleIndices(south, north, bounds.south, increments.lat, numDivisions.lat);
+                    for (var i = latIndices[0]; i <= latIndices[1]; i++) {
+                        var lat = bounds.south + i * increments.lat;
+                        visible['lat' + i] = true;
+                        if (!divisions['lat' + i]) divisions['lat' + i] = createLine([{lat: lat, lng: bounds.west}, {lat: lat, lng: bounds.east}]);
+                    }
+
+                    var lngIndices = getVisibleIndices(west, east, bounds.west, increments.lng, numDivisions.lng);
+                    for (var i = lngIndices[0]; i <= lngIndices[1]; i++) {
+                        var lng = bounds.west + i * increments.lng;
+                        visible['lng' + i] = true;
+                        if (!divisions['lng' + i]) divisions['lng' + i] = createLine([{lat: bounds.south, lng: lng}, {lat: bounds.north, lng: lng}]);
+                    }
+
+                    for (var key in divisions) {
+                        if (!visible[key]) {
+                            divisions[key].setMap(null);
+                            delete divisions[key];
+                        }
+                    }
+                };
+
+                map.addListener('bounds_changed', update);
+            })(
+        ''')
+        w.indent()
+        w.write('{north: %.*f, south: %.*f, east: %.*f, west: %.*f},' % (
+            self._precision, self._bounds['north'],
+            self._precision, self._bounds['south'],
+            self._precision, self._bounds['east'],
+            self._precision, self._bounds['west']
+        ))
+        w.write('{lat: %r, lng: %r},' % (float(self._lat_increment), float(self._lng_increment)))
+        w.write('{lat: %d, lng: %d},' % (self._num_lat_divisions, self._num_lng_divisions))
+        style = []
+        if self._color is not None: style.append('strokeColor: "%s"' % self._color)
+        if self._alpha is not None: style.append('strokeOpacity: %f' % self._alpha)
+        if self._width is not None: style.append('strokeWeight: %d' % self._width)
+        w.write('{%s}' % ', '.join(style))
+        w.dedent()
+        w.write(');')
         w.write()
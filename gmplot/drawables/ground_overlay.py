@@ -1,5 +1,7 @@
 import json
 
+from gmplot.clipping import _do_bounds_intersect
+
 class _GroundOverlay(object):
     def __init__(self, url, bounds, **kwargs):
         '''
@@ -17,6 +19,18 @@ class _GroundOverlay(object):
         self._bounds = bounds
         self._opacity = kwargs.get('opacity')
 
+    def clip(self, bounds):
+        '''
+        Clip the ground overlay to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_GroundOverlay]: The ground overlay if it intersects the bounds.
+        '''
+        return [self] if _do_bounds_intersect(self._bounds, bounds) else []
+
     def write(self, w):
         '''
         Write the ground overlay.
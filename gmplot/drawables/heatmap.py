@@ -1,12 +1,14 @@
-from collections import namedtuple
+import copy
 
-from gmplot.utility import _get, _format_LatLng
+import numpy as np
+
+from gmplot.clipping import _get_points_within
+from gmplot.clustering import _bin_points
+from gmplot.utility import _COLUMNAR_THRESHOLD, _MAX_BINARY_PRECISION, _get, _format_LatLng, _format_LatLng_array, _format_typed_array, _get_array_data, _get_LatLng_data
 
 class _Heatmap(object):
     _DEFAULT_WEIGHT = 1
 
-    _Point = namedtuple('Point', ['location', 'weight'])
-
     def __init__(self, lats, lngs, precision, **kwargs):
         '''
         Args:
@@ -25,17 +27,123 @@ class _Heatmap(object):
             dissipating (bool): True to dissipate the heatmap on zooming, False to disable dissipation.
             weights ([float]): List of weights corresponding to each data point. Each point has a weight
                 of 1 by default. Specifying a weight of N is equivalent to plotting the same point N times.
-        
+            binary (bool): Whether or not to write the data points as base64-encoded binary arrays
+                (with lat/lng values as 32-bit fixed-point integers and weights as 32-bit floats), which is much more
+                compact than text. In this case, lat/lng values are rounded to at most 7 digits after the decimal.
+            aggregate_zoom (int): Bin the data points into the map's pixels at this zoom level before writing them,
+                with one point per occupied pixel (weighted by the sum of the weights of its points).
+            aggregate_degrees (float): Bin the data points into a lat/lng grid with cells of this size (in degrees)
+                before writing them, instead. Can't be used along with ``aggregate_zoom``.
+
         .. _RGBA: https://www.w3.org/TR/css-color-3/#rgba-color
         '''
-        weights = _get(kwargs, ['weights'], [self._DEFAULT_WEIGHT] * len(lats))
-        self._points = [self._Point(_format_LatLng(lat, lng, precision), weight) for lat, lng, weight in zip(lats, lngs, weights)]
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        weights = _get(kwargs, ['weights'])
+        self._weights = np.asarray(weights, dtype=float) if weights is not None else np.full(len(lats), self._DEFAULT_WEIGHT, dtype=float)
+
+        aggregate_zoom = kwargs.get('aggregate_zoom')
+        aggregate_degrees = kwargs.get('aggregate_degrees')
+        if aggregate_zoom is not None or aggregate_degrees is not None:
+            self._lats, self._lngs, self._weights = _bin_points(self._lats, self._lngs, self._weights, aggregate_zoom, aggregate_degrees)
+
+        self._precision = precision
+        self._binary = kwargs.get('binary')
         self._radius = kwargs.get('radius')
         self._gradient = kwargs.get('gradient')
         self._opacity = kwargs.get('opacity')
         self._max_intensity = kwargs.get('max_intensity')
         self._dissipating = kwargs.get('dissipating')
 
+    def clip(self, bounds):
+        '''
+        Clip the heatmap to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Heatmap]: The heatmap of the points within the bounds, if any.
+        '''
+        mask = _get_points_within(self._lats, self._lngs, bounds)
+        if mask.all():
+            return [self]
+        if not mask.any():
+            return []
+
+        clipped = copy.copy(self)
+        clipped._lats = self._lats[mask]
+        clipped._lngs = self._lngs[mask]
+        clipped._weights = self._weights[mask]
+        return [clipped]
+
+    def _format_point(self, lat, lng, weight):
+        '''
+        Format a single data point of the heatmap.
+
+        Args:
+            lat (float): Latitude of the point.
+            lng (float): Longitude of the point.
+            weight (float): Weight of the point.
+
+        Returns:
+            str: Formatted data point, as an entry of the heatmap's data array.
+        '''
+        location = _format_LatLng(lat, lng, self._precision)
+        if weight == self._DEFAULT_WEIGHT:
+            return '%s,' % location
+        return '{location: %s, weight: %f},' % (location, weight)
+
+    def _write_binary_data(self, w, is_weighted):
+        '''
+        Write the data points of the heatmap as base64-encoded binary arrays.
+
+        Args:
+            w (_Writer): Writer used to write the data points.
+            is_weighted (bool): Whether or not any data point has a non-default weight.
+        '''
+        scale = 10 ** min(self._precision, _MAX_BINARY_PRECISION)
+        locations = np.round(np.column_stack((self._lats, self._lngs)) * scale).astype(np.int32)
+
+        w.write('''
+            data: (function(locations, weights, scale) {
+                var data = new Array(locations.length / 2);
+                for (var i = 0; i < data.length; i++) {
+                    var location = new google.maps.LatLng(locations[2 * i] / scale, locations[2 * i + 1] / scale);
+                    data[i] = weights ? {location: location, weight: weights[i]} : location;
+                }
+                return new google.maps.MVCArray(data);
+            })(
+        ''')
+        w.indent()
+        w.write('%s,' % _format_typed_array(locations))
+        w.write('%s,' % (_format_typed_array(self._weights.astype(np.float32)) if is_weighted else 'null'))
+        w.write('%d' % scale)
+        w.dedent()
+        w.write(')')
+
+    def get_layer(self):
+        '''
+        Get the heatmap as a layer of a split map's data file.
+
+        Returns:
+            dict: JSON data of the heatmap.
+        '''
+        options = {}
+        if self._radius is not None: options['radius'] = self._radius
+        if self._max_intensity is not None: options['maxIntensity'] = self._max_intensity
+        if self._opacity is not None: options['opacity'] = self._opacity
+        if self._dissipating is False: options['dissipating'] = False
+        if self._gradient: options['gradient'] = ['rgba(%d, %d, %d, %f)' % (r, g, b, a) for r, g, b, a in self._gradient]
+
+        is_weighted = bool(np.any(self._weights != self._DEFAULT_WEIGHT))
+        return {
+            'type': 'heatmap',
+            'options': options,
+            'positions': _get_LatLng_data(self._lats, self._lngs, self._precision),
+            'weights': _get_array_data(self._weights) if is_weighted else None
+        }
+
     def write(self, w):
         '''
         Write the heatmap.
@@ -57,15 +165,17 @@ class _Heatmap(object):
             w.dedent()
             w.write('],')
         w.write('map: map,')
-        w.write('data: [')
-        w.indent()
-        for point in self._points:
-            if point.weight == self._DEFAULT_WEIGHT:
-                w.write('%s,' % point.location)
-            else:
-                w.write('{location: %s, weight: %f},' % (point.location, point.weight))
-        w.dedent()
-        w.write(']')
+        is_weighted = bool(np.any(self._weights != self._DEFAULT_WEIGHT))
+        if self._binary:
+            self._write_binary_data(w, is_weighted)
+        elif len(self._lats) >= _COLUMNAR_THRESHOLD:
+            w.write('data: %s' % _format_LatLng_array(self._lats.tolist(), self._lngs.tolist(), self._precision, self._weights.tolist() if is_weighted else None))
+        else:
+            w.write('data: [')
+            w.indent()
+            w.write_lines(self._format_point(lat, lng, weight) for lat, lng, weight in zip(self._lats.tolist(), self._lngs.tolist(), self._weights.tolist()))
+            w.dedent()
+            w.write(']')
         w.dedent()
         w.write('});')
         w.write()
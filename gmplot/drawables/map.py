@@ -20,6 +20,7 @@ class _Map(object):
             scale_control (bool): Whether or not to display the `scale control`_.
             fit_bounds (dict): Fit the map to contain the given bounds, as a dict of the form
                 ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+            map_id (str): `Map ID`_ of the map's style.
 
         .. _Zoom level: https://developers.google.com/maps/documentation/javascript/tutorial#zoom-levels
         .. _Map type: https://developers.google.com/maps/documentation/javascript/maptypes
@@ -27,7 +28,10 @@ class _Map(object):
         .. _Maps JavaScript API: https://console.cloud.google.com/marketplace/details/google/maps-backend.googleapis.com
         .. _Tilt: https://developers.google.com/maps/documentation/javascript/reference/map#MapOptions.tilt
         .. _scale control: https://developers.google.com/maps/documentation/javascript/reference/map#MapOptions.scaleControl
+        .. _Map ID: https://developers.google.com/maps/documentation/get-map-id
         '''
+        self._lat = round(float(lat), precision)
+        self._lng = round(float(lng), precision)
         self._center = _format_LatLng(lat, lng, precision)
         self._zoom = zoom
         self._map_type = kwargs.get('map_type')
@@ -35,6 +39,7 @@ class _Map(object):
         self._tilt = kwargs.get('tilt')
         self._scale_control = kwargs.get('scale_control')
         self._fit_bounds = kwargs.get('fit_bounds')
+        self._map_id = kwargs.get('map_id')
 
     def write(self, w):
         '''
@@ -49,6 +54,7 @@ class _Map(object):
         if self._map_type is not None: w.write('mapTypeId: "%s",' % self._map_type.lower())
         if self._tilt is not None: w.write('tilt: %d,' % self._tilt)
         if self._scale_control: w.write('scaleControl: true,')
+        if self._map_id is not None: w.write('mapId: "%s",' % self._map_id)
         w.write('zoom: %d,' % self._zoom)
         w.write('center: %s' % self._center)
         w.dedent()
@@ -57,3 +63,20 @@ class _Map(object):
         if self._fit_bounds:
             w.write('map.fitBounds(%s);' % json.dumps(self._fit_bounds))
             w.write()
+
+    def get_data(self):
+        '''
+        Get the map's data, as written to the data file of a split map.
+
+        Returns:
+            dict: JSON data of the map, with its options and the bounds to fit it to (if any).
+        '''
+        options = {}
+        if self._map_styles: options['styles'] = self._map_styles
+        if self._map_type is not None: options['mapTypeId'] = self._map_type.lower()
+        if self._tilt is not None: options['tilt'] = self._tilt
+        if self._scale_control: options['scaleControl'] = True
+        if self._map_id is not None: options['mapId'] = self._map_id
+        options['zoom'] = self._zoom
+        options['center'] = {'lat': self._lat, 'lng': self._lng}
+        return {'options': options, 'fitBounds': self._fit_bounds or None}
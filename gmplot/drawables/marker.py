@@ -1,3 +1,4 @@
+from gmplot.clipping import _get_points_within
 from gmplot.utility import _format_LatLng
 from gmplot.drawables.marker_icon import _MarkerIcon
 from gmplot.drawables.marker_info_window import _MarkerInfoWindow
@@ -23,9 +24,17 @@ class _Marker(object):
         .. _info window: https://developers.google.com/maps/documentation/javascript/infowindows
         .. _draggable: https://developers.google.com/maps/documentation/javascript/markers#draggable
         '''
+        self._lat = lat
+        self._lng = lng
+        self._precision = precision
+        self._title = kwargs.get('title')
+        self._label = kwargs.get('label')
+        self._draggable = kwargs.get('draggable')
+
         self._marker_icon = _MarkerIcon(color)
 
         info_window = kwargs.pop('info_window', None)
+        self._info_window = info_window
         self._marker_info_window = _MarkerInfoWindow(info_window) if info_window is not None else None
 
         self._raw_marker = _RawMarker(
@@ -34,6 +43,30 @@ class _Marker(object):
             **kwargs
         ) 
 
+    def get_batch_key(self):
+        '''
+        Get the key shared by all markers that can be written together with this one in a batch.
+
+        Returns:
+            tuple: Batch key, or None if the marker can't be batched (if it has an info window, for instance).
+        '''
+        if self._marker_info_window is not None:
+            return None
+
+        return (self._marker_icon.get_name(), self._precision, bool(self._draggable))
+
+    def clip(self, bounds):
+        '''
+        Clip the marker to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Marker]: The marker if it's within the bounds.
+        '''
+        return [self] if _get_points_within([self._lat], [self._lng], bounds)[0] else []
+
     def write(self, w, context):
         '''
         Write the marker.
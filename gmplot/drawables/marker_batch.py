@@ -0,0 +1,231 @@
+import copy
+import json
+
+import numpy as np
+
+from gmplot.clipping import _get_points_within
+from gmplot.utility import _COLUMNAR_THRESHOLD, _format_LatLng, _get_LatLng_data
+from gmplot.drawables.raw_marker import _RawMarker
+
+class _MarkerBatch(object):
+    '''
+    Batch of markers that share the same icon, precision and draggability.
+
+    Large batches are written as a compact table of positions, titles and labels,
+    along with a single loop that creates each marker.
+    '''
+
+    def __init__(self, lats, lngs, marker_icon, precision, **kwargs):
+        '''
+        Args:
+            lats ([float]): Latitudes of the markers.
+            lngs ([float]): Longitudes of the markers.
+            marker_icon (_MarkerIcon): Icon of the markers.
+            precision (int): Number of digits after the decimal to round to for lat/lng values.
+
+        Optional:
+
+        Args:
+            titles ([str]): Hover-over title of each marker.
+            labels ([str]): Label displayed on each marker.
+            draggable (bool): Whether or not the markers are draggable.
+        '''
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        self._marker_icon = marker_icon
+        self._precision = precision
+
+        # (titles and labels must be strings, as when they're written marker by marker)
+        get_strings = lambda values: [str(value) if value is not None else None for value in values]
+
+        titles = kwargs.get('titles')
+        self._titles = get_strings(titles) if titles is not None and any(title is not None for title in titles) else None
+
+        labels = kwargs.get('labels')
+        self._labels = get_strings(labels) if labels is not None and any(label is not None for label in labels) else None
+
+        self._draggable = kwargs.get('draggable')
+
+    def __len__(self):
+        return len(self._lats)
+
+    def get_batch_key(self):
+        '''
+        Get the key shared by all markers that can be written together with this batch.
+
+        Returns:
+            tuple: Batch key.
+        '''
+        return (self._marker_icon.get_name(), self._precision, bool(self._draggable))
+
+    @classmethod
+    def from_markers(cls, markers):
+        '''
+        Group consecutive markers (and marker batches) that share a batch key into batches.
+
+        Only consecutive markers are grouped, so that markers are still created in order
+        (which decides how overlapping markers stack).
+
+        Args:
+            markers ([_Marker or _MarkerBatch]): Markers to group.
+
+        Returns:
+            [_MarkerBatch or _Marker]: Marker batches, along with the markers that can't be batched, in order.
+        '''
+        batched_markers = []
+        previous_batch_key = None
+
+        for marker in markers:
+            batch_key = marker.get_batch_key() if hasattr(marker, 'get_batch_key') else None
+
+            if batch_key is None:
+                batched_markers.append(marker)
+            elif batch_key != previous_batch_key:
+                batched_markers.append([marker])
+            else:
+                batched_markers[-1].append(marker)
+            previous_batch_key = batch_key
+
+        return [cls._merge(batch) if isinstance(batch, list) else batch for batch in batched_markers]
+
+    @classmethod
+    def _merge(cls, markers):
+        '''
+        Merge markers and marker batches that share the same batch key into a single batch.
+
+        Args:
+            markers ([_Marker or _MarkerBatch]): Markers to merge, in order.
+
+        Returns:
+            _MarkerBatch: Merged batch.
+        '''
+        if len(markers) == 1 and isinstance(markers[0], cls):
+            return markers[0]
+
+        # Turn each run of individual markers into a batch:
+        batches = []
+        run = []
+        for item in markers + [None]:
+            if item is not None and not isinstance(item, cls):
+                run.append(item)
+                continue
+
+            if run:
+                batches.append(cls(
+                    [marker._lat for marker in run],
+                    [marker._lng for marker in run],
+                    run[0]._marker_icon,
+                    run[0]._precision,
+                    titles=[marker._title for marker in run],
+                    labels=[marker._label for marker in run],
+                    draggable=run[0]._draggable
+                ))
+                run = []
+
+            if item is not None:
+                batches.append(item)
+
+        if len(batches) == 1:
+            return batches[0]
+
+        # Then concatenate the batches:
+        get_column = lambda batch, column: column if column is not None else [None] * len(batch)
+        return cls(
+            np.concatenate([batch._lats for batch in batches]),
+            np.concatenate([batch._lngs for batch in batches]),
+            batches[0]._marker_icon,
+            batches[0]._precision,
+            titles=[title for batch in batches for title in get_column(batch, batch._titles)],
+            labels=[label for batch in batches for label in get_column(batch, batch._labels)],
+            draggable=batches[0]._draggable
+        )
+
+    def clip(self, bounds):
+        '''
+        Clip the marker batch to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_MarkerBatch]: The batch of markers within the bounds, if any.
+        '''
+        mask = _get_points_within(self._lats, self._lngs, bounds)
+        if mask.all():
+            return [self]
+        if not mask.any():
+            return []
+
+        clipped = copy.copy(self)
+        clipped._lats = self._lats[mask]
+        clipped._lngs = self._lngs[mask]
+        if self._titles is not None: clipped._titles = [title for title, within in zip(self._titles, mask) if within]
+        if self._labels is not None: clipped._labels = [label for label, within in zip(self._labels, mask) if within]
+        return [clipped]
+
+    def get_layer(self, context):
+        '''
+        Get the marker batch as a layer of a split map's data file.
+
+        Args:
+            context (_Context): Context used to keep track of what was drawn to the map.
+
+        Returns:
+            dict: JSON data of the marker batch.
+        '''
+        self._marker_icon.add_data(context)
+        return {
+            'type': 'markers',
+            'icon': self._marker_icon.get_name(),
+            'positions': _get_LatLng_data(self._lats, self._lngs, self._precision),
+            'titles': self._titles,
+            'labels': self._labels,
+            'draggable': bool(self._draggable)
+        }
+
+    def write(self, w, context):
+        '''
+        Write the marker batch.
+
+        Args:
+            w (_Writer): Writer used to write the marker batch.
+            context (_Context): Context used to keep track of what was drawn to the map.
+        '''
+        # Write the marker icon (if it isn't written already):
+        self._marker_icon.write(w, context)
+
+        # Write small batches marker by marker:
+        if len(self._lats) < _COLUMNAR_THRESHOLD:
+            for i, (lat, lng) in enumerate(zip(self._lats, self._lngs)):
+                _RawMarker(
+                    _format_LatLng(lat, lng, self._precision),
+                    self._marker_icon.get_name(),
+                    title=self._titles[i] if self._titles is not None else None,
+                    label=self._labels[i] if self._labels is not None else None,
+                    draggable=self._draggable
+                ).write(w)
+            return
+
+        # Otherwise, write them as a table:
+        w.write('''
+            (function(positions, titles, labels) {
+                for (var i = 0; i < positions.length / 2; i++) {
+                    var options = {
+                        position: new google.maps.LatLng(positions[2 * i], positions[2 * i + 1]),
+                        icon: %s,
+                        draggable: %s,
+                        map: map
+                    };
+                    if (titles && titles[i] !== null) options.title = titles[i];
+                    if (labels && labels[i] !== null) options.label = labels[i];
+                    new google.maps.Marker(options);
+                }
+            })(
+        ''' % (self._marker_icon.get_name(), 'true' if self._draggable else 'false'))
+        w.indent()
+        w.write('[%s],' % ','.join(['%.*f,%.*f' % (self._precision, lat, self._precision, lng) for lat, lng in zip(self._lats, self._lngs)]))
+        w.write('%s,' % (json.dumps(self._titles, separators=(',', ':')) if self._titles is not None else 'null'))
+        w.write('%s' % (json.dumps(self._labels, separators=(',', ':')) if self._labels is not None else 'null'))
+        w.dedent()
+        w.write(');')
+        w.write()
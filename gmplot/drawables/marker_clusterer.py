@@ -0,0 +1,201 @@
+import json
+
+import numpy as np
+
+from gmplot.clustering import _get_clusters
+from gmplot.color import _get_hex_color
+from gmplot.utility import _format_typed_array
+from gmplot.drawables.marker_batch import _MarkerBatch
+
+class _MarkerClusterer(object):
+    '''
+    Clusterer that groups nearby markers together, depending on the zoom level.
+
+    The clusters of each zoom level are precomputed, and the page only creates the markers and clusters
+    that are within view, so the map stays responsive with any number of markers.
+    '''
+
+    def __init__(self, color, **kwargs):
+        '''
+        Args:
+            color (str): Color of the clusters. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+
+        Optional:
+
+        Args:
+            radius (int): Size of the area covered by each cluster, in pixels.
+            min_zoom (int): Lowest zoom level to cluster markers at.
+            max_zoom (int): Highest zoom level to cluster markers at. Markers are never clustered past this zoom level.
+        '''
+        self._color = _get_hex_color(color)
+        self._radius = kwargs.get('radius')
+        self._min_zoom = kwargs.get('min_zoom')
+        self._max_zoom = kwargs.get('max_zoom')
+
+    def write(self, w, context, markers):
+        '''
+        Write the clustered markers.
+
+        Args:
+            w (_Writer): Writer used to write the clustered markers.
+            context (_Context): Context used to keep track of what was drawn to the map.
+            markers ([_Marker or _MarkerBatch]): Markers to cluster.
+        '''
+        if not markers:
+            return
+
+        # Gather the markers into columns, writing their icons (if they aren't written already):
+        icon_names = []
+        lats, lngs, positions, icon_indices = [], [], [], []
+        titles, labels, draggable, info_windows = [], [], [], []
+        get_string = lambda value: str(value) if value is not None else None
+        for marker in markers:
+            icon_name = marker._marker_icon.get_name()
+            if icon_name not in icon_names:
+                marker._marker_icon.write(w, context)
+                icon_names.append(icon_name)
+
+            if isinstance(marker, _MarkerBatch):
+                num_markers = len(marker)
+                lats.append(marker._lats)
+                lngs.append(marker._lngs)
+                titles.extend(map(get_string, marker._titles) if marker._titles is not None else [None] * num_markers)
+                labels.extend(map(get_string, marker._labels) if marker._labels is not None else [None] * num_markers)
+                info_windows.extend([None] * num_markers)
+            else:
+                num_markers = 1
+                lats.append([marker._lat])
+                lngs.append([marker._lng])
+                titles.append(get_string(marker._title))
+                labels.append(get_string(marker._label))
+                info_windows.append(marker._info_window)
+
+            positions.extend(['%.*f,%.*f' % (marker._precision, lat, marker._precision, lng) for lat, lng in zip(lats[-1], lngs[-1])])
+            icon_indices.append(np.full(num_markers, icon_names.index(icon_name)))
+            draggable.extend([1 if marker._draggable else 0] * num_markers)
+
+        # Only keep the zoom levels that actually have clusters (past them, the markers are shown as is):
+        levels = _get_clusters(np.concatenate(lats), np.concatenate(lngs), self._min_zoom, self._max_zoom, self._radius)
+        while levels and np.all(levels[-1].counts == 1):
+            levels.pop()
+
+        format_optional_list = lambda items: json.dumps(items, separators=(',', ':')) if any(item for item in items) else 'null'
+
+        w.write('''
+            (function(markers, levels, minZoom, color) {
+                var infoWindow = new google.maps.InfoWindow();
+                var shown = {};
+
+                var createMarker = function(i) {
+                    var options = {
+                        position: new google.maps.LatLng(markers.positions[2 * i], markers.positions[2 * i + 1]),
+                        icon: markers.icons[markers.iconIndices[i]],
+                        map: map
+                    };
+                    if (markers.titles && markers.titles[i] !== null) options.title = markers.titles[i];
+                    if (markers.labels && markers.labels[i] !== null) options.label = markers.labels[i];
+                    if (markers.draggable && markers.draggable[i]) options.draggable = true;
+                    var marker = new google.maps.Marker(options);
+                    if (markers.infoWindows && markers.infoWindows[i] !== null) {
+                        marker.addListener('click', function() {
+                            infoWindow.setContent(markers.infoWindows[i]);
+                            infoWindow.open(map, marker);
+                        });
+                    }
+                    return marker;
+                };
+
+                var createCluster = function(lat, lng, count, zoom) {
+                    var position = new google.maps.LatLng(lat, lng);
+                    var cluster = new google.maps.Marker({
+                        position: position,
+                        icon: {
+                            path: google.maps.SymbolPath.CIRCLE,
+                            scale: 12 + 4 * Math.log10(count),
+                            fillColor: color,
+                            fillOpacity: 0.8,
+                            strokeColor: "#FFFFFF",
+                            strokeWeight: 2
+                        },
+                        label: {text: String(count), color: "#FFFFFF"},
+                        zIndex: google.maps.Marker.MAX_ZINDEX + count,
+                        map: map
+                    });
+                    cluster.addListener('click', function() {
+                        map.panTo(position);
+                        map.setZoom(zoom + 1);
+                    });
+                    return cluster;
+                };
+
+                var update = function() {
+                    var bounds = map.getBounds();
+                    if (!bounds) return;
+                    var south = bounds.getSouthWest().lat(), west = bounds.getSouthWest().lng();
+                    var north = bounds.getNorthEast().lat(), east = bounds.getNorthEast().lng();
+                    var isVisible = function(lat, lng) {
+                        return lat >= south && lat <= north && (west <= east ? lng >= west && lng <= east : lng >= west || lng <= east);
+                    };
+
+                    var zoom = Math.max(map.getZoom(), minZoom);
+                    var level = levels[zoom - minZoom];
+                    var visible = {};
+
+                    var singles = level ? level.singles : null;
+                    var numSingles = singles ? singles.length : markers.iconIndices.length;
+                    for (var i = 0; i < numSingles; i++) {
+                        var index = singles ? singles[i] : i;
+                        if (!isVisible(markers.positions[2 * index], markers.positions[2 * index + 1])) continue;
+                        visible['m' + index] = true;
+                        if (!shown['m' + index]) shown['m' + index] = createMarker(index);
+                    }
+
+                    for (var i = 0; level && i < level.counts.length; i++) {
+                        var lat = level.positions[2 * i], lng = level.positions[2 * i + 1];
+                        if (!isVisible(lat, lng)) continue;
+                        var key = zoom + ':' + i;
+                        visible[key] = true;
+                        if (!shown[key]) shown[key] = createCluster(lat, lng, level.counts[i], zoom);
+                    }
+
+                    for (var key in shown) {
+                        if (!visible[key]) {
+                            shown[key].setMap(null);
+                            delete shown[key];
+                        }
+                    }
+                };
+
+                map.addListener('idle', update);
+            })(
+        ''')
+        w.indent()
+        w.write('{')
+        w.indent()
+        w.write('icons: [%s],' % ', '.join(icon_names))
+        w.write('iconIndices: %s,' % _format_typed_array(np.concatenate(icon_indices).astype(np.uint8 if len(icon_names) <= 256 else np.int32)))
+        w.write('positions: [%s],' % ','.join(positions))
+        w.write('titles: %s,' % format_optional_list(titles))
+        w.write('labels: %s,' % format_optional_list(labels))
+        w.write('draggable: %s,' % format_optional_list(draggable))
+        w.write('infoWindows: %s' % format_optional_list(info_windows))
+        w.dedent()
+        w.write('},')
+        w.write('[')
+        w.indent()
+        for level in levels:
+            is_cluster = level.counts > 1
+            w.write('{')
+            w.indent()
+            w.write('positions: %s,' % _format_typed_array(np.column_stack((level.lats[is_cluster], level.lngs[is_cluster])).astype(np.float32)))
+            w.write('counts: %s,' % _format_typed_array(level.counts[is_cluster].astype(np.int32)))
+            w.write('singles: %s' % _format_typed_array(level.indices[~is_cluster].astype(np.int32)))
+            w.dedent()
+            w.write('},')
+        w.dedent()
+        w.write('],')
+        w.write('%d,' % self._min_zoom)
+        w.write('"%s"' % self._color)
+        w.dedent()
+        w.write(');')
+        w.write()
@@ -2,9 +2,12 @@ import os
 import warnings
 
 from gmplot.color import _get_hex_color
-from gmplot.utility import _COLOR_ICON_PATH, _get_embeddable_image
+from gmplot.utility import _COLOR_ICON_PATH
 
 class _MarkerIcon(object):
+    _icon_paths = {}
+    # Note: This cache of each color's icon path is shared by the whole process.
+
     def __init__(self, color):
         '''
         Args:
@@ -13,20 +16,33 @@ class _MarkerIcon(object):
         self._color = _get_hex_color(color)
         self._name = 'marker_icon_%s' % self._color[1:]
 
-        # Get this marker icon as an embeddable image:
-        get_marker_icon_path = lambda color: _COLOR_ICON_PATH % color[1:]
-        marker_icon_path = get_marker_icon_path(self._color)
+        # Get the path of this marker icon:
+        if self._color not in self._icon_paths:
+            marker_icon_path = _COLOR_ICON_PATH % self._color[1:]
+            self._icon_paths[self._color] = marker_icon_path if os.path.exists(marker_icon_path) else None
 
-        if not os.path.exists(marker_icon_path):
+        self._icon_path = self._icon_paths[self._color]
+        if self._icon_path is None:
             warnings.warn(" Marker color '%s' isn't supported; defaulting to black." % self._color)
-            marker_icon_path = get_marker_icon_path('#000000')
-
-        self._icon = _get_embeddable_image(marker_icon_path)
+            self._icon_path = _COLOR_ICON_PATH % '000000'
 
     def get_name(self):
         '''Get the name of the marker icon.'''
         return self._name
     
+    def add_data(self, context):
+        '''
+        Add the marker icon to the icons of a split map's data file (if it isn't already added).
+
+        Args:
+            context (_Context): Context used to keep track of what was drawn to the map.
+        '''
+        if self._name not in context.icons:
+            context.icons[self._name] = {
+                'url': context.get_icon_url(self._icon_path),
+                'labelOrigin': [10, 11]
+            } # TODO: Avoid hardcoded labelOrigin
+
     def write(self, w, context):
         '''
         Write the marker icon (if it isn't already written).
@@ -44,7 +60,7 @@ class _MarkerIcon(object):
                 }};
             '''.format(
                 name=self._name,
-                icon=self._icon
+                icon=context.get_icon_url(self._icon_path)
             )) # TODO: Avoid hardcoded labelOrigin
             w.write()
             
@@ -0,0 +1,141 @@
+import copy
+import json
+
+import numpy as np
+
+from gmplot.clipping import _clip_path, _clip_polygon
+from gmplot.color import _get_hex_color
+from gmplot.simplification import _get_meters_per_pixel, _simplify_path
+from gmplot.utility import _encode_polyline
+
+class _PathLevels(object):
+    '''
+    Polyline or polygon with a level of detail per zoom band.
+
+    Each level is simplified to about a pixel at the highest zoom level of its band and embedded as an encoded polyline,
+    which the page only decodes once the map is first zoomed into that band.
+    '''
+
+    def __init__(self, lats, lngs, zooms, **kwargs):
+        '''
+        Args:
+            lats ([float]): Latitudes.
+            lngs ([float]): Longitudes.
+            zooms ([int]): Lowest zoom level of each level of detail, in increasing order.
+                The first level is used at any lower zoom level too, and the last one keeps the full path.
+
+        Optional:
+
+        Args:
+            closed (bool): Whether or not the path is a polygon's outline, rather than a polyline.
+            edge_color (str): Color of the path. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+            edge_alpha (float): Opacity of the path, ranging from 0 to 1.
+            edge_width (int): Width of the path, in pixels.
+            face_color (str): Color of the polygon's face. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+            face_alpha (float): Opacity of the polygon's face, ranging from 0 to 1.
+        '''
+        self._zooms = [int(zoom) for zoom in zooms]
+        self._closed = kwargs.get('closed', False)
+
+        edge_color = kwargs.get('edge_color')
+        self._edge_color = _get_hex_color(edge_color) if edge_color is not None else None
+        self._edge_alpha = kwargs.get('edge_alpha')
+        self._edge_width = kwargs.get('edge_width')
+
+        face_color = kwargs.get('face_color')
+        self._face_color = _get_hex_color(face_color) if face_color is not None else None
+        self._face_alpha = kwargs.get('face_alpha')
+
+        self._levels = self._get_levels(np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float))
+
+    def _get_levels(self, lats, lngs):
+        '''
+        Get the levels of detail of a path.
+
+        Args:
+            lats (numpy.ndarray): Latitudes of the full path.
+            lngs (numpy.ndarray): Longitudes of the full path.
+
+        Returns:
+            [(numpy.ndarray, numpy.ndarray)]: Latitudes and longitudes of the path at each level of detail.
+        '''
+        # Simplify each level from the next finer one, which is much faster than starting from the full path every time:
+        mean_lat = lats.mean() if len(lats) > 0 else 0
+        levels = [(lats, lngs)]
+        for zoom in self._zooms[:0:-1]:
+            keep = _simplify_path(lats, lngs, _get_meters_per_pixel(zoom - 1, mean_lat), closed=self._closed)
+            lats, lngs = lats[keep], lngs[keep]
+            levels.insert(0, (lats, lngs))
+        return levels
+
+    def clip(self, bounds):
+        '''
+        Clip the path to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_PathLevels]: Part of the path within the bounds (for a polyline, one for each time it crosses into them).
+        '''
+        lats, lngs = self._levels[-1]
+        if self._closed:
+            lats, lngs = _clip_polygon(lats, lngs, bounds)
+            parts = [(lats, lngs)] if len(lats) >= 3 else []
+        else:
+            parts = _clip_path(lats, lngs, bounds)
+
+        clipped_parts = []
+        for lats, lngs in parts:
+            clipped = copy.copy(self)
+            clipped._levels = self._get_levels(lats, lngs)
+            clipped_parts.append(clipped)
+        return clipped_parts
+
+    def write(self, w):
+        '''
+        Write the path.
+
+        Args:
+            w (_Writer): Writer used to write the path.
+        '''
+        w.write('''
+            (function(zooms, paths, options) {
+                var shape = new google.maps.%s(options);
+                var decodedPaths = {};
+                var currentLevel = null;
+
+                // Show the level of detail of the current zoom band, decoding it the first time it's needed:
+                var update = function() {
+                    var zoom = map.getZoom();
+                    var level = 0;
+                    while (level + 1 < zooms.length && zooms[level + 1] <= zoom) level++;
+                    if (level === currentLevel) return;
+                    currentLevel = level;
+
+                    if (!decodedPaths[level]) decodedPaths[level] = google.maps.geometry.encoding.decodePath(paths[level]);
+                    shape.setPath(decodedPaths[level]);
+                };
+
+                update();
+                map.addListener('zoom_changed', update);
+            })(
+        ''' % ('Polygon' if self._closed else 'Polyline'))
+        w.indent()
+        w.write('[%s],' % ', '.join('%d' % zoom for zoom in self._zooms))
+        w.write('[')
+        w.indent()
+        w.write_lines('%s,' % json.dumps(_encode_polyline(lats, lngs)) for lats, lngs in self._levels)
+        w.dedent()
+        w.write('],')
+        options = ['clickable: false', 'geodesic: true', 'map: map']
+        if self._edge_color is not None: options.append('strokeColor: "%s"' % self._edge_color)
+        if self._edge_alpha is not None: options.append('strokeOpacity: %f' % self._edge_alpha)
+        if self._edge_width is not None: options.append('strokeWeight: %d' % self._edge_width)
+        if self._closed:
+            if self._face_color is not None: options.append('fillColor: "%s"' % self._face_color)
+            if self._face_alpha is not None: options.append('fillOpacity: %f' % self._face_alpha)
+        w.write('{%s}' % ', '.join(options))
+        w.dedent()
+        w.write(');')
+        w.write()
@@ -1,5 +1,10 @@
+import copy
+
+import numpy as np
+
+from gmplot.clipping import _clip_polygon
 from gmplot.color import _get_hex_color
-from gmplot.utility import _format_LatLng
+from gmplot.utility import _COLUMNAR_THRESHOLD, _format_LatLng, _format_LatLng_array, _format_encoded_LatLng_array, _encode_polyline, _get_LatLng_data
 
 class _Polygon(object):
     def __init__(self, lats, lngs, precision, **kwargs):
@@ -17,9 +22,15 @@ class _Polygon(object):
             edge_width (int): Width of the polygon's edge, in pixels.
             face_color (str): Color of the polygon's face. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
             face_alpha (float): Opacity of the polygon's face, ranging from 0 to 1.
+            encode (bool): Whether or not to write the path as an `encoded polyline`_,
+                which is much more compact but rounds lat/lng values to 5 digits after the decimal.
+
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
         '''
-        self._points = [_format_LatLng(lat, lng, precision) for lat, lng in zip(lats, lngs)]
-                
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        self._precision = precision
+
         edge_color = kwargs.get('edge_color')
         self._edge_color = _get_hex_color(edge_color) if edge_color is not None else None
 
@@ -30,6 +41,47 @@ class _Polygon(object):
         self._face_color = _get_hex_color(face_color) if face_color is not None else None
 
         self._face_alpha = kwargs.get('face_alpha')
+        self._encode = kwargs.get('encode')
+
+    def clip(self, bounds):
+        '''
+        Clip the polygon to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Polygon]: The part of the polygon within the bounds, if any.
+        '''
+        lats, lngs = _clip_polygon(self._lats, self._lngs, bounds)
+        if len(lats) < 3:
+            return []
+
+        clipped = copy.copy(self)
+        clipped._lats = lats
+        clipped._lngs = lngs
+        return [clipped]
+
+    def get_layer(self):
+        '''
+        Get the polygon as a layer of a split map's data file.
+
+        Returns:
+            dict: JSON data of the polygon.
+        '''
+        options = {}
+        if self._edge_color is not None: options['strokeColor'] = self._edge_color
+        if self._edge_alpha is not None: options['strokeOpacity'] = self._edge_alpha
+        if self._edge_width is not None: options['strokeWeight'] = self._edge_width
+        if self._face_color is not None: options['fillColor'] = self._face_color
+        if self._face_alpha is not None: options['fillOpacity'] = self._face_alpha
+
+        layer = {'type': 'polygon', 'options': options}
+        if self._encode:
+            layer['encodedPath'] = _encode_polyline(self._lats, self._lngs)
+        else:
+            layer['path'] = _get_LatLng_data(self._lats, self._lngs, self._precision)
+        return layer
 
     def write(self, w):
         '''
@@ -48,11 +100,16 @@ class _Polygon(object):
         if self._face_color is not None: w.write('fillColor: "%s",' % self._face_color)
         if self._face_alpha is not None: w.write('fillOpacity: %f,' % self._face_alpha)
         w.write('map: map,')
-        w.write('paths: [')
-        w.indent()
-        [w.write('%s,' % point) for point in self._points]            
-        w.dedent()
-        w.write(']')
+        if self._encode:
+            w.write('paths: %s' % _format_encoded_LatLng_array(self._lats, self._lngs))
+        elif len(self._lats) >= _COLUMNAR_THRESHOLD:
+            w.write('paths: %s' % _format_LatLng_array(self._lats, self._lngs, self._precision))
+        else:
+            w.write('paths: [')
+            w.indent()
+            w.write_lines('%s,' % _format_LatLng(lat, lng, self._precision) for lat, lng in zip(self._lats, self._lngs))
+            w.dedent()
+            w.write(']')
         w.dedent()
         w.write('});')
         w.write()
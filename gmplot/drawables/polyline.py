@@ -1,5 +1,10 @@
+import copy
+
+import numpy as np
+
+from gmplot.clipping import _clip_path
 from gmplot.color import _get_hex_color
-from gmplot.utility import _format_LatLng
+from gmplot.utility import _COLUMNAR_THRESHOLD, _format_LatLng, _format_LatLng_array, _format_encoded_LatLng_array, _encode_polyline, _get_LatLng_data
 
 class _Polyline(object):
     def __init__(self, lats, lngs, precision, **kwargs):
@@ -15,12 +20,56 @@ class _Polyline(object):
             color (str): Color of the polyline. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
             alpha (float): Opacity of the polyline, ranging from 0 to 1.
             width (int): Width of the polyline, in pixels.
+            encode (bool): Whether or not to write the path as an `encoded polyline`_,
+                which is much more compact but rounds lat/lng values to 5 digits after the decimal.
+
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
         '''
-        self._points = [_format_LatLng(lat, lng, precision) for lat, lng in zip(lats, lngs)]
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        self._precision = precision
         color = kwargs.get('color')
         self._color = _get_hex_color(color) if color is not None else None
         self._alpha = kwargs.get('alpha')
         self._width = kwargs.get('width')
+        self._encode = kwargs.get('encode')
+
+    def clip(self, bounds):
+        '''
+        Clip the polyline to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Polyline]: Part of the polyline within the bounds, for each time it crosses into them.
+        '''
+        clipped_parts = []
+        for lats, lngs in _clip_path(self._lats, self._lngs, bounds):
+            clipped = copy.copy(self)
+            clipped._lats = lats
+            clipped._lngs = lngs
+            clipped_parts.append(clipped)
+        return clipped_parts
+
+    def get_layer(self):
+        '''
+        Get the polyline as a layer of a split map's data file.
+
+        Returns:
+            dict: JSON data of the polyline.
+        '''
+        options = {}
+        if self._color is not None: options['strokeColor'] = self._color
+        if self._alpha is not None: options['strokeOpacity'] = self._alpha
+        if self._width is not None: options['strokeWeight'] = self._width
+
+        layer = {'type': 'polyline', 'options': options}
+        if self._encode:
+            layer['encodedPath'] = _encode_polyline(self._lats, self._lngs)
+        else:
+            layer['path'] = _get_LatLng_data(self._lats, self._lngs, self._precision)
+        return layer
 
     def write(self, w):
         '''
@@ -37,11 +86,16 @@ class _Polyline(object):
         if self._alpha is not None: w.write('strokeOpacity: %f,' % self._alpha)
         if self._width is not None: w.write('strokeWeight: %d,' % self._width)
         w.write('map: map,')
-        w.write('path: [')
-        w.indent()
-        [w.write('%s,' % point) for point in self._points]            
-        w.dedent()
-        w.write(']')
+        if self._encode:
+            w.write('path: %s' % _format_encoded_LatLng_array(self._lats, self._lngs))
+        elif len(self._lats) >= _COLUMNAR_THRESHOLD:
+            w.write('path: %s' % _format_LatLng_array(self._lats, self._lngs, self._precision))
+        else:
+            w.write('path: [')
+            w.indent()
+            w.write_lines('%s,' % _format_LatLng(lat, lng, self._precision) for lat, lng in zip(self._lats, self._lngs))
+            w.dedent()
+            w.write(']')
         w.dedent()
         w.write('});')
         w.write()
@@ -16,7 +16,7 @@ class _RawMarker(object):
         self._icon = icon
         self._title = kwargs.get('title')
         if(self._title != None):
-            self._title = self._title.replace('\n', '\\n').replace('"', '\\"') 
+            self._title = str(self._title).replace('\n', '\\n').replace('"', '\\"') 
         self._label = kwargs.get('label')
         self._draggable = kwargs.get('draggable')
 
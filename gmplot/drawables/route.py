@@ -1,4 +1,4 @@
-from gmplot.utility import _get, _format_LatLng
+from gmplot.utility import _get, _format_LatLng, _format_encoded_LatLng_array
 
 class _Route(object):
     '''For more info, see Google Maps' `Directions Service https://developers.google.com/maps/documentation/javascript/directions`_.'''
@@ -15,11 +15,17 @@ class _Route(object):
         Args:
             travel_mode (str): Travel mode.
             waypoints ([(float, float)]): Waypoints.
+            encode (bool): Whether or not to write the waypoints as an `encoded polyline`_,
+                which is much more compact but rounds lat/lng values to 5 digits after the decimal.
+
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
         '''
         self._origin = _format_LatLng(*origin, precision=precision)
         self._destination = _format_LatLng(*destination, precision=precision)
         self._travel_mode = kwargs.get('travel_mode')
-        self._waypoints = [_format_LatLng(*waypoint, precision=precision) for waypoint in _get(kwargs, ['waypoints'], [])]
+        self._waypoints = list(_get(kwargs, ['waypoints'], []))
+        self._precision = precision
+        self._encode = kwargs.get('encode')
 
     def write(self, w):
         '''
@@ -33,10 +39,14 @@ class _Route(object):
         if self._travel_mode is not None: w.write('travelMode: "%s",' % self._travel_mode.upper())
         w.write('origin: %s,' % self._origin)
         w.write('destination: %s,' % self._destination)
-        if self._waypoints:
+        if self._waypoints and self._encode:
+            w.write('waypoints: %s.map(function(location) { return {location: location, stopover: false}; })' % (
+                _format_encoded_LatLng_array(*zip(*self._waypoints))
+            ))
+        elif self._waypoints:
             w.write('waypoints: [')
             w.indent()
-            [w.write('{location: %s, stopover: false},' % waypoint) for waypoint in self._waypoints]
+            w.write_lines('{location: %s, stopover: false},' % _format_LatLng(*waypoint, precision=self._precision) for waypoint in self._waypoints)
             w.dedent()
             w.write(']')
         w.dedent()
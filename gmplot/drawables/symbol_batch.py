@@ -0,0 +1,300 @@
+import copy
+import json
+
+import numpy as np
+
+from gmplot.color import _get_hex_color
+from gmplot.clipping import _get_points_within
+from gmplot.utility import _COLUMNAR_THRESHOLD, _EARTH_RADIUS_IN_KM, _format_typed_array, _get_array_data, _get_LatLng_data
+from gmplot.drawables.symbol import _Symbol
+
+class _SymbolBatch(object):
+    '''
+    Batch of symbols.
+
+    Large batches are written as a table of styles along with the symbols' coordinates:
+    circles are created in a single loop, and the strokes of all the x's and +'s that share a style
+    are drawn together as one multi-line layer.
+    '''
+
+    _SHAPE_CODES = {
+        'o': 0,
+        'x': 1,
+        '+': 2
+    }
+    # Note: This is how shapes are encoded when written as a typed array.
+
+    _STYLE_OPTIONS = (
+        ('edge_color', 'strokeColor'),
+        ('edge_alpha', 'strokeOpacity'),
+        ('edge_width', 'strokeWeight'),
+        ('face_color', 'fillColor'),
+        ('face_alpha', 'fillOpacity')
+    )
+
+    def __init__(self, lats, lngs, shapes, sizes, precision, **kwargs):
+        '''
+        Args:
+            lats ([float]): Latitudes of the centers of the symbols.
+            lngs ([float]): Longitudes of the centers of the symbols.
+            shapes (str or [str]): Shape of each symbol, as 'o', 'x', or '+'.
+            sizes (int or [int]): Size of each symbol, in meters.
+            precision (int): Number of digits after the decimal to round to for lat/lng values.
+
+        Optional:
+
+        Args:
+            edge_color (str or [str]): Color of each symbol's edge.
+                Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+            edge_alpha (float or [float]): Opacity of each symbol's edge, ranging from 0 to 1.
+            edge_width (int or [int]): Width of each symbol's edge, in pixels.
+            face_color (str or [str]): Color of each symbol's face.
+                Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+            face_alpha (float or [float]): Opacity of each symbol's face, ranging from 0 to 1.
+        '''
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        self._precision = precision
+
+        # Broadcast each option to the number of symbols (without copying single values):
+        broadcast = lambda value: np.broadcast_to(np.asarray(value, dtype=object), self._lats.shape)
+        self._shapes = broadcast(shapes)
+        self._sizes = broadcast(sizes)
+        self._options = {option: broadcast(kwargs.get(option)) for option, _ in self._STYLE_OPTIONS}
+
+        for shape in self._get_unique_values(self._shapes)[0]:
+            if shape not in _Symbol._SHAPES:
+                raise KeyError(shape)
+
+    @staticmethod
+    def _get_unique_values(values):
+        '''
+        Get the unique values of a broadcast option.
+
+        Args:
+            values (numpy.ndarray): Value of the option for each symbol.
+
+        Returns:
+            ([any], numpy.ndarray): Unique values, and the index of each symbol's value among them.
+        '''
+        # Single values broadcast to every symbol don't need to be compared:
+        if values.size == 0 or values.strides[0] == 0:
+            return values[:1].tolist(), np.zeros(values.shape, dtype=np.int64)
+
+        _, first_indices, indices = np.unique(values.astype(str), return_index=True, return_inverse=True)
+        return values[first_indices].tolist(), indices.ravel()
+
+    def __len__(self):
+        return len(self._lats)
+
+    def _get_styles(self):
+        '''
+        Get the style of each symbol.
+
+        Returns:
+            ([str], numpy.ndarray): Table of unique styles (as JSON objects), and the index of each symbol's style in the table.
+        '''
+        style_ids = np.zeros(self._lats.shape, dtype=np.int64)
+        for option, _ in self._STYLE_OPTIONS:
+            unique_values, values = self._get_unique_values(self._options[option])
+            style_ids = style_ids * len(unique_values) + values
+
+        _, first_indices, style_ids = np.unique(style_ids, return_index=True, return_inverse=True)
+
+        styles = []
+        style_table = {} # {style: index in the table}
+        style_indices = []
+        for first_index in first_indices:
+            style = {}
+            for option, name in self._STYLE_OPTIONS:
+                value = self._options[option][first_index]
+                if isinstance(value, np.generic):
+                    value = value.item()
+                if value is not None:
+                    style[name] = _get_hex_color(value) if option.endswith('color') else value
+
+            # (different color names can refer to the same color, so styles are compared once converted)
+            style = json.dumps(style, sort_keys=True, separators=(',', ':'))
+            if style not in style_table:
+                style_table[style] = len(styles)
+                styles.append(style)
+            style_indices.append(style_table[style])
+
+        return styles, np.array(style_indices)[style_ids.ravel()]
+
+    def _get_shape_codes(self):
+        '''
+        Get the shape of each symbol, encoded as per ``_SHAPE_CODES``.
+
+        Returns:
+            numpy.ndarray: Shape code of each symbol.
+        '''
+        shapes, indices = self._get_unique_values(self._shapes)
+        return np.array([self._SHAPE_CODES[shape] for shape in shapes], dtype=np.uint8)[indices]
+
+    def _get_strokes(self, mask):
+        '''
+        Get the strokes of the x's and +'s.
+
+        Args:
+            mask (numpy.ndarray): Which of the symbols to get the strokes of.
+
+        Returns:
+            numpy.ndarray: Endpoints of each stroke, as rows of (start lat, start lng, end lat, end lng).
+        '''
+        # TODO: The following generates each shape in Cartesian frame rather than in lat/lng; avoid this.
+        lats, lngs = self._lats[mask], self._lngs[mask]
+        is_x = self._shapes[mask] == 'x'
+        delta_lats = np.degrees(self._sizes[mask].astype(float) / 1000.0 / _EARTH_RADIUS_IN_KM / np.where(is_x, np.sqrt(2), 1))
+        delta_lngs = delta_lats / np.cos(np.radians(lats))
+
+        # x's are made of two diagonal strokes, and +'s of a horizontal and a vertical stroke:
+        first_strokes = np.where(is_x[:, np.newaxis],
+            np.column_stack((lats - delta_lats, lngs + delta_lngs, lats + delta_lats, lngs - delta_lngs)),
+            np.column_stack((lats, lngs - delta_lngs, lats, lngs + delta_lngs))
+        )
+        second_strokes = np.where(is_x[:, np.newaxis],
+            np.column_stack((lats - delta_lats, lngs - delta_lngs, lats + delta_lats, lngs + delta_lngs)),
+            np.column_stack((lats - delta_lats, lngs, lats + delta_lats, lngs))
+        )
+        return np.column_stack((first_strokes, second_strokes)).reshape(-1, 4)
+
+    def clip(self, bounds):
+        '''
+        Clip the symbol batch to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_SymbolBatch]: The batch of symbols within the bounds, if any.
+        '''
+        mask = _get_points_within(self._lats, self._lngs, bounds)
+        if mask.all():
+            return [self]
+        if not mask.any():
+            return []
+
+        # (single values stay broadcast rather than being copied for each symbol)
+        num_symbols = int(mask.sum())
+        take = lambda values: np.broadcast_to(values[:1], (num_symbols,)) if values.strides[0] == 0 else values[mask]
+
+        clipped = copy.copy(self)
+        clipped._lats = self._lats[mask]
+        clipped._lngs = self._lngs[mask]
+        clipped._shapes = take(self._shapes)
+        clipped._sizes = take(self._sizes)
+        clipped._options = {option: take(values) for option, values in self._options.items()}
+        return [clipped]
+
+    def get_layer(self):
+        '''
+        Get the symbol batch as a layer of a split map's data file, in the same table form as large batches are written.
+
+        Returns:
+            dict: JSON data of the symbol batch.
+        '''
+        styles, style_indices = self._get_styles()
+        is_circle = self._shapes == 'o'
+        line_style_indices = style_indices[~is_circle]
+        strokes = self._get_strokes(~is_circle)
+
+        lines = []
+        for style_index in np.unique(line_style_indices):
+            is_style = np.repeat(line_style_indices == style_index, 2)
+            lines.append({'style': int(style_index), 'strokes': _get_array_data(np.round(strokes[is_style].ravel(), self._precision))})
+
+        return {
+            'type': 'symbols',
+            'styles': [json.loads(style) for style in styles],
+            'circles': {
+                'positions': _get_LatLng_data(self._lats[is_circle], self._lngs[is_circle], self._precision),
+                'radii': _get_array_data(self._sizes[is_circle].astype(float)),
+                'styles': _get_array_data(style_indices[is_circle].astype(np.uint8 if len(styles) <= 256 else np.int32))
+            },
+            'lines': lines
+        }
+
+    def write(self, w):
+        '''
+        Write the symbol batch.
+
+        Args:
+            w (_Writer): Writer used to write the symbol batch.
+        '''
+        # Write small batches symbol by symbol:
+        if len(self) < _COLUMNAR_THRESHOLD:
+            for i in range(len(self)):
+                _Symbol(
+                    self._lats[i],
+                    self._lngs[i],
+                    self._shapes[i],
+                    self._sizes[i],
+                    self._precision,
+                    **{option: values[i] for option, values in self._options.items()}
+                ).write(w)
+            return
+
+        styles, style_indices = self._get_styles()
+        is_circle = self._shapes == 'o'
+        format_coordinates = lambda coordinates: ','.join(['%.*f' % (self._precision, coordinate) for coordinate in coordinates])
+
+        # Otherwise, write them as a table:
+        w.write('''
+            (function(styles, circles, lines) {
+                var getOptions = function(style, options) {
+                    for (var key in style) options[key] = style[key];
+                    return options;
+                };
+
+                for (var i = 0; i < circles.radii.length; i++) {
+                    new google.maps.Circle(getOptions(styles[circles.styles[i]], {
+                        clickable: false,
+                        geodesic: true,
+                        center: new google.maps.LatLng(circles.positions[2 * i], circles.positions[2 * i + 1]),
+                        radius: circles.radii[i],
+                        map: map
+                    }));
+                }
+
+                for (var i = 0; i < lines.length; i++) {
+                    var strokes = [];
+                    for (var j = 0; j < lines[i].strokes.length; j += 4) {
+                        strokes.push([
+                            {lat: lines[i].strokes[j], lng: lines[i].strokes[j + 1]},
+                            {lat: lines[i].strokes[j + 2], lng: lines[i].strokes[j + 3]}
+                        ]);
+                    }
+                    var layer = new google.maps.Data({
+                        style: getOptions(styles[lines[i].style], {clickable: false}),
+                        map: map
+                    });
+                    layer.add({geometry: new google.maps.Data.MultiLineString(strokes)});
+                }
+            })(
+        ''')
+        w.indent()
+        w.write('[')
+        w.indent()
+        w.write_lines('%s,' % style for style in styles)
+        w.dedent()
+        w.write('],')
+        w.write('{')
+        w.indent()
+        w.write('positions: [%s],' % format_coordinates(np.column_stack((self._lats[is_circle], self._lngs[is_circle])).ravel()))
+        w.write('radii: [%s],' % ','.join(['%s' % size for size in self._sizes[is_circle].tolist()]))
+        w.write('styles: %s' % _format_typed_array(style_indices[is_circle].astype(np.uint8 if len(styles) <= 256 else np.int32)))
+        w.dedent()
+        w.write('},')
+        w.write('[')
+        w.indent()
+        line_style_indices = style_indices[~is_circle]
+        strokes = self._get_strokes(~is_circle)
+        for style_index in np.unique(line_style_indices):
+            is_style = np.repeat(line_style_indices == style_index, 2)
+            w.write('{style: %d, strokes: [%s]},' % (style_index, format_coordinates(strokes[is_style].ravel())))
+        w.dedent()
+        w.write(']')
+        w.dedent()
+        w.write(');')
+        w.write()
@@ -0,0 +1,191 @@
+import numpy as np
+
+from gmplot.utility import _EARTH_RADIUS_IN_KM, _MAX_BINARY_PRECISION, _TILE_SIZE, _format_typed_array, _get_world_coordinates
+from gmplot.drawables.symbol_batch import _SymbolBatch
+
+class _SymbolCanvas(_SymbolBatch):
+    '''
+    Batch of symbols drawn onto a single canvas overlay, rather than as individual map shapes.
+
+    The symbols are sorted into the cells of a grid over the world (a spatial bucket index),
+    so each redraw only has to go through the symbols in the cells that are within view.
+    '''
+
+    _BUCKET_ZOOM = 8
+    # Note: The spatial bucket index has one cell per map tile at this zoom level.
+
+    def get_layer(self):
+        '''
+        Get the symbol canvas as a layer of a split map's data file.
+
+        Returns:
+            None: The symbol canvas isn't supported by the renderer script, so it's always written to the page itself.
+        '''
+        return None
+
+    def write(self, w):
+        '''
+        Write the symbol canvas.
+
+        Args:
+            w (_Writer): Writer used to write the symbol canvas.
+        '''
+        if len(self) == 0:
+            return
+
+        styles, style_indices = self._get_styles()
+
+        # Sort the symbols by cell (and by style within each cell, so that same-style symbols are drawn together):
+        num_buckets = 2 ** self._BUCKET_ZOOM
+        x, y = _get_world_coordinates(self._lats, self._lngs)
+        cells = np.minimum(y * num_buckets, num_buckets - 1).astype(np.int32) * num_buckets + np.minimum(x * num_buckets, num_buckets - 1).astype(np.int32)
+        order = np.lexsort((style_indices, cells))
+        cells, cell_starts = np.unique(cells[order], return_index=True)
+
+        scale = 10 ** min(self._precision, _MAX_BINARY_PRECISION)
+        positions = np.round(np.column_stack((self._lats[order], self._lngs[order])) * scale).astype(np.int32)
+        shapes = self._get_shape_codes()[order]
+
+        w.write('''
+            (function(data) {
+                var WORLD_SIZE = %d;
+                var EARTH_CIRCUMFERENCE = %f;
+                var BUCKET_SIZE = WORLD_SIZE / data.numBuckets;
+
+                var getWorldX = function(lng) {
+                    return (lng + 180) / 360 * WORLD_SIZE;
+                };
+                var getWorldY = function(lat) {
+                    var sinLat = Math.min(Math.max(Math.sin(lat * Math.PI / 180), -0.9999), 0.9999);
+                    return (0.5 - Math.log((1 + sinLat) / (1 - sinLat)) / (4 * Math.PI)) * WORLD_SIZE;
+                };
+                var getRgba = function(color, opacity) {
+                    var value = parseInt(color.slice(1), 16);
+                    return 'rgba(' + (value >> 16) + ',' + ((value >> 8) & 255) + ',' + (value & 255) + ',' + opacity + ')';
+                };
+
+                // Project each symbol onto the world once, with its radius in world units:
+                var numSymbols = data.shapes.length;
+                var x = new Float64Array(numSymbols), y = new Float64Array(numSymbols), radii = new Float64Array(numSymbols);
+                var maxRadius = 0;
+                for (var i = 0; i < numSymbols; i++) {
+                    var lat = data.positions[2 * i] / data.scale;
+                    x[i] = getWorldX(data.positions[2 * i + 1] / data.scale);
+                    y[i] = getWorldY(lat);
+                    radii[i] = data.sizes[i] * WORLD_SIZE / (EARTH_CIRCUMFERENCE * Math.cos(lat * Math.PI / 180));
+                    maxRadius = Math.max(maxRadius, radii[i]);
+                }
+                var cellStarts = Array.prototype.slice.call(data.cellStarts).concat([numSymbols]);
+
+                var styles = data.styles.map(function(style) {
+                    return {
+                        strokeStyle: getRgba(style.strokeColor || '#000000', style.strokeOpacity != null ? style.strokeOpacity : 1),
+                        lineWidth: style.strokeWeight != null ? style.strokeWeight : 1,
+                        fillStyle: style.fillColor ? getRgba(style.fillColor, style.fillOpacity != null ? style.fillOpacity : 1) : null
+                    };
+                });
+
+                var canvas = document.createElement('canvas');
+                canvas.style.position = 'absolute';
+
+                var overlay = new google.maps.OverlayView();
+                overlay.onAdd = function() {
+                    this.getPanes().overlayLayer.appendChild(canvas);
+                };
+                overlay.onRemove = function() {
+                    if (canvas.parentNode) canvas.parentNode.removeChild(canvas);
+                };
+                overlay.draw = function() {
+                    var projection = this.getProjection();
+                    var bounds = map.getBounds();
+                    if (!projection || !bounds) return;
+
+                    // Cover the map's viewport with the canvas:
+                    var north = bounds.getNorthEast().lat(), west = bounds.getSouthWest().lng();
+                    var topLeft = projection.fromLatLngToDivPixel(new google.maps.LatLng(north, west));
+                    var width = map.getDiv().offsetWidth, height = map.getDiv().offsetHeight;
+                    var ratio = window.devicePixelRatio || 1;
+                    canvas.style.left = topLeft.x + 'px';
+                    canvas.style.top = topLeft.y + 'px';
+                    canvas.style.width = width + 'px';
+                    canvas.style.height = height + 'px';
+                    canvas.width = width * ratio;
+                    canvas.height = height * ratio;
+
+                    var context = canvas.getContext('2d');
+                    context.setTransform(ratio, 0, 0, ratio, 0, 0);
+                    context.clearRect(0, 0, width, height);
+
+                    var zoomScale = Math.pow(2, map.getZoom());
+                    var left = getWorldX(west), top = getWorldY(north);
+                    var right = left + width / zoomScale, bottom = top + height / zoomScale;
+
+                    // Draw the symbols of each cell within view, with one path per run of same-style symbols:
+                    var style = null;
+                    var flush = function() {
+                        if (style === null) return;
+                        if (style.fillStyle) context.fill();
+                        context.stroke();
+                    };
+                    for (var cell = 0; cell < data.cells.length; cell++) {
+                        var cellX = (data.cells[cell] %% data.numBuckets) * BUCKET_SIZE;
+                        var cellY = Math.floor(data.cells[cell] / data.numBuckets) * BUCKET_SIZE;
+                        var offset = cellX + BUCKET_SIZE + maxRadius < left ? WORLD_SIZE : 0; // (to wrap around the antimeridian)
+                        if (cellX + offset - maxRadius > right || cellY - maxRadius > bottom || cellY + BUCKET_SIZE + maxRadius < top) continue;
+
+                        for (var i = cellStarts[cell]; i < cellStarts[cell + 1]; i++) {
+                            if (styles[data.styleIndices[i]] !== style) {
+                                flush();
+                                style = styles[data.styleIndices[i]];
+                                context.strokeStyle = style.strokeStyle;
+                                context.lineWidth = style.lineWidth;
+                                if (style.fillStyle) context.fillStyle = style.fillStyle;
+                                context.beginPath();
+                            }
+
+                            var px = (x[i] + offset - left) * zoomScale, py = (y[i] - top) * zoomScale;
+                            var radius = Math.max(radii[i] * zoomScale, 1);
+                            if (data.shapes[i] === 0) {
+                                context.moveTo(px + radius, py);
+                                context.arc(px, py, radius, 0, 2 * Math.PI);
+                            } else if (data.shapes[i] === 1) {
+                                var delta = radius / Math.SQRT2;
+                                context.moveTo(px - delta, py + delta);
+                                context.lineTo(px + delta, py - delta);
+                                context.moveTo(px - delta, py - delta);
+                                context.lineTo(px + delta, py + delta);
+                            } else {
+                                context.moveTo(px - radius, py);
+                                context.lineTo(px + radius, py);
+                                context.moveTo(px, py - radius);
+                                context.lineTo(px, py + radius);
+                            }
+                        }
+                    }
+                    flush();
+                };
+                overlay.setMap(map);
+
+                // (panning moves the canvas along with the map, so only redraw once the map settles)
+                map.addListener('idle', function() {
+                    overlay.draw();
+                });
+            })({
+        ''' % (_TILE_SIZE, 2 * np.pi * _EARTH_RADIUS_IN_KM * 1000))
+        w.indent()
+        w.write('styles: [')
+        w.indent()
+        w.write_lines('%s,' % style for style in styles)
+        w.dedent()
+        w.write('],')
+        w.write('scale: %d,' % scale)
+        w.write('positions: %s,' % _format_typed_array(positions))
+        w.write('shapes: %s,' % _format_typed_array(shapes))
+        w.write('sizes: %s,' % _format_typed_array(self._sizes[order].astype(np.float32)))
+        w.write('styleIndices: %s,' % _format_typed_array(style_indices[order].astype(np.uint8 if len(styles) <= 256 else np.int32)))
+        w.write('numBuckets: %d,' % num_buckets)
+        w.write('cells: %s,' % _format_typed_array(cells.astype(np.int32)))
+        w.write('cellStarts: %s' % _format_typed_array(cell_starts.astype(np.int32)))
+        w.dedent()
+        w.write('});')
+        w.write()
@@ -1,5 +1,8 @@
+import math
+
+from gmplot.clipping import _do_bounds_intersect
 from gmplot.color import _get_hex_color
-from gmplot.utility import _format_LatLng
+from gmplot.utility import _EARTH_RADIUS_IN_KM, _format_LatLng
 
 class _Circle(object):
     def __init__(self, lat, lng, radius, precision, **kwargs):
@@ -19,6 +22,8 @@ class _Circle(object):
             face_color (str): Color of the circle's face. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
             face_alpha (float): Opacity of the circle's face, ranging from 0 to 1.
         '''
+        self._lat = round(float(lat), precision)
+        self._lng = round(float(lng), precision)
         self._center = _format_LatLng(lat, lng, precision)
         self._radius = radius
 
@@ -33,6 +38,45 @@ class _Circle(object):
 
         self._face_alpha = kwargs.get('face_alpha')
 
+    def clip(self, bounds):
+        '''
+        Clip the circle to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Circle]: The circle if its bounding box intersects the bounds.
+        '''
+        delta_lat = (self._radius / 1000.0 / _EARTH_RADIUS_IN_KM) * (180.0 / math.pi)
+        box = {'north': self._lat + delta_lat, 'south': self._lat - delta_lat, 'east': 180.0, 'west': -180.0}
+
+        # (the box spans every longitude if the circle covers a pole or is wide enough to wrap around the globe)
+        cos_lat = math.cos(math.pi * self._lat / 180.0)
+        if box['north'] < 90 and box['south'] > -90 and delta_lat < 180.0 * cos_lat:
+            delta_lng = delta_lat / cos_lat
+            box['west'] = (self._lng - delta_lng + 180.0) % 360.0 - 180.0
+            box['east'] = (self._lng + delta_lng + 180.0) % 360.0 - 180.0
+
+        return [self] if _do_bounds_intersect(box, bounds) else []
+
+    def get_layer(self):
+        '''
+        Get the circle as a layer of a split map's data file.
+
+        Returns:
+            dict: JSON data of the circle.
+        '''
+        options = {}
+        if self._edge_color is not None: options['strokeColor'] = self._edge_color
+        if self._edge_alpha is not None: options['strokeOpacity'] = self._edge_alpha
+        if self._edge_width is not None: options['strokeWeight'] = self._edge_width
+        if self._face_color is not None: options['fillColor'] = self._face_color
+        if self._face_alpha is not None: options['fillOpacity'] = self._face_alpha
+        options['center'] = {'lat': self._lat, 'lng': self._lng}
+        options['radius'] = self._radius
+        return {'type': 'circle', 'options': options}
+
     def write(self, w):
         '''
         Write the circle.
@@ -1,9 +1,8 @@
 import math
 
+from gmplot.utility import _EARTH_RADIUS_IN_KM
 from gmplot.drawables.polyline import _Polyline
 
-_EARTH_RADIUS_IN_KM = 6378.8 # TODO: Avoid duplicating this constant.
-
 class _X(object):
     def __init__(self, lat, lng, size, precision, **kwargs):
         '''
@@ -1,7 +1,11 @@
+from gmplot.clipping import _get_points_within
 from gmplot.color import _get_hex_color
-from gmplot.utility import _COLOR_ICON_PATH, _format_LatLng, _get_embeddable_image
+from gmplot.utility import _COLOR_ICON_PATH, _format_LatLng
+
+class _Text(object):
+    _ICON_COLOR = 'clear'
+    _ICON_NAME = 'marker_icon_clear'
 
-class _Text(object):    
     def __init__(self, lat, lng, text, precision, **kwargs):
         '''
         Args:
@@ -16,16 +20,70 @@ class _Text(object):
             color (str): Text color. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
             font_size (int): Font size in pixels.
         '''
+        self._lat = lat
+        self._lng = lng
+        self._precision = precision
         self._position = _format_LatLng(lat, lng, precision)
         self._text = text
         color = kwargs.get('color')
         self._color = _get_hex_color(color) if color is not None else None
-        self._icon = _get_embeddable_image(_COLOR_ICON_PATH % 'clear')
         self._font_size = kwargs.get('font_size')
 
+    def clip(self, bounds):
+        '''
+        Clip the text to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_Text]: The text if it's within the bounds.
+        '''
+        return [self] if _get_points_within([self._lat], [self._lng], bounds)[0] else []
+
+    @classmethod
+    def write_icon(cls, w, context):
+        '''
+        Write the (transparent) icon shared by all text labels, which must be written before any of them.
+
+        Args:
+            w (_Writer): Writer used to write the icon.
+            context (_Context): Context used to keep track of what was drawn to the map.
+        '''
+        w.write('var %s = "%s";' % (cls._ICON_NAME, context.get_icon_url(_COLOR_ICON_PATH % cls._ICON_COLOR)))
+        w.write()
+
+    @classmethod
+    def add_icon_data(cls, context):
+        '''
+        Add the icon shared by all text labels to the icons of a split map's data file.
+
+        Args:
+            context (_Context): Context used to keep track of what was drawn to the map.
+        '''
+        context.icons[cls._ICON_NAME] = context.get_icon_url(_COLOR_ICON_PATH % cls._ICON_COLOR)
+
+    def get_layer(self):
+        '''
+        Get the text as a layer of a split map's data file.
+
+        Returns:
+            dict: JSON data of the text.
+        '''
+        label = {'text': self._text}
+        if self._color is not None: label['color'] = self._color
+        label['fontWeight'] = 'bold'
+        label['fontSize'] = '{}px'.format(self._font_size)
+        return {
+            'type': 'text',
+            'icon': self._ICON_NAME,
+            'position': {'lat': round(float(self._lat), self._precision), 'lng': round(float(self._lng), self._precision)},
+            'label': label
+        }
+
     def write(self, w):
         '''
-        Write the text.
+        Write the text. The icon shared by all text labels must already be written (see ``write_icon()``).
 
         Args:
             w (_Writer): Writer used to write the text.
@@ -40,7 +98,7 @@ class _Text(object):
         w.write('fontSize: "{}px"'.format(self._font_size))
         w.dedent()
         w.write('},')
-        w.write('icon: "%s",' % self._icon)
+        w.write('icon: %s,' % self._ICON_NAME)
         w.write('position: %s,' % self._position)
         w.write('map: map')
         w.dedent()
@@ -0,0 +1,161 @@
+import inspect
+import json
+import math
+
+from gmplot.utility import _TILE_SIZE, _WEB_MERCATOR_RADIUS_IN_M
+
+class _WebGLOverlay(object):
+    '''
+    Layer drawn straight to the map's WebGL context through a `WebGLOverlayView`_, which requires a vector map.
+
+    The layer's data is uploaded to the GPU as vertex buffers once, then drawn in a single call each frame.
+
+    .. _WebGLOverlayView: https://developers.google.com/maps/documentation/javascript/webgl/webgl-overlay-view
+    '''
+
+    def __init__(self, vertex_shader, fragment_shader, setup):
+        '''
+        Args:
+            vertex_shader (str): GLSL source of the vertex shader.
+                Gets the ``uMatrix``, ``uPixelsPerMeter`` and ``uPixelRatio`` uniforms, on top of the layer's own.
+            fragment_shader (str): GLSL source of the fragment shader.
+            setup (str): Body of a JavaScript function that gets the layer's ``data`` and returns
+                an object with the following attributes:
+                - buffers: Typed arrays to upload as vertex buffers.
+                - attributes: Vertex attributes, each as an object with a ``name``, the index of its ``buffer``,
+                  a ``size`` and a ``type`` (such as 'FLOAT'), as well as an optional ``normalized`` flag,
+                  ``stride``, ``offset`` and instance ``divisor``.
+                - uniforms: Object mapping the name of each of the layer's uniforms to an array of floats.
+                - mode: Primitive to draw (such as 'POINTS').
+                - count: Number of vertices to draw.
+                - instances: Number of instances to draw (optional).
+        '''
+        self._vertex_shader = vertex_shader
+        self._fragment_shader = fragment_shader
+        self._setup = setup
+
+    def write(self, w, origin, data):
+        '''
+        Write the overlay.
+
+        Args:
+            w (_Writer): Writer used to write the overlay.
+            origin ((float, float)): Latitude/longitude of the local origin of the layer's coordinates.
+            data ([(str, str)]): Data of the layer, as (name, JavaScript expression) pairs.
+        '''
+        w.write('''
+            (function(origin, data) {
+                var WORLD_SIZE = %d;
+                var EARTH_CIRCUMFERENCE = %f;
+
+                var getRgb = function(color) {
+                    var value = parseInt(color.slice(1), 16);
+                    return [value >> 16, (value >> 8) & 255, value & 255];
+                };
+
+                var layer = (function(data) {
+        ''' % (_TILE_SIZE, 2 * math.pi * _WEB_MERCATOR_RADIUS_IN_M))
+        w.indent()
+        w.indent()
+        w.write(self._setup)
+        w.dedent()
+        w.dedent()
+        w.write('''
+                })(data);
+
+                var overlay = new google.maps.WebGLOverlayView();
+                var program = null;
+                var buffers = [];
+
+                overlay.onContextRestored = function(options) {
+                    var gl = options.gl;
+                    var compileShader = function(type, source) {
+                        var shader = gl.createShader(type);
+                        gl.shaderSource(shader, source);
+                        gl.compileShader(shader);
+                        if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) throw new Error(gl.getShaderInfoLog(shader));
+                        return shader;
+                    };
+
+                    program = gl.createProgram();
+                    gl.attachShader(program, compileShader(gl.VERTEX_SHADER, %s));
+                    gl.attachShader(program, compileShader(gl.FRAGMENT_SHADER, %s));
+                    gl.linkProgram(program);
+                    if (!gl.getProgramParameter(program, gl.LINK_STATUS)) throw new Error(gl.getProgramInfoLog(program));
+
+                    buffers = layer.buffers.map(function(data) {
+                        var buffer = gl.createBuffer();
+                        gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+                        gl.bufferData(gl.ARRAY_BUFFER, data, gl.STATIC_DRAW);
+                        return buffer;
+                    });
+                    gl.bindBuffer(gl.ARRAY_BUFFER, null);
+                };
+
+                overlay.onContextLost = function() {
+                    program = null;
+                    buffers = [];
+                };
+
+                overlay.onDraw = function(options) {
+                    var gl = options.gl;
+                    if (!program) return;
+
+                    // (WebGL 1 only supports instancing through an extension)
+                    var instancing = gl.drawArraysInstanced ? null : gl.getExtension('ANGLE_instanced_arrays');
+                    var setDivisor = function(location, divisor) {
+                        if (!instancing) gl.vertexAttribDivisor(location, divisor);
+                        else instancing.vertexAttribDivisorANGLE(location, divisor);
+                    };
+
+                    gl.useProgram(program);
+                    var locations = [];
+                    layer.attributes.forEach(function(attribute) {
+                        var location = gl.getAttribLocation(program, attribute.name);
+                        if (location < 0) return;
+                        gl.bindBuffer(gl.ARRAY_BUFFER, buffers[attribute.buffer]);
+                        gl.enableVertexAttribArray(location);
+                        gl.vertexAttribPointer(location, attribute.size, gl[attribute.type], !!attribute.normalized, attribute.stride || 0, attribute.offset || 0);
+                        if (layer.instances !== undefined) setDivisor(location, attribute.divisor || 0);
+                        locations.push(location);
+                    });
+
+                    var uniforms = {
+                        uMatrix: options.transformer.fromLatLngAltitude({lat: origin[0], lng: origin[1], altitude: 0}),
+                        uPixelsPerMeter: [WORLD_SIZE * Math.pow(2, map.getZoom()) / (EARTH_CIRCUMFERENCE * Math.cos(origin[0] * Math.PI / 180))],
+                        uPixelRatio: [window.devicePixelRatio || 1]
+                    };
+                    for (var name in layer.uniforms) uniforms[name] = layer.uniforms[name];
+                    for (var name in uniforms) {
+                        var location = gl.getUniformLocation(program, name);
+                        if (name === 'uMatrix') gl.uniformMatrix4fv(location, false, uniforms[name]);
+                        else gl['uniform' + uniforms[name].length + 'fv'](location, uniforms[name]);
+                    }
+
+                    gl.enable(gl.BLEND);
+                    gl.blendFunc(gl.ONE, gl.ONE_MINUS_SRC_ALPHA);
+                    if (layer.instances === undefined) gl.drawArrays(gl[layer.mode], 0, layer.count);
+                    else if (!instancing) gl.drawArraysInstanced(gl[layer.mode], 0, layer.count, layer.instances);
+                    else instancing.drawArraysInstancedANGLE(gl[layer.mode], 0, layer.count, layer.instances);
+
+                    // Reset the state changed above, since the map shares the WebGL context:
+                    locations.forEach(function(location) {
+                        if (layer.instances !== undefined) setDivisor(location, 0);
+                        gl.disableVertexAttribArray(location);
+                    });
+                    gl.bindBuffer(gl.ARRAY_BUFFER, null);
+                };
+
+                overlay.setMap(map);
+            })(
+        ''' % (json.dumps(inspect.cleandoc(self._vertex_shader)), json.dumps(inspect.cleandoc(self._fragment_shader))))
+        w.indent()
+        w.write('[%.9f, %.9f],' % origin)
+        w.write('{')
+        w.indent()
+        w.write_lines('%s: %s%s' % (name, value, ',' if i < len(data) - 1 else '') for i, (name, value) in enumerate(data))
+        w.dedent()
+        w.write('}')
+        w.dedent()
+        w.write(');')
+        w.write()
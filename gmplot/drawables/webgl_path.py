@@ -0,0 +1,120 @@
+import copy
+
+import numpy as np
+
+from gmplot.clipping import _clip_path
+from gmplot.color import _get_hex_color
+from gmplot.utility import _format_typed_array, _get_local_coordinates
+from gmplot.drawables.webgl_overlay import _WebGLOverlay
+
+class _WebGLPath(object):
+    '''
+    Path drawn with WebGL, as one quad per segment.
+
+    Unlike a regular polyline, the path is drawn straight along the map rather than along the Earth's curvature.
+    '''
+
+    _VERTEX_SHADER = '''
+        attribute vec2 aStart;
+        attribute vec2 aEnd;
+        attribute vec2 aCorner;
+        uniform mat4 uMatrix;
+        uniform float uPixelsPerMeter;
+        uniform float uPixelRatio;
+        uniform float uWidth;
+
+        void main() {
+            // Scale the path's width to device pixels like the points' sizes (at least one device pixel wide),
+            // then back to meters, since the quad is drawn in map space rather than in device pixels:
+            float width = max(uWidth * uPixelRatio, 1.0) / uPixelRatio / uPixelsPerMeter;
+
+            // Stretch the quad along the segment, then offset it sideways by half the path's width:
+            vec2 direction = aEnd - aStart;
+            float segmentLength = length(direction);
+            vec2 normal = segmentLength > 0.0 ? vec2(-direction.y, direction.x) / segmentLength : vec2(0.0);
+            vec2 position = mix(aStart, aEnd, aCorner.x) + normal * aCorner.y * width / 2.0;
+            gl_Position = uMatrix * vec4(position, 0.0, 1.0);
+        }
+    '''
+
+    _FRAGMENT_SHADER = '''
+        precision mediump float;
+        uniform vec4 uColor;
+
+        void main() {
+            gl_FragColor = vec4(uColor.rgb * uColor.a, uColor.a);
+        }
+    '''
+
+    _SETUP = '''
+        // Each segment is drawn as an instance of the same quad, reading its endpoints straight from the position buffer:
+        return {
+            buffers: [data.positions, new Float32Array([0, -1, 1, -1, 1, 1, 0, -1, 1, 1, 0, 1])],
+            attributes: [
+                {name: 'aStart', buffer: 0, size: 2, type: 'FLOAT', stride: 8, offset: 0, divisor: 1},
+                {name: 'aEnd', buffer: 0, size: 2, type: 'FLOAT', stride: 8, offset: 8, divisor: 1},
+                {name: 'aCorner', buffer: 1, size: 2, type: 'FLOAT'}
+            ],
+            uniforms: {uColor: data.color, uWidth: [data.width]},
+            mode: 'TRIANGLES',
+            count: 6,
+            instances: data.positions.length / 2 - 1
+        };
+    '''
+
+    def __init__(self, lats, lngs, **kwargs):
+        '''
+        Args:
+            lats ([float]): Latitudes.
+            lngs ([float]): Longitudes.
+
+        Optional:
+
+        Args:
+            color (str): Color of the path. Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c').
+            alpha (float): Opacity of the path, ranging from 0 to 1.
+            width (int): Width of the path, in pixels.
+        '''
+        self._lats = np.asarray(lats, dtype=float)
+        self._lngs = np.asarray(lngs, dtype=float)
+        color = kwargs.get('color')
+        self._color = _get_hex_color(color) if color is not None else '#000000'
+        self._alpha = kwargs.get('alpha', 1.0)
+        self._width = kwargs.get('width', 1)
+
+    def clip(self, bounds):
+        '''
+        Clip the WebGL path to the given bounds.
+
+        Args:
+            bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``.
+
+        Returns:
+            [_WebGLPath]: Part of the path within the bounds, for each time it crosses into them.
+        '''
+        clipped_parts = []
+        for lats, lngs in _clip_path(self._lats, self._lngs, bounds):
+            clipped = copy.copy(self)
+            clipped._lats = lats
+            clipped._lngs = lngs
+            clipped_parts.append(clipped)
+        return clipped_parts
+
+    def write(self, w):
+        '''
+        Write the WebGL path.
+
+        Args:
+            w (_Writer): Writer used to write the WebGL path.
+        '''
+        if len(self._lats) < 2:
+            return
+
+        origin, east, north = _get_local_coordinates(self._lats, self._lngs)
+        red, green, blue = [int(self._color[i:i + 2], 16) / 255.0 for i in (1, 3, 5)]
+
+        _WebGLOverlay(self._VERTEX_SHADER, self._FRAGMENT_SHADER, self._SETUP).write(w, origin, [
+            ('color', '[%f, %f, %f, %f]' % (red, green, blue, self._alpha)),
+            ('width', '%d' % self._width),
+            ('positions', _format_typed_array(np.column_stack((east, north)).astype(np.float32)))
+        ])
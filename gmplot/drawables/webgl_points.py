@@ -0,0 +1,133 @@
+import numpy as np
+
+from gmplot.utility import _format_typed_array, _get_local_coordinates
+from gmplot.drawables.symbol_batch import _SymbolBatch
+from gmplot.drawables.webgl_overlay import _WebGLOverlay
+
+class _WebGLPoints(_SymbolBatch):
+    '''
+    Batch of symbols drawn with WebGL, as one point sprite per symbol.
+    '''
+
+    _VERTEX_SHADER = '''
+        attribute vec2 aPosition;
+        attribute float aSize;
+        attribute vec4 aEdgeColor;
+        attribute vec4 aFaceColor;
+        attribute vec2 aStyle;
+        uniform mat4 uMatrix;
+        uniform float uPixelsPerMeter;
+        uniform float uPixelRatio;
+        varying vec4 vEdgeColor;
+        varying vec4 vFaceColor;
+        varying float vShape;
+        varying float vEdgeWidth;
+        varying float vScale;
+
+        void main() {
+            gl_Position = uMatrix * vec4(aPosition, 0.0, 1.0);
+
+            float radius = max(aSize * uPixelsPerMeter * uPixelRatio, 1.0);
+            float edgeWidth = aStyle.y * uPixelRatio;
+            gl_PointSize = 2.0 * radius + edgeWidth;
+
+            vEdgeColor = aEdgeColor;
+            vFaceColor = aFaceColor;
+            vShape = aStyle.x;
+            vEdgeWidth = edgeWidth / radius;
+            vScale = (radius + edgeWidth / 2.0) / radius;
+        }
+    '''
+
+    _FRAGMENT_SHADER = '''
+        precision mediump float;
+        varying vec4 vEdgeColor;
+        varying vec4 vFaceColor;
+        varying float vShape;
+        varying float vEdgeWidth;
+        varying float vScale;
+
+        void main() {
+            // Position within the symbol, in units of its radius:
+            vec2 point = (gl_PointCoord * 2.0 - 1.0) * vScale;
+            float halfWidth = vEdgeWidth / 2.0;
+            vec4 color = vEdgeColor;
+
+            if (vShape < 0.5) {
+                float distanceToCenter = length(point);
+                if (distanceToCenter > 1.0 + halfWidth) discard;
+                if (distanceToCenter < 1.0 - halfWidth) color = vFaceColor;
+            } else {
+                // (an 'x' is a '+' rotated by 45 degrees)
+                if (vShape < 1.5) point = vec2(point.x + point.y, point.x - point.y) * 0.70710678;
+                if (max(abs(point.x), abs(point.y)) > 1.0 || min(abs(point.x), abs(point.y)) > halfWidth) discard;
+            }
+
+            gl_FragColor = vec4(color.rgb * color.a, color.a);
+        }
+    '''
+
+    _SETUP = '''
+        // Expand the style table into a color buffer, with the edge color, face color, shape and edge width of each symbol:
+        var styles = data.styles.map(function(style) {
+            return getRgb(style.strokeColor || '#000000')
+                .concat([255 * (style.strokeOpacity != null ? style.strokeOpacity : 1)])
+                .concat(style.fillColor ? getRgb(style.fillColor) : [0, 0, 0])
+                .concat([style.fillColor ? 255 * (style.fillOpacity != null ? style.fillOpacity : 1) : 0]);
+        });
+        var numPoints = data.shapes.length;
+        var colors = new Uint8Array(12 * numPoints);
+        for (var i = 0; i < numPoints; i++) {
+            var style = data.styles[data.styleIndices[i]];
+            colors.set(styles[data.styleIndices[i]], 12 * i);
+            colors[12 * i + 8] = data.shapes[i];
+            colors[12 * i + 9] = style.strokeWeight != null ? style.strokeWeight : 1;
+        }
+
+        return {
+            buffers: [data.positions, data.sizes, colors],
+            attributes: [
+                {name: 'aPosition', buffer: 0, size: 2, type: 'FLOAT'},
+                {name: 'aSize', buffer: 1, size: 1, type: 'FLOAT'},
+                {name: 'aEdgeColor', buffer: 2, size: 4, type: 'UNSIGNED_BYTE', normalized: true, stride: 12, offset: 0},
+                {name: 'aFaceColor', buffer: 2, size: 4, type: 'UNSIGNED_BYTE', normalized: true, stride: 12, offset: 4},
+                {name: 'aStyle', buffer: 2, size: 2, type: 'UNSIGNED_BYTE', stride: 12, offset: 8}
+            ],
+            uniforms: {},
+            mode: 'POINTS',
+            count: numPoints
+        };
+    '''
+
+    def get_layer(self):
+        '''
+        Get the WebGL points as a layer of a split map's data file.
+
+        Returns:
+            None: The WebGL points isn't supported by the renderer script, so it's always written to the page itself.
+        '''
+        return None
+
+    def write(self, w):
+        '''
+        Write the WebGL points.
+
+        Args:
+            w (_Writer): Writer used to write the WebGL points.
+        '''
+        if len(self) == 0:
+            return
+
+        styles, style_indices = self._get_styles()
+        origin, east, north = _get_local_coordinates(self._lats, self._lngs)
+
+        # Scale each symbol's size to the local frame (where distances are as at the origin):
+        sizes = self._sizes.astype(float) * np.cos(np.radians(origin[0])) / np.cos(np.radians(self._lats))
+
+        _WebGLOverlay(self._VERTEX_SHADER, self._FRAGMENT_SHADER, self._SETUP).write(w, origin, [
+            ('styles', '[%s]' % ','.join(styles)),
+            ('styleIndices', _format_typed_array(style_indices.astype(np.uint8 if len(styles) <= 256 else np.int32))),
+            ('shapes', _format_typed_array(self._get_shape_codes())),
+            ('positions', _format_typed_array(np.column_stack((east, north)).astype(np.float32))),
+            ('sizes', _format_typed_array(sizes.astype(np.float32)))
+        ])
@@ -0,0 +1,297 @@
+import bisect
+import io
+import json
+import mmap
+import os
+import shutil
+import unicodedata
+
+import numpy as np
+
+def _normalize_name(name):
+    '''
+    Normalize a place name for lookups in a gazetteer.
+
+    Args:
+        name (str): Place name.
+
+    Returns:
+        str: Normalized name, in lowercase, without accents and with runs of whitespace collapsed into single spaces.
+    '''
+    name = ''.join(c for c in unicodedata.normalize('NFKD', name) if not unicodedata.combining(c))
+    return ' '.join(name.split()).casefold()
+
+class _SortedNames(object):
+    '''Read-only sequence of a gazetteer's sorted names, decoded from its memory-mapped index as they're accessed.'''
+
+    def __init__(self, names, offsets):
+        '''
+        Args:
+            names (mmap.mmap or bytes): All of the names, encoded as UTF-8 and concatenated in sorted order.
+            offsets (numpy.ndarray): Offset of each name in ``names``, followed by the total size of ``names``.
+        '''
+        self._names = names
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        return self._names[int(self._offsets[index]):int(self._offsets[index + 1])]
+
+class Gazetteer(object):
+    '''
+    Offline geocoder that looks locations up in a local gazetteer file, such as a `GeoNames`_ dump.
+
+    The gazetteer is converted once into a compact index of sorted names (saved next to it),
+    which is memory-mapped rather than loaded, so even large gazetteers open instantly and are shared
+    between processes. Each lookup is a binary search over the index.
+
+    .. _GeoNames: https://download.geonames.org/export/dump/
+    '''
+
+    _NAME_COLUMNS = (1, 2)
+    _ALTERNATE_NAMES_COLUMN = 3
+    _LAT_COLUMN = 4
+    _LNG_COLUMN = 5
+    _FEATURE_CODE_COLUMN = 7
+    _COUNTRY_COLUMN = 8
+    _ADMIN1_COLUMN = 10
+    _POPULATION_COLUMN = 14
+    # Note: These are the columns of the GeoNames tab-separated format.
+
+    def __init__(self, path, index_path=None, alternate_names=False):
+        '''
+        Args:
+            path (str): Path of the gazetteer, as a tab-separated file in the GeoNames format
+                (with at least the geonameid, name, asciiname, alternatenames, latitude and longitude columns,
+                and optionally the feature code, country code and admin1 code columns, which qualifiers are checked against,
+                and the population column, which ranks places that share a name).
+
+        Optional:
+
+        Args:
+            index_path (str): Path of the folder that holds the gazetteer's index.
+                The index is built if it doesn't exist, if it's older than the gazetteer,
+                or if it was built with different options.
+                Defaults to the gazetteer's path followed by '.index'.
+            alternate_names (bool): Whether or not to also index each place's alternate names
+                (when the index is built). This makes the index much larger. Defaults to False.
+
+        Usage::
+
+            import gmplot
+            gmplot.GoogleMapPlotter.geocoder = gmplot.Gazetteer('cities15000.txt')
+            gmap = gmplot.GoogleMapPlotter.from_geocode('Versailles, FR')
+        '''
+        if index_path is None:
+            index_path = path + '.index'
+
+        options = {'alternate_names': bool(alternate_names)}
+        if not self._is_index_current(path, index_path, options):
+            self._build_index(path, index_path, options)
+
+        self._file = open(os.path.join(index_path, 'names.bin'), 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        names = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else b''
+        self._names = _SortedNames(names, np.load(os.path.join(index_path, 'offsets.npy'), mmap_mode='r'))
+        self._lats = np.load(os.path.join(index_path, 'lats.npy'), mmap_mode='r')
+        self._lngs = np.load(os.path.join(index_path, 'lngs.npy'), mmap_mode='r')
+        self._feature_codes = np.load(os.path.join(index_path, 'feature_codes.npy'), mmap_mode='r')
+        self._countries = np.load(os.path.join(index_path, 'countries.npy'), mmap_mode='r')
+        self._admin1s = np.load(os.path.join(index_path, 'admin1s.npy'), mmap_mode='r')
+
+    @staticmethod
+    def _is_index_current(path, index_path, options):
+        '''
+        Check whether the index of a gazetteer is up to date.
+
+        Args:
+            path (str): Path of the gazetteer.
+            index_path (str): Path of the folder that holds the index.
+            options (dict): Options to build the index with.
+
+        Returns:
+            bool: True if the index was built from the current gazetteer with the same options, False otherwise.
+        '''
+        options_path = os.path.join(index_path, 'options.json')
+        if not os.path.isfile(options_path) or os.path.getmtime(options_path) < os.path.getmtime(path):
+            return False
+
+        with io.open(options_path, encoding='utf-8') as f:
+            try:
+                return json.load(f) == options
+            except ValueError:
+                return False
+
+    @classmethod
+    def _build_index(cls, path, index_path, options):
+        '''
+        Build the index of a gazetteer.
+
+        Args:
+            path (str): Path of the gazetteer.
+            index_path (str): Path of the folder to write the index to (replacing any previous index).
+            options (dict): Options to build the index with, as a dict with the following keys:
+                - alternate_names (bool): Whether or not to index each place's alternate names.
+        '''
+        alternate_names = options['alternate_names']
+        entries = []
+        with io.open(path, encoding='utf-8') as f:
+            for line in f:
+                columns = line.rstrip('\n').split('\t')
+                if len(columns) <= cls._LNG_COLUMN or line.startswith('#'):
+                    continue
+
+                names = [columns[column] for column in cls._NAME_COLUMNS]
+                if alternate_names and columns[cls._ALTERNATE_NAMES_COLUMN]:
+                    names += columns[cls._ALTERNATE_NAMES_COLUMN].split(',')
+
+                get_column = lambda column: columns[column] if len(columns) > column else ''
+                population = get_column(cls._POPULATION_COLUMN)
+                population = int(population) if population.isdigit() else 0
+                lat, lng = float(columns[cls._LAT_COLUMN]), float(columns[cls._LNG_COLUMN])
+                feature_code, country, admin1 = [
+                    get_column(column).encode('utf-8')
+                    for column in (cls._FEATURE_CODE_COLUMN, cls._COUNTRY_COLUMN, cls._ADMIN1_COLUMN)
+                ]
+                for name in set(_normalize_name(name) for name in names):
+                    if name:
+                        entries.append((name.encode('utf-8'), -population, lat, lng, feature_code, country, admin1))
+
+        # Sort by name, with the most populous place first among places that share a name:
+        entries.sort(key=lambda entry: entry[:2])
+        sizes = np.array([len(entry[0]) for entry in entries], dtype=np.uint64)
+
+        if os.path.isdir(index_path):
+            shutil.rmtree(index_path)
+        os.makedirs(index_path)
+
+        with open(os.path.join(index_path, 'names.bin'), 'wb') as f:
+            f.write(b''.join(entry[0] for entry in entries))
+        np.save(os.path.join(index_path, 'offsets.npy'), np.concatenate(([0], np.cumsum(sizes))).astype(np.uint64))
+        np.save(os.path.join(index_path, 'lats.npy'), np.array([entry[2] for entry in entries], dtype=float))
+        np.save(os.path.join(index_path, 'lngs.npy'), np.array([entry[3] for entry in entries], dtype=float))
+        np.save(os.path.join(index_path, 'feature_codes.npy'), np.array([entry[4] for entry in entries], dtype=bytes))
+        np.save(os.path.join(index_path, 'countries.npy'), np.array([entry[5] for entry in entries], dtype=bytes))
+        np.save(os.path.join(index_path, 'admin1s.npy'), np.array([entry[6] for entry in entries], dtype=bytes))
+
+        # Write the options last, so that an index that's only partly written is rebuilt:
+        with io.open(os.path.join(index_path, 'options.json'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(options))
+
+    def __len__(self):
+        return len(self._names)
+
+    def _find(self, name):
+        '''
+        Find a normalized name in the index.
+
+        Args:
+            name (str): Normalized name.
+
+        Returns:
+            range: Indices of the places with the name, from most to least populous (empty if there's no such place).
+        '''
+        key = name.encode('utf-8')
+        return range(bisect.bisect_left(self._names, key), bisect.bisect_right(self._names, key))
+
+    def _get_regions(self, qualifier):
+        '''
+        Get the regions that a location's qualifier (such as 'France' in 'Versailles, France') may refer to.
+
+        Args:
+            qualifier (str): Normalized qualifier.
+
+        Returns:
+            set: (country code, admin1 code) of each region, where a code of None matches any code.
+        '''
+        # The qualifier may be a code itself (such as 'FR' or 'TX'):
+        code = qualifier.upper().encode('utf-8')
+        regions = {(code, None), (None, code)}
+
+        # ...or the name of a country or first-order administrative division (such as 'Texas'):
+        for index in self._find(qualifier):
+            feature_code = self._feature_codes[index]
+            if feature_code.startswith(b'PCL'):
+                regions.add((self._countries[index], None))
+            elif feature_code.startswith(b'ADM1'):
+                regions.add((self._countries[index], self._admin1s[index]))
+
+        return regions
+
+    def _is_in(self, index, regions):
+        '''
+        Check whether a place is in any of the given regions.
+
+        Args:
+            index (int): Index of the place.
+            regions (set): (country code, admin1 code) of each region, as returned by ``_get_regions()``.
+
+        Returns:
+            bool: True if the place is in any of the regions, False otherwise.
+        '''
+        country, admin1 = self._countries[index], self._admin1s[index]
+        return any(
+            country and (region_country is None or region_country == country) and (region_admin1 is None or region_admin1 == admin1)
+            for region_country, region_admin1 in regions
+        )
+
+    def geocode(self, location):
+        '''
+        Return the lat/lng coordinates of a location string.
+
+        The whole location is looked up first. Otherwise, its first part (before any comma) is looked up
+        among the places that match all of the qualifiers after it, which can be country or admin1 codes
+        (such as 'FR' or 'TX') or the names of countries or first-order administrative divisions in the gazetteer
+        (such as 'France' or 'Texas'). Among the matching places, the most populous one is returned.
+
+        Args:
+            location (str): Location of interest, as a human-readable string.
+
+        Returns:
+            (float, float): Latitude/longitude coordinates of the location, or None if it isn't in the gazetteer
+            (or if its qualifiers can't be checked against the gazetteer).
+        '''
+        name = _normalize_name(location)
+        places = self._find(name)
+        if not places and ',' in name:
+            parts = [part.strip() for part in name.split(',')]
+            all_regions = [self._get_regions(qualifier) for qualifier in parts[1:] if qualifier]
+            places = [index for index in self._find(parts[0]) if all(self._is_in(index, regions) for regions in all_regions)]
+
+        if not places:
+            return None
+        return float(self._lats[places[0]]), float(self._lngs[places[0]])
+
+    def search(self, prefix, limit=10):
+        '''
+        Find the places whose name starts with a prefix.
+
+        Args:
+            prefix (str): Prefix of the names to find.
+
+        Optional:
+
+        Args:
+            limit (int): Maximum number of places to return. Defaults to 10.
+
+        Returns:
+            [(str, float, float)]: Normalized name and latitude/longitude coordinates of each place found,
+                in alphabetical order.
+        '''
+        key = _normalize_name(prefix).encode('utf-8')
+        start = bisect.bisect_left(self._names, key)
+        end = min(bisect.bisect_left(self._names, key + b'\xff'), start + limit)
+        # (0xFF never appears in UTF-8, so it sorts after every name that starts with the prefix)
+
+        return [
+            (self._names[index].decode('utf-8'), float(self._lats[index]), float(self._lngs[index]))
+            for index in range(start, end)
+        ]
+
+    def close(self):
+        '''Close the gazetteer's index.'''
+        if isinstance(self._names._names, mmap.mmap):
+            self._names._names.close()
+        self._file.close()
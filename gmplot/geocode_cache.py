@@ -0,0 +1,161 @@
+import collections
+import sqlite3
+import threading
+import time
+
+def _normalize_location(location):
+    '''
+    Normalize a location string, so that trivially different spellings of the same location share a cache entry.
+
+    Args:
+        location (str): Location or address, as a human-readable string.
+
+    Returns:
+        str: Normalized location, in lowercase and with runs of whitespace collapsed into single spaces.
+    '''
+    return ' '.join(location.split()).casefold()
+
+class GeocodeCache(object):
+    '''
+    Cache of geocoded locations, kept in memory and optionally persisted to an SQLite database.
+
+    Locations are looked up by their normalized string (case and extra whitespace are ignored).
+    Only successful lookups are cached.
+    '''
+
+    def __init__(self, max_size=1024, path=None, ttl=None):
+        '''
+        Optional:
+
+        Args:
+            max_size (int): Maximum number of locations kept in memory, beyond which the least recently used
+                ones are evicted. Defaults to 1024.
+            path (str): Path of an SQLite database to persist the cache to, which is created if it doesn't exist.
+                Every location is kept in the database, not only the ones kept in memory. By default, the cache
+                only lives in memory.
+            ttl (float): How long each location stays cached, in seconds. By default, locations never expire.
+
+        Usage::
+
+            import gmplot
+            gmplot.GoogleMapPlotter.geocode_cache = gmplot.GeocodeCache(path='geocodes.db', ttl=30 * 24 * 60 * 60)
+        '''
+        if max_size < 1:
+            raise ValueError('`max_size` must be positive!')
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        '''Number of lookups that were found in the cache.'''
+
+        self.misses = 0
+        '''Number of lookups that weren't found in the cache.'''
+
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS geocodes (location TEXT PRIMARY KEY, lat REAL, lng REAL, time REAL)'
+                )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _is_expired(self, cached_time):
+        '''
+        Check whether or not a cache entry has expired.
+
+        Args:
+            cached_time (float): Time at which the entry was cached, as a Unix timestamp.
+
+        Returns:
+            bool: True if the entry has expired, False otherwise.
+        '''
+        return self._ttl is not None and time.time() - cached_time >= self._ttl
+
+    def _remember(self, key, entry):
+        '''
+        Keep an entry in memory as the most recently used one, evicting the least recently used one if needed.
+        Must be called while holding the lock.
+
+        Args:
+            key (str): Normalized location.
+            entry (((float, float), float)): Latitude/longitude coordinates of the location, and the time it was cached.
+        '''
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, location):
+        '''
+        Get a location from the cache.
+
+        Args:
+            location (str): Location or address, as a human-readable string.
+
+        Returns:
+            (float, float): Latitude/longitude coordinates of the location, or None if it isn't cached (or expired).
+        '''
+        key = _normalize_location(location)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._connection is not None:
+                row = self._connection.execute('SELECT lat, lng, time FROM geocodes WHERE location = ?', (key,)).fetchone()
+                if row is not None:
+                    entry = ((row[0], row[1]), row[2])
+
+            if entry is not None and self._is_expired(entry[1]):
+                self._entries.pop(key, None)
+                if self._connection is not None:
+                    with self._connection:
+                        self._connection.execute('DELETE FROM geocodes WHERE location = ?', (key,))
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, location, lat_lng):
+        '''
+        Add a location to the cache.
+
+        Args:
+            location (str): Location or address, as a human-readable string.
+            lat_lng ((float, float)): Latitude/longitude coordinates of the location.
+        '''
+        key = _normalize_location(location)
+        entry = ((float(lat_lng[0]), float(lat_lng[1])), time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        'INSERT OR REPLACE INTO geocodes (location, lat, lng, time) VALUES (?, ?, ?, ?)',
+                        (key, entry[0][0], entry[0][1], entry[1])
+                    )
+
+    def clear(self):
+        '''Remove every location from the cache (including its database, if any), and reset the hit/miss counters.'''
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute('DELETE FROM geocodes')
+
+    def close(self):
+        '''Close the cache's database, if any. The in-memory cache stays usable.'''
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+
+_GEOCODE_URL = 'https://maps.googleapis.com/maps/api/geocode/json'
+# Note: This is the endpoint of Google's Geocoding API.
+
+_RETRY_DELAY = 0.5
+# Note: This is how long to wait before the first retry of a request that's over the query limit, in seconds
+#       (each following retry waits twice as long as the previous one).
+
+class GoogleAPIError(Exception):
+    pass
+
+class _RateLimiter(object):
+    '''Limiter that spaces out requests (from any number of threads) to at most a given rate.'''
+
+    def __init__(self, rate):
+        '''
+        Args:
+            rate (float): Maximum number of requests per second, or None for no limit.
+        '''
+        self._interval = 1.0 / rate if rate else 0
+        self._next_time = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        '''Wait until the next request can be made.'''
+        with self._lock:
+            now = time.monotonic()
+            request_time = max(now, self._next_time)
+            self._next_time = request_time + self._interval
+
+        if request_time > now:
+            time.sleep(request_time - now)
+
+def _request_geocode(get, location, apikey=None, base_url=_GEOCODE_URL, max_retries=0, rate_limiter=None):
+    '''
+    Request the lat/lng coordinates of a location string from the Geocoding API.
+
+    Args:
+        get (function): Function used to make the GET request, such as ``requests.get`` or a session's ``get``.
+        location (str): Location or address of interest, as a human-readable string.
+
+    Optional:
+
+    Args:
+        apikey (str): Google Maps API key.
+        base_url (str): URL of the Geocoding API. Defaults to Google's.
+        max_retries (int): Number of times to retry the request (with exponential backoff)
+            while it's over the query limit. Defaults to 0.
+        rate_limiter (_RateLimiter): Limiter to wait on before each request (including retries).
+
+    Returns:
+        (float, float): Latitude/longitude coordinates of the given location string.
+    '''
+    params = {'address': '"%s"' % location}
+    if apikey: params['key'] = apikey
+
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+
+        response = json.loads(get(base_url, params=params).text)
+        if response.get('status') != 'OVER_QUERY_LIMIT' or attempt == max_retries:
+            break
+        time.sleep(_RETRY_DELAY * 2 ** attempt)
+
+    if response.get('error_message', ''):
+        raise GoogleAPIError(response['error_message'])
+
+    if response.get('status') == 'OVER_QUERY_LIMIT':
+        raise GoogleAPIError("Over the query limit while geocoding '%s'!" % location)
+
+    latlng_dict = response['results'][0]['geometry']['location']
+    return latlng_dict['lat'], latlng_dict['lng']
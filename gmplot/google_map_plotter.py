@@ -1,10 +1,20 @@
-from __future__ import absolute_import
-
+import io
+import itertools
 import json
+import os
 import requests
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+
+import numpy as np
 
+from gmplot.color import _get_hex_color
 from gmplot.context import _Context
-from gmplot.utility import StringIO, _get
+from gmplot.geocode_cache import GeocodeCache, _normalize_location
+from gmplot.geocoding import GoogleAPIError, _GEOCODE_URL, _RateLimiter, _request_geocode
+from gmplot.simplification import _get_meters_per_pixel, _simplify_path
+from gmplot.utility import _COMPRESSION_EXTENSIONS, _get, _open_compressed, _write_renderer
 from gmplot.writer import _Writer
 
 from gmplot.drawables.grid import _Grid
@@ -13,15 +23,19 @@ from gmplot.drawables.heatmap import _Heatmap
 from gmplot.drawables.map import _Map
 from gmplot.drawables.marker_dropper import _MarkerDropper
 from gmplot.drawables.marker import _Marker
+from gmplot.drawables.marker_batch import _MarkerBatch
+from gmplot.drawables.marker_clusterer import _MarkerClusterer
+from gmplot.drawables.marker_icon import _MarkerIcon
+from gmplot.drawables.path_levels import _PathLevels
 from gmplot.drawables.polygon import _Polygon
 from gmplot.drawables.polyline import _Polyline
 from gmplot.drawables.route import _Route
-from gmplot.drawables.symbol import _Symbol
+from gmplot.drawables.symbol_batch import _SymbolBatch
+from gmplot.drawables.symbol_canvas import _SymbolCanvas
 from gmplot.drawables.symbols.circle import _Circle
 from gmplot.drawables.text import _Text
-
-class GoogleAPIError(Exception):
-    pass
+from gmplot.drawables.webgl_path import _WebGLPath
+from gmplot.drawables.webgl_points import _WebGLPoints
 
 def _validate_lat_lng_length(lats, lngs):
     if len(lats) != len(lngs):
@@ -31,11 +45,53 @@ def _validate_num_points(name, items, num_points):
     if len(items) != num_points:
         raise ValueError("`%s`'%s length doesn't match the number of points!" % (name, 's' if name[-1] != 's' else ''))
 
+def _clip_drawables(drawables, bounds):
+    '''
+    Clip drawables to the given bounds.
+
+    Args:
+        drawables ([object]): Drawables to clip. Drawables that can't be clipped are kept as is.
+        bounds (dict): Bounds, as a dict of the form ``{'north': float, 'south': float, 'east': float, 'west': float}``,
+            or None to keep every drawable as is.
+
+    Returns:
+        [object]: Clipped drawables.
+    '''
+    if bounds is None:
+        return drawables
+
+    return [clipped for drawable in drawables for clipped in (drawable.clip(bounds) if hasattr(drawable, 'clip') else [drawable])]
+
+def _render_drawable(drawable, bounds, indent_level):
+    '''
+    Render a drawable on its own, such as in a worker process.
+
+    Args:
+        drawable (object): Drawable to render.
+        bounds (dict): Bounds to clip the drawable to, or None to not clip it.
+        indent_level (int): Indent level to render the drawable at.
+
+    Returns:
+        str: Output of the drawable.
+    '''
+    with StringIO() as f:
+        w = _Writer(f, indent_level)
+        for clipped in _clip_drawables([drawable], bounds):
+            clipped.write(w)
+        return f.getvalue()
+
 class GoogleMapPlotter(object):
     '''
     Plotter that draws on a Google Map.
     '''
 
+    geocode_cache = GeocodeCache()
+    # Note: This is the cache used by `geocode()` and `from_geocode()` by default, shared by the whole process.
+
+    geocoder = None
+    # Note: This is the offline geocoder (such as a `Gazetteer`) that `geocode()` and `from_geocode()` try
+    #       before requesting Google's Geocoding API, by default.
+
     def __init__(self, lat, lng, zoom, **kwargs):
         '''
         Args:
@@ -55,6 +111,15 @@ class GoogleMapPlotter(object):
             fit_bounds (dict): Fit the map to contain the given bounds, as a dict of the form
                 ``{'north': float, 'south': float, 'east': float, 'west': float}``.
             precision (int): Number of digits after the decimal to round to for the lat/lng center. Defaults to 6.
+            map_id (str): `Map ID`_ of the map's style. WebGL rendering requires the ID of a vector map.
+            render_bounds (dict or bool): Only write what's within the given bounds, as a dict of the form
+                ``{'north': float, 'south': float, 'east': float, 'west': float}``, or True to use ``fit_bounds``.
+                Markers, texts, symbols and heatmap points outside of the bounds are left out,
+                while polylines and polygons are clipped to the bounds. Circles and ground overlays are left out
+                if they're entirely outside of the bounds. Grids and routes are always written in full.
+                By default, everything is written.
+            incremental (bool): Whether or not to keep the output of each layer between draws, so that drawing the map
+                again only writes the layers added since (at the cost of holding the output in memory). Defaults to False.
 
         .. _Zoom level: https://developers.google.com/maps/documentation/javascript/tutorial#zoom-levels
         .. _Map type: https://developers.google.com/maps/documentation/javascript/maptypes
@@ -63,6 +128,7 @@ class GoogleMapPlotter(object):
         .. _Maps JavaScript API: https://console.cloud.google.com/marketplace/details/google/maps-backend.googleapis.com
         .. _Tilt: https://developers.google.com/maps/documentation/javascript/reference/map#MapOptions.tilt
         .. _scale control: https://developers.google.com/maps/documentation/javascript/reference/map#MapOptions.scaleControl
+        .. _Map ID: https://developers.google.com/maps/documentation/get-map-id
 
         Usage::
 
@@ -113,12 +179,32 @@ class GoogleMapPlotter(object):
             map_styles=_get(kwargs, 'map_styles'),
             tilt=_get(kwargs, 'tilt'),
             scale_control=_get(kwargs, 'scale_control', False),
-            fit_bounds=_get(kwargs, 'fit_bounds')
+            fit_bounds=_get(kwargs, 'fit_bounds'),
+            map_id=_get(kwargs, 'map_id')
         )
 
+        self._render_bounds = _get(kwargs, 'render_bounds')
+        if self._render_bounds is False:
+            self._render_bounds = None
+        elif self._render_bounds is True:
+            self._render_bounds = _get(kwargs, 'fit_bounds')
+            if self._render_bounds is None:
+                raise ValueError('Render bounds of True require `fit_bounds`!')
+        elif self._render_bounds is not None and not isinstance(self._render_bounds, dict):
+            raise ValueError('Render bounds must be a dict of bounds, True or False!')
+        if self._render_bounds is not None:
+            if self._render_bounds['west'] > self._render_bounds['east']:
+                raise ValueError("Render bounds can't cross the antimeridian!")
+            if self._render_bounds['south'] > self._render_bounds['north']:
+                raise ValueError('Render bounds must have their south below their north!')
+
+        self._incremental = _get(kwargs, 'incremental', False)
+        self._fragments = {}
+
         self._drawables = []
         self._markers = []
         self._marker_dropper = None
+        self._marker_clusterer = None
 
     @classmethod
     def from_geocode(cls, location, **kwargs):
@@ -143,6 +229,13 @@ class GoogleMapPlotter(object):
             fit_bounds (dict): Fit the map to contain the given bounds, as a dict of the form
                 ``{'north': float, 'south': float, 'east': float, 'west': float}``.
             precision (int): Number of digits after the decimal to round to for the lat/lng center. Defaults to 6.
+            render_bounds (dict or bool): Only write what's within the given bounds, as a dict of the form
+                ``{'north': float, 'south': float, 'east': float, 'west': float}``, or True to use ``fit_bounds``.
+            incremental (bool): Whether or not to keep the output of each layer between draws. Defaults to False.
+            cache (GeocodeCache or bool): Cache to look the location up in (and to add it to), or False to not use a cache.
+                Defaults to ``GoogleMapPlotter.geocode_cache``.
+            geocoder (Gazetteer or bool): Offline geocoder to look the location up in before requesting it from
+                the Geocoding API, or False to not use one. Defaults to ``GoogleMapPlotter.geocoder``.
 
         Returns:
             :class:`GoogleMapPlotter`
@@ -168,7 +261,7 @@ class GoogleMapPlotter(object):
         apikey = _get(kwargs, 'apikey')
 
         return cls(
-            *GoogleMapPlotter.geocode(location, apikey=apikey),
+            *GoogleMapPlotter.geocode(location, apikey=apikey, cache=_get(kwargs, 'cache'), geocoder=_get(kwargs, 'geocoder')),
             zoom=_get(kwargs, 'zoom', 13),
             map_type=_get(kwargs, 'map_type'),
             apikey=apikey,
@@ -177,7 +270,9 @@ class GoogleMapPlotter(object):
             tilt=_get(kwargs, 'tilt'),
             scale_control=_get(kwargs, 'scale_control', False),
             fit_bounds=_get(kwargs, 'fit_bounds'),
-            precision=_get(kwargs, 'precision', 6)
+            precision=_get(kwargs, 'precision', 6),
+            render_bounds=_get(kwargs, 'render_bounds'),
+            incremental=_get(kwargs, 'incremental', False)
         )
 
     @staticmethod
@@ -194,6 +289,11 @@ class GoogleMapPlotter(object):
 
         Args:
             apikey (str): Google Maps `API key`_.
+            cache (GeocodeCache or bool): Cache to look the location up in (and to add it to), or False to not use a cache.
+                Defaults to ``GoogleMapPlotter.geocode_cache``, which only lives in memory.
+            base_url (str): URL of the Geocoding API (such as a proxy's). Defaults to Google's.
+            geocoder (Gazetteer or bool): Offline geocoder to look the location up in before requesting it from
+                the Geocoding API, or False to not use one. Defaults to ``GoogleMapPlotter.geocoder``.
 
         .. _Geocoding API: https://console.cloud.google.com/marketplace/details/google/geocoding-backend.googleapis.com
         .. _API key: https://developers.google.com/maps/documentation/javascript/get-api-key
@@ -211,21 +311,127 @@ class GoogleMapPlotter(object):
         .. code-block::
 
             -> (48.801408, 2.130122)
+
+        Persistent cache::
+
+            cache = gmplot.GeocodeCache(path='geocodes.db', ttl=30 * 24 * 60 * 60)
+            location = gmplot.GoogleMapPlotter.geocode('Versailles, France', apikey=apikey, cache=cache)
+            print(cache.hits, cache.misses)
+
+        Offline geocoding, falling back to the Geocoding API for locations that aren't in the gazetteer::
+
+            gazetteer = gmplot.Gazetteer('cities15000.txt')
+            location = gmplot.GoogleMapPlotter.geocode('Versailles, France', geocoder=gazetteer)
         '''
         apikey = _get(kwargs, 'apikey')
 
-        response = json.loads(requests.get('''
-            https://maps.googleapis.com/maps/api/geocode/json?address="{location}"{key}
-        '''.format(
-            location=location,
-            key=('&key=%s' % apikey if apikey else '') # TODO: Avoid this duplication (see _write_html).
-        )).text)
+        geocoder = _get(kwargs, 'geocoder', GoogleMapPlotter.geocoder)
+        if geocoder:
+            lat_lng = geocoder.geocode(location)
+            if lat_lng is not None:
+                return lat_lng
+
+        cache = _get(kwargs, 'cache')
+        if cache is None:
+            cache = GoogleMapPlotter.geocode_cache
+        if cache is not False:
+            lat_lng = cache.get(location)
+            if lat_lng is not None:
+                return lat_lng
+
+        lat_lng = _request_geocode(requests.get, location, apikey=apikey, base_url=_get(kwargs, 'base_url', _GEOCODE_URL))
+        if cache is not False: cache.set(location, lat_lng)
+        return lat_lng
 
-        if response.get('error_message', ''):
-            raise GoogleAPIError(response['error_message'])
+    @staticmethod
+    def geocode_many(locations, max_workers=8, **kwargs):
+        '''
+        Return the lat/lng coordinates of many location strings, requesting them concurrently.
 
-        latlng_dict = response['results'][0]['geometry']['location']
-        return latlng_dict['lat'], latlng_dict['lng']
+        Requests share a pool of connections, are spaced out to a maximum rate, and are retried with exponential
+        backoff while they're over the query limit. Each distinct location is only requested once,
+        and locations found by the offline geocoder or in the cache aren't requested at all.
+
+        Requires `Geocoding API`_.
+
+        Args:
+            locations ([str]): Locations or addresses of interest, as human-readable strings.
+
+        Optional:
+
+        Args:
+            max_workers (int): Maximum number of requests in flight at once. Defaults to 8.
+            apikey (str): Google Maps `API key`_.
+            cache (GeocodeCache or bool): Cache to look the locations up in (and to add them to), or False to not use a cache.
+                Defaults to ``GoogleMapPlotter.geocode_cache``, which only lives in memory.
+            base_url (str): URL of the Geocoding API (such as a proxy's, or a stub server's). Defaults to Google's.
+            geocoder (Gazetteer or bool): Offline geocoder to look the locations up in before requesting them from
+                the Geocoding API, or False to not use one. Defaults to ``GoogleMapPlotter.geocoder``.
+            rate_limit (float): Maximum number of requests per second. Defaults to 50.
+            max_retries (int): Number of times to retry a request while it's over the query limit. Defaults to 3.
+
+        .. _Geocoding API: https://console.cloud.google.com/marketplace/details/google/geocoding-backend.googleapis.com
+        .. _API key: https://developers.google.com/maps/documentation/javascript/get-api-key
+
+        Returns:
+            [(float, float)]: Latitude/longitude coordinates of each location string, in order.
+
+        Usage::
+
+            import gmplot
+            apikey = '' # (your API key here)
+            locations = gmplot.GoogleMapPlotter.geocode_many(['Versailles, France', 'Chiyoda City, Tokyo'], apikey=apikey)
+            print(locations)
+
+        .. code-block::
+
+            -> [(48.801408, 2.130122), (35.69402, 139.7535951)]
+        '''
+        if max_workers < 1:
+            raise ValueError('`max_workers` must be positive!')
+
+        apikey = _get(kwargs, 'apikey')
+        base_url = _get(kwargs, 'base_url', _GEOCODE_URL)
+        max_retries = _get(kwargs, 'max_retries', 3)
+        rate_limiter = _RateLimiter(_get(kwargs, 'rate_limit', 50))
+
+        geocoder = _get(kwargs, 'geocoder', GoogleMapPlotter.geocoder)
+        cache = _get(kwargs, 'cache')
+        if cache is None:
+            cache = GoogleMapPlotter.geocode_cache
+
+        # Look up each distinct location once, only requesting the ones that aren't found offline or cached:
+        results = {}
+        requested_locations = {}
+        for location in locations:
+            key = _normalize_location(location)
+            if key in results or key in requested_locations:
+                continue
+
+            lat_lng = geocoder.geocode(location) if geocoder else None
+            if lat_lng is None and cache is not False:
+                lat_lng = cache.get(location)
+            if lat_lng is not None:
+                results[key] = lat_lng
+            else:
+                requested_locations[key] = location
+
+        if requested_locations:
+            with requests.Session() as session:
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+
+                with ThreadPoolExecutor(max_workers) as executor:
+                    futures = {
+                        key: executor.submit(_request_geocode, session.get, location, apikey, base_url, max_retries, rate_limiter)
+                        for key, location in requested_locations.items()
+                    }
+                    for key, future in futures.items():
+                        results[key] = future.result()
+                        if cache is not False: cache.set(requested_locations[key], results[key])
+
+        return [results[_normalize_location(location)] for location in locations]
 
     def text(self, lat, lng, text, **kwargs):
         '''
@@ -367,9 +573,12 @@ class GoogleMapPlotter(object):
             travel_mode (str): `Travel mode`_. Defaults to 'DRIVING'.
             waypoints ([(float, float)]): Waypoints to pass through.
             precision (int): Number of digits after the decimal to round to for lat/lng values. Defaults to 6.
+            encode (bool): Whether or not to write the waypoints as an `encoded polyline`_, which is much more compact
+                but rounds lat/lng values to 5 digits after the decimal (overriding ``precision``). Defaults to False.
 
         .. _Directions API: https://console.cloud.google.com/marketplace/details/google/directions-backend.googleapis.com
         .. _Travel mode: https://developers.google.com/maps/documentation/javascript/directions#TravelModes
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
 
         Usage::
 
@@ -395,16 +604,20 @@ class GoogleMapPlotter(object):
             destination,
             _get(kwargs, 'precision', 6),
             travel_mode=_get(kwargs, 'travel_mode', 'DRIVING'),
-            waypoints=_get(kwargs, 'waypoints')
+            waypoints=_get(kwargs, 'waypoints'),
+            encode=_get(kwargs, 'encode', False)
         ))
 
     def scatter(self, lats, lngs, **kwargs):
         '''
         Plot a collection of points.
 
+        Points are stored as columns rather than one object per point, so NumPy arrays of any size can be plotted efficiently.
+        Any option given as a list can also be given as a NumPy array.
+
         Args:
-            lats ([float]): Latitudes.
-            lngs ([float]): Longitudes.
+            lats ([float] or numpy.ndarray): Latitudes.
+            lngs ([float] or numpy.ndarray): Longitudes.
 
         Optional:
 
@@ -426,6 +639,10 @@ class GoogleMapPlotter(object):
             alpha/face_alpha/fa (float or [float]):
                 Opacity of each point's face, ranging from 0 to 1 (symbols only). Defaults to 0.3.
             precision (int or [int]): Number of digits after the decimal to round to for lat/lng values. Defaults to 6.
+            render (str): How to render the symbols. 'canvas' draws them all onto a single canvas overlay,
+                which keeps the map responsive with hundreds of thousands of symbols.
+                'webgl' draws them with WebGL, which scales to millions of symbols but requires a vector map (see ``map_id``).
+                By default, each symbol is drawn as a separate shape on the map.
 
         .. _info window: https://developers.google.com/maps/documentation/javascript/infowindows
         .. _draggable: https://developers.google.com/maps/documentation/javascript/markers#draggable
@@ -462,6 +679,15 @@ class GoogleMapPlotter(object):
         '''
         _validate_lat_lng_length(lats, lngs)
 
+        SYMBOL_RENDERERS = {
+            None: _SymbolBatch,
+            'canvas': _SymbolCanvas,
+            'webgl': _WebGLPoints
+        }
+
+        render = kwargs.get('render')
+        self._validate_renderer(render, SYMBOL_RENDERERS)
+
         OPTION_MAP = {
             'marker': ('marker', True),
             'title': ('title',),
@@ -478,47 +704,105 @@ class GoogleMapPlotter(object):
             'precision': ('precision', 6)
         }
 
-        # Read each option as a list:
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+
+        # Read each option as either a single value (shared by all points) or an array (with a value per point):
         options = {}
         for option, info in OPTION_MAP.items():
             name, value = _get(kwargs, *info, get_key=True)
             if value is None:
                 continue
 
-            if isinstance(value, (list, tuple)):
+            if isinstance(value, (list, tuple, np.ndarray)):
                 _validate_num_points(name, value, len(lats))
-                options[option] = value
+                options[option] = np.asarray(value, dtype=bool if option in ('marker', 'draggable') else object)
 
             else:
-                options[option] = [value] * len(lats)
-
-        # For each point, plot a marker or symbol with its corresponding options:
-        for i, location in enumerate(zip(lats, lngs)):
-            point_options = {option: value[i] for (option, value) in options.items()}
-
-            if point_options.get('marker'):
-                self._markers.append(_Marker(
-                    location[0],
-                    location[1],
-                    point_options.get('face_color'),
-                    point_options.get('precision'),
-                    title=point_options.get('title'),
-                    label=point_options.get('label'),
-                    info_window=point_options.get('info_window'),
-                    draggable=point_options.get('draggable')
-                ))
-            else:
-                self._drawables.append(_Symbol(
-                    location[0],
-                    location[1],
-                    point_options.get('symbol'),
-                    point_options.get('size'),
-                    point_options.get('precision'),
-                    edge_color=point_options.get('edge_color'),
-                    edge_alpha=point_options.get('edge_alpha'),
-                    edge_width=point_options.get('edge_width'),
-                    face_color=point_options.get('face_color'),
-                    face_alpha=point_options.get('face_alpha')
+                options[option] = value
+
+        select = lambda option, mask: options[option][mask] if isinstance(options.get(option), np.ndarray) else options.get(option)
+        is_marker = np.broadcast_to(np.asarray(options.get('marker', False), dtype=bool), lats.shape)
+
+        # Plot markers with an info window one by one, since each needs its own pop-up:
+        has_info_window = np.zeros(lats.shape, dtype=bool)
+        if 'info_window' in options:
+            has_info_window = is_marker & np.broadcast_to(np.not_equal(options['info_window'], None), lats.shape)
+
+        markers = [] # (index of the first point, marker or marker batch)
+        for i in np.flatnonzero(has_info_window):
+            point_option = lambda option: select(option, i)
+            markers.append((i, _Marker(
+                lats[i],
+                lngs[i],
+                point_option('face_color'),
+                point_option('precision'),
+                title=point_option('title'),
+                label=point_option('label'),
+                info_window=point_option('info_window'),
+                draggable=bool(point_option('draggable'))
+            )))
+
+        # Plot the remaining markers in batches, one for each run of consecutive markers that share a color,
+        # precision and draggability (so that markers are still created in order, which decides how they stack):
+        is_batched = is_marker & ~has_info_window
+        if is_batched.any():
+            batch_ids = np.zeros(lats.shape, dtype=np.int64)
+            for option in ('face_color', 'precision', 'draggable'):
+                if isinstance(options.get(option), np.ndarray):
+                    unique_values, values = np.unique(options[option].astype(str), return_inverse=True)
+                    values = values.ravel()
+
+                    # (colors are compared by their hex code, since different names can refer to the same color)
+                    if option == 'face_color':
+                        _, unique_colors = np.unique([_get_hex_color(color) for color in unique_values], return_inverse=True)
+                        values = unique_colors.ravel()[values]
+
+                    batch_ids = batch_ids * (values.max() + 1) + values
+
+            batch_ids[has_info_window] = -1
+            marker_indices = np.flatnonzero(is_marker)
+            marker_batch_ids = batch_ids[marker_indices]
+            run_starts = np.concatenate(([0], np.flatnonzero(np.diff(marker_batch_ids)) + 1))
+            run_ends = np.append(run_starts[1:], len(marker_indices))
+            for run_start, run_end in zip(run_starts, run_ends):
+                if marker_batch_ids[run_start] < 0:
+                    continue
+
+                mask = marker_indices[run_start:run_end]
+                first_index = mask[0]
+                titles, labels = select('title', mask), select('label', mask)
+                markers.append((first_index, _MarkerBatch(
+                    lats[mask],
+                    lngs[mask],
+                    _MarkerIcon(select('face_color', first_index)),
+                    int(select('precision', first_index)),
+                    titles=titles.tolist() if isinstance(titles, np.ndarray) else [titles] * len(mask) if titles is not None else None,
+                    labels=labels.tolist() if isinstance(labels, np.ndarray) else [labels] * len(mask) if labels is not None else None,
+                    draggable=bool(select('draggable', first_index))
+                )))
+
+        self._markers.extend(marker for _, marker in sorted(markers, key=lambda item: item[0]))
+
+        # Plot the rest of the points as symbols, in a batch for each precision:
+        is_symbol = ~is_marker
+        if is_symbol.any():
+            precisions = np.broadcast_to(np.asarray(options['precision'], dtype=object), lats.shape)
+            _, first_indices = np.unique(precisions[is_symbol].astype(str), return_index=True)
+            for first_index in sorted(first_indices):
+                precision = precisions[is_symbol][first_index]
+                mask = is_symbol & (precisions == precision)
+                self._drawables.append(SYMBOL_RENDERERS[render](
+                    lats[mask],
+                    lngs[mask],
+                    select('symbol', mask),
+                    select('size', mask),
+                    precision,
+                    edge_color=select('edge_color', mask),
+                    edge_alpha=select('edge_alpha', mask),
+                    edge_width=select('edge_width', mask),
+                    face_color=select('face_color', mask),
+                    face_alpha=select('face_alpha', mask)
                 ))
 
     def circle(self, lat, lng, radius, **kwargs):
@@ -585,6 +869,20 @@ class GoogleMapPlotter(object):
             alpha/edge_alpha/ea (float): Opacity of the polyline, ranging from 0 to 1. Defaults to 1.0.
             edge_width/ew (int): Width of the polyline, in pixels. Defaults to 1.
             precision (int): Number of digits after the decimal to round to for lat/lng values. Defaults to 6.
+            encode (bool): Whether or not to write the path as an `encoded polyline`_, which is much more compact
+                but rounds lat/lng values to 5 digits after the decimal (overriding ``precision``). Defaults to False.
+            render (str): How to render the polyline. 'webgl' draws it with WebGL, which scales to millions of points
+                but requires a vector map (see ``map_id``), and draws the path straight rather than along the Earth's curvature.
+                By default, the polyline is drawn as a regular shape on the map.
+            simplify (float or str): Tolerance to simplify the polyline with, in meters: vertices that are closer than this
+                to the simplified polyline are removed. 'auto' uses the size of a pixel at the map's initial zoom level.
+                By default, the polyline isn't simplified.
+            lod (bool or [int]): Whether or not to write the polyline with a level of detail per zoom band, simplified to
+                about a pixel at that zoom band. Only the level of the current zoom band gets decoded by the page, so
+                huge polylines load quickly when zoomed out. Can also be the lowest zoom level of each band, in increasing order.
+                Each level is written as an `encoded polyline`_ (overriding ``precision`` and ``encode``). Defaults to False.
+
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
 
         Usage::
             
@@ -605,9 +903,42 @@ class GoogleMapPlotter(object):
             gmap.draw('map.html')
 
         .. image:: GoogleMapPlotter.plot.png
+
+        Returns:
+            int: Number of vertices removed by simplifying the polyline.
         '''
         _validate_lat_lng_length(lats, lngs)
 
+        render = kwargs.get('render')
+        self._validate_renderer(render, [None, 'webgl'])
+
+        lats, lngs, num_removed = self._simplify(lats, lngs, kwargs.get('simplify'))
+
+        lod_zooms = self._get_lod_zooms(kwargs.get('lod', False))
+        if lod_zooms is not None:
+            if render is not None:
+                raise ValueError("Levels of detail aren't supported by the '%s' renderer!" % render)
+
+            self._drawables.append(_PathLevels(
+                lats,
+                lngs,
+                lod_zooms,
+                edge_color=_get(kwargs, ['color', 'c', 'edge_color', 'ec'], 'black'),
+                edge_alpha=_get(kwargs, ['alpha', 'edge_alpha', 'ea'], 1.0),
+                edge_width=_get(kwargs, ['edge_width', 'ew'], 1)
+            ))
+            return num_removed
+
+        if render == 'webgl':
+            self._drawables.append(_WebGLPath(
+                lats,
+                lngs,
+                color=_get(kwargs, ['color', 'c', 'edge_color', 'ec'], 'black'),
+                alpha=_get(kwargs, ['alpha', 'edge_alpha', 'ea'], 1.0),
+                width=_get(kwargs, ['edge_width', 'ew'], 1)
+            ))
+            return num_removed
+
         self._drawables.append(_Polyline(
             lats,
             lngs,
@@ -615,7 +946,9 @@ class GoogleMapPlotter(object):
             color=_get(kwargs, ['color', 'c', 'edge_color', 'ec'], 'black'),
             alpha=_get(kwargs, ['alpha', 'edge_alpha', 'ea'], 1.0),
             width=_get(kwargs, ['edge_width', 'ew'], 1),
+            encode=_get(kwargs, 'encode', False)
         ))
+        return num_removed
 
     def heatmap(self, lats, lngs, **kwargs):
         '''
@@ -637,7 +970,15 @@ class GoogleMapPlotter(object):
             weights ([float]): List of weights corresponding to each data point. Each point has a weight
                 of 1 by default. Specifying a weight of N is equivalent to plotting the same point N times.
             precision (int): Number of digits after the decimal to round to for lat/lng values. Defaults to 6.
-        
+            binary (bool): Whether or not to write the data points as base64-encoded binary arrays, which is much
+                more compact than text for large heatmaps. Lat/lng values are then rounded to at most 7 digits
+                after the decimal. Defaults to False.
+            aggregate_zoom (int): Pre-aggregate the data points by binning them into the map's pixels at this zoom level
+                (from 0 to 22), plotting one point per occupied pixel, weighted by the sum of its points' weights and
+                located at their weighted centroid. The heatmap looks the same at that zoom level and below.
+            aggregate_degrees (float): Pre-aggregate the data points by binning them into a lat/lng grid with cells
+                of this size (in degrees) instead. Can't be used along with ``aggregate_zoom``.
+
         .. _RGBA: https://www.w3.org/TR/css-color-3/#rgba-color
 
         Usage::
@@ -681,7 +1022,10 @@ class GoogleMapPlotter(object):
             opacity=_get(kwargs, 'opacity', 0.6),
             max_intensity=_get(kwargs, 'max_intensity', 1),
             dissipating=_get(kwargs, 'dissipating', True),
-            weights=weights
+            weights=weights,
+            binary=_get(kwargs, 'binary', False),
+            aggregate_zoom=_get(kwargs, 'aggregate_zoom'),
+            aggregate_degrees=_get(kwargs, 'aggregate_degrees')
         ))
 
     def ground_overlay(self, url, bounds, **kwargs):
@@ -737,6 +1081,17 @@ class GoogleMapPlotter(object):
                 Can be hex ('#00FFFF'), named ('cyan'), or matplotlib-like ('c'). Defaults to black.
             alpha/face_alpha/fa (float): Opacity of the polygon's face, ranging from 0 to 1. Defaults to 0.3.
             precision (int): Number of digits after the decimal to round to for lat/lng values. Defaults to 6.
+            encode (bool): Whether or not to write the path as an `encoded polyline`_, which is much more compact
+                but rounds lat/lng values to 5 digits after the decimal (overriding ``precision``). Defaults to False.
+            simplify (float or str): Tolerance to simplify the polygon's outline with, in meters: vertices that are closer
+                than this to the simplified outline are removed. 'auto' uses the size of a pixel at the map's initial zoom level.
+                By default, the polygon isn't simplified.
+            lod (bool or [int]): Whether or not to write the polygon with a level of detail per zoom band, simplified to
+                about a pixel at that zoom band. Only the level of the current zoom band gets decoded by the page, so
+                huge polygons load quickly when zoomed out. Can also be the lowest zoom level of each band, in increasing order.
+                Each level is written as an `encoded polyline`_ (overriding ``precision`` and ``encode``). Defaults to False.
+
+        .. _encoded polyline: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
 
         Usage::
 
@@ -761,9 +1116,29 @@ class GoogleMapPlotter(object):
             gmap.draw('map.html')
 
         .. image:: GoogleMapPlotter.polygon.png
+
+        Returns:
+            int: Number of vertices removed by simplifying the polygon.
         '''
         _validate_lat_lng_length(lats, lngs)
-        
+
+        lats, lngs, num_removed = self._simplify(lats, lngs, kwargs.get('simplify'), closed=True)
+
+        lod_zooms = self._get_lod_zooms(kwargs.get('lod', False))
+        if lod_zooms is not None:
+            self._drawables.append(_PathLevels(
+                lats,
+                lngs,
+                lod_zooms,
+                closed=True,
+                edge_color=_get(kwargs, ['color', 'c', 'edge_color', 'ec'], 'black'),
+                edge_alpha=_get(kwargs, ['alpha', 'edge_alpha', 'ea'], 1.0),
+                edge_width=_get(kwargs, ['edge_width', 'ew'], 1),
+                face_color=_get(kwargs, ['color', 'c', 'face_color', 'fc'], 'black'),
+                face_alpha=_get(kwargs, ['alpha', 'face_alpha', 'fa'], 0.3)
+            ))
+            return num_removed
+
         self._drawables.append(_Polygon(
             lats,
             lngs,
@@ -772,8 +1147,10 @@ class GoogleMapPlotter(object):
             edge_alpha=_get(kwargs, ['alpha', 'edge_alpha', 'ea'], 1.0),
             edge_width=_get(kwargs, ['edge_width', 'ew'], 1),
             face_color=_get(kwargs, ['color', 'c', 'face_color', 'fc'], 'black'),
-            face_alpha=_get(kwargs, ['alpha', 'face_alpha', 'fa'], 0.3)
+            face_alpha=_get(kwargs, ['alpha', 'face_alpha', 'fa'], 0.3),
+            encode=_get(kwargs, 'encode', False)
         ))
+        return num_removed
 
     def enable_marker_dropping(self, **kwargs):
         '''
@@ -811,13 +1188,75 @@ class GoogleMapPlotter(object):
             draggable=_get(kwargs, 'draggable', False)
         )
 
-    def draw(self, file, encoding="utf-8"):
+    def enable_marker_clustering(self, **kwargs):
+        '''
+        Cluster nearby markers together, depending on the zoom level.
+
+        The clusters are precomputed for each zoom level, and only the markers and clusters that are within view
+        get created in the page, which keeps maps with a very large number of markers responsive.
+        Clicking on a cluster zooms into it.
+
+        Note: Calling this function multiple times will just overwrite the existing clustering settings.
+
+        Optional:
+
+        Args:
+            color/c (str): Color of the clusters. Can be hex ('#00FFFF'), named ('cyan'),
+                or matplotlib-like ('c'). Defaults to red.
+            radius (int): Size of the area covered by each cluster, in pixels. Defaults to 60.
+            min_zoom (int): Lowest zoom level to cluster markers at. Defaults to 0.
+            max_zoom (int): Highest zoom level to cluster markers at. Markers are never clustered
+                past this zoom level. Defaults to 16.
+
+        Usage::
+
+            import gmplot
+            import random
+            apikey = '' # (your API key here)
+            gmap = gmplot.GoogleMapPlotter(37.766956, -122.438481, 11, apikey=apikey)
+
+            lats = [random.uniform(37.6, 37.9) for _ in range(10000)]
+            lngs = [random.uniform(-122.6, -122.3) for _ in range(10000)]
+            gmap.scatter(lats, lngs, color='cornflowerblue')
+            gmap.enable_marker_clustering(color='cornflowerblue', radius=80)
+
+            gmap.draw('map.html')
+        '''
+        self._marker_clusterer = _MarkerClusterer(
+            _get(kwargs, ['color', 'c'], 'red'),
+            radius=_get(kwargs, 'radius', 60),
+            min_zoom=_get(kwargs, 'min_zoom', 0),
+            max_zoom=_get(kwargs, 'max_zoom', 16)
+        )
+
+    def draw(self, file, encoding="utf-8", compress=None, sidecar=False, workers=None, split=False):
         '''
         Draw the HTML map to a file.
 
         Args:
             file (str): File to write to, as a file path.
 
+        Optional:
+
+        Args:
+            encoding (str): Text encoding of the file. Defaults to 'utf-8'.
+            compress (str): Compression format to compress the file with as it's being written, as 'gzip' or 'zstd'.
+                'zstd' requires Python 3.14+ or the `zstandard`_ package. Defaults to no compression.
+            sidecar (bool): Whether or not to write the uncompressed file along with a precompressed copy
+                next to it (such as 'map.html' and 'map.html.gz'), in a single pass. Requires ``compress``. Defaults to False.
+            workers (int): Number of worker processes to render the map's layers with, which speeds up maps with many
+                large layers. Markers aren't parallelized: they're always rendered serially by the current process,
+                after the other layers, since they share the context of what was drawn (such as the icons written so far).
+                The output is the same either way. By default, everything is rendered by the current process.
+            split (bool): Whether or not to split the map's data from its code. The data is written to a JSON file
+                next to the map (such as 'map.json' for 'map.html'), which is drawn by a renderer script that's
+                the same for every map (written next to the map as 'gmplot-renderer-<version>.js', if it isn't already there).
+                Layers that the renderer doesn't support (such as routes, grids, or canvas and WebGL layers) are still
+                written to the page, and drawn once the data layers are. Since the page fetches its data file,
+                it must be served over HTTP rather than opened from disk. Can't be compressed. Defaults to False.
+
+        .. _zstandard: https://pypi.org/project/zstandard/
+
         Usage::
 
             import gmplot
@@ -826,9 +1265,67 @@ class GoogleMapPlotter(object):
             gmap.draw('map.html')
 
         .. image:: GoogleMapPlotter.draw.png
+
+        Compressed output::
+
+            gmap.draw('map.html.gz', compress='gzip')
+
+            # Or, to write both 'map.html' and 'map.html.gz':
+            gmap.draw('map.html', compress='gzip', sidecar=True)
+
+        Parallel rendering (on platforms that start worker processes from scratch, such as Windows and macOS,
+        this must be run under an ``if __name__ == '__main__':`` guard)::
+
+            gmap.draw('map.html', workers=4)
+
+        Split data and code (serve the folder over HTTP, with ``python -m http.server`` for instance)::
+
+            gmap.draw('map.html', split=True)
         '''
-        with open(file, 'w', encoding=encoding) as f:
-            self._write_html(f)
+        if split:
+            if compress is not None:
+                raise ValueError("A split map can't be compressed!")
+            if workers is not None:
+                raise ValueError("A split map can't be rendered by worker processes!")
+
+            self._write_split(file, encoding)
+            return
+
+        if compress is not None and compress not in _COMPRESSION_EXTENSIONS:
+            raise ValueError("Compression format '%s' isn't supported!" % compress)
+
+        if sidecar and compress is None:
+            raise ValueError('A sidecar file requires a compression format!')
+
+        paths = []
+        if compress is None or sidecar: paths.append((file, None))
+        if compress is not None: paths.append((file + _COMPRESSION_EXTENSIONS[compress] if sidecar else file, compress))
+
+        files = []
+        try:
+            for path, compression in paths:
+                files.append(open(path, 'w', encoding=encoding) if compression is None else _open_compressed(path, compression, encoding))
+
+            for chunk in self.iter_html(workers=workers):
+                for f in files:
+                    f.write(chunk)
+
+            for f in files:
+                f.close()
+
+        # Clear the files if an uncaught exception occured while writing
+        # (removing compressed files, since an empty file isn't valid compressed content):
+        except:
+            for f in files:
+                f.close()
+
+            for path, compression in paths[:len(files)]:
+                if compression is None:
+                    open(path, 'w').close()
+                else:
+                    os.remove(path)
+
+            raise
 
     def get(self):
         '''
@@ -851,7 +1348,7 @@ class GoogleMapPlotter(object):
                <meta name="viewport" content="initial-scale=1.0, user-scalable=no" />
                <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
                <title>Google Maps - gmplot</title>
-               <script type="text/javascript" src="https://maps.googleapis.com/maps/api/js?libraries=visualization"></script>
+               <script type="text/javascript" src="https://maps.googleapis.com/maps/api/js?libraries=visualization,geometry"></script>
                <script type="text/javascript">
                    function initialize() {
                        var map = new google.maps.Map(document.getElementById("map_canvas"), {
@@ -871,15 +1368,288 @@ class GoogleMapPlotter(object):
             self._write_html(f)
             return f.getvalue()
 
-    def _write_html(self, file):
+    def iter_html(self, chunk_size=65536, workers=None):
+        '''
+        Iterate over the HTML map in chunks, as it's being written.
+
+        Each layer (such as a polyline, or a batch of markers) is written in full before the chunks it fills
+        are yielded, so the whole map is never held in memory at once, but the largest single layer is:
+        peak memory is about the size of the largest layer's output. This is useful for streaming maps
+        with many layers (to a socket, a compressor, or a WSGI server, for instance).
+
+        Optional:
+
+        Args:
+            chunk_size (int): Size of each chunk, in characters. Every chunk except the last one is exactly this size.
+                Defaults to 65536.
+            workers (int): Number of worker processes to render the map's layers with.
+                Markers are always rendered serially by the current process.
+                By default, everything is rendered by the current process.
+
+        Yields:
+            str: Next chunk of the HTML map.
+
+        Usage::
+
+            import gmplot
+            apikey = '' # (your API key here)
+            gmap = gmplot.GoogleMapPlotter(37.766956, -122.438481, 13, apikey=apikey)
+
+            def application(environ, start_response):
+                start_response('200 OK', [('Content-Type', 'text/html; charset=utf-8')])
+                return (chunk.encode('utf-8') for chunk in gmap.iter_html())
+        '''
+        if chunk_size <= 0:
+            raise ValueError('`chunk_size` must be positive!')
+
+        with StringIO() as f:
+            # Hand over full chunks every time a section of the map is done being written
+            # (so at most one section's worth of content, plus a partial chunk, is ever held in memory):
+            for _ in self._iter_html_sections(f, workers):
+                if f.tell() < chunk_size:
+                    continue
+
+                content = f.getvalue()
+                end_of_chunks = len(content) - len(content) % chunk_size
+                for start in range(0, end_of_chunks, chunk_size):
+                    yield content[start:start + chunk_size]
+
+                f.seek(0)
+                f.truncate(0)
+                f.write(content[end_of_chunks:])
+
+            if f.tell() > 0:
+                yield f.getvalue()
+
+    def _validate_renderer(self, render, renderers):
+        '''
+        Validate the renderer of a layer.
+
+        Args:
+            render (str): Renderer of the layer.
+            renderers ([str]): Supported renderers.
+        '''
+        if render not in renderers:
+            raise ValueError("Unsupported renderer '%s'!" % render)
+
+        if render == 'webgl' and self._map._map_id is None:
+            warnings.warn("WebGL rendering requires a vector map; set `map_id` to the ID of one.")
+
+    def _simplify(self, lats, lngs, tolerance, closed=False):
+        '''
+        Simplify a path.
+
+        Args:
+            lats ([float]): Latitudes.
+            lngs ([float]): Longitudes.
+            tolerance (float or str): Tolerance to simplify the path with, in meters,
+                or 'auto' to use the size of a pixel at the map's zoom level. If None, the path is left as is.
+
+        Optional:
+
+        Args:
+            closed (bool): Whether or not the path is a ring. Defaults to False.
+
+        Returns:
+            ([float], [float], int): Latitudes and longitudes of the simplified path,
+                along with the number of vertices removed from it.
+        '''
+        if tolerance is None or len(lats) <= 2:
+            return lats, lngs, 0
+
+        lats = np.asarray(lats, dtype=float)
+        lngs = np.asarray(lngs, dtype=float)
+
+        if tolerance == 'auto':
+            tolerance = _get_meters_per_pixel(self._map._zoom, lats.mean())
+        elif isinstance(tolerance, str) or tolerance < 0:
+            raise ValueError("Invalid simplification tolerance '%s'!" % tolerance)
+
+        keep = _simplify_path(lats, lngs, tolerance, closed=closed)
+        return lats[keep], lngs[keep], int(len(keep) - keep.sum())
+
+    def _get_lod_zooms(self, lod):
+        '''
+        Get the zoom bands of a path's levels of detail.
+
+        Args:
+            lod (bool or [int]): Whether or not to use levels of detail, or the lowest zoom level of each band.
+
+        Returns:
+            [int]: Lowest zoom level of each band, or None if the path doesn't use levels of detail.
+        '''
+        DEFAULT_ZOOMS = list(range(0, 19, 2))
+        # Note: Beyond zoom level 18, the full path is shown.
+
+        if lod is False or lod is None:
+            return None
+
+        zooms = DEFAULT_ZOOMS if lod is True else list(lod)
+        if len(zooms) == 0 or any(zoom >= next_zoom for zoom, next_zoom in zip(zooms, zooms[1:])):
+            raise ValueError('Level of detail zooms must be in increasing order!')
+
+        return zooms
+
+    def _iter_cached_sections(self, w, fragments, key, iter_sections, fragment=None, context=None):
+        '''
+        Write sections of the HTML map, reusing their output from the previous draw if the map is incremental.
+
+        Args:
+            w (_Writer): Writer used to write the sections.
+            fragments (dict): Output of each group of sections written so far during this draw,
+                along with the shared icon files it references, by key.
+            key (object): Key of the group of sections, which must change whenever their output would.
+            iter_sections (function): Generator function that writes the sections with a given writer,
+                pausing after each section is written.
+
+        Optional:
+
+        Args:
+            fragment (str): Output of the sections, if it was already rendered elsewhere.
+            context (_Context): Context used to write the sections, if they use one.
+                The shared icon files that reused output references are added back to it.
+
+        Yields:
+            None: Once each section is written (or once, if the sections' output was reused).
+        '''
+        icon_paths = set()
+        if fragment is None and key in self._fragments and self._incremental:
+            fragment, icon_paths = self._fragments[key]
+
+        if fragment is None:
+            if not self._incremental:
+                for _ in iter_sections(w):
+                    yield
+                return
+
+            previous_icon_paths = set(context.icon_paths) if context is not None else set()
+            with StringIO() as f:
+                for _ in iter_sections(_Writer(f, w.get_indent_level())):
+                    pass
+                fragment = f.getvalue()
+            if context is not None:
+                icon_paths = context.icon_paths - previous_icon_paths
+
+        if context is not None:
+            context.icon_paths.update(icon_paths)
+        if self._incremental:
+            fragments[key] = (fragment, icon_paths)
+        w.write_fragment(fragment)
+        yield
+
+    def _write_html(self, file, context=None):
         '''
         Write the HTML map.
 
         Args:
             file (handle): File to write to.
+
+        Optional:
+
+        Args:
+            context (_Context): Context used to keep track of what was drawn to the map. Defaults to a new context.
+        '''
+        for _ in self._iter_html_sections(file, context=context):
+            pass
+
+    def _write_split(self, file, encoding):
+        '''
+        Write the HTML map with its data split into a JSON file, drawn by the shared renderer script.
+
+        Args:
+            file (str): File to write the HTML map to, as a file path.
+            encoding (str): Text encoding of the files.
+        '''
+        folder = os.path.dirname(file)
+        data_file = os.path.splitext(file)[0] + '.json'
+        renderer_name = _write_renderer(folder or '.')
+        context = _Context()
+        layers = []
+
+        with io.open(file, 'w', encoding=encoding) as f:
+            with _Writer(f) as w:
+                w.write('''
+                    <html>
+                    <head>
+                    <meta name="viewport" content="initial-scale=1.0, user-scalable=no" />
+                    <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+                    <title>{title}</title>
+                    <script type="text/javascript" src="https://maps.googleapis.com/maps/api/js?libraries=visualization,geometry{key}"></script>
+                    <script type="text/javascript" src="{renderer}"></script>
+                    <script type="text/javascript">
+                '''.format(
+                    title=self._title,
+                    key=('&key=%s' % self._apikey if self._apikey else ''),
+                    renderer=renderer_name
+                ))
+                w.indent()
+                w.write('function initialize() {')
+                w.indent()
+                w.write('gmplot.load(%s, document.getElementById("map_canvas"), function(map) {' % json.dumps(os.path.basename(data_file)))
+                w.indent()
+
+                if any(isinstance(drawable, _Text) for drawable in self._drawables):
+                    _Text.add_icon_data(context)
+
+                # Add each drawable to the data file, or write it to the page if the renderer doesn't support it:
+                for drawable in _clip_drawables(self._drawables, self._render_bounds):
+                    layer = drawable.get_layer() if hasattr(drawable, 'get_layer') else None
+                    if layer is not None:
+                        layers.append(layer)
+                    else:
+                        drawable.write(w)
+
+                # (clustered markers and marker dropping are drawn by the page itself)
+                markers = _clip_drawables(self._markers, self._render_bounds)
+                if self._marker_clusterer:
+                    self._marker_clusterer.write(w, context, markers)
+                else:
+                    for marker in _MarkerBatch.from_markers(markers):
+                        if hasattr(marker, 'get_layer'):
+                            layers.append(marker.get_layer(context))
+                        else:
+                            marker.write(w, context)
+
+                if self._marker_dropper: self._marker_dropper.write(w, context)
+
+                w.dedent()
+                w.write('});')
+                w.dedent()
+                w.write('}')
+                w.dedent()
+                w.write('''
+                    </script>
+                    </head>
+                    <body style="margin:0px; padding:0px;" onload="initialize()">
+                        <div id="map_canvas" style="width: 100%; height: 100%;" />
+                    </body>
+                    </html>
+                ''')
+
+        with io.open(data_file, 'w', encoding=encoding) as f:
+            f.write(json.dumps({'map': self._map.get_data(), 'icons': context.icons, 'layers': layers}, separators=(',', ':')))
+
+    def _iter_html_sections(self, file, workers=None, context=None):
+        '''
+        Write the HTML map section by section, pausing after each section is written.
+
+        Args:
+            file (handle): File to write to.
+
+        Optional:
+
+        Args:
+            workers (int): Number of worker processes to render the drawables with.
+                Markers are always rendered serially in the current process.
+                By default, everything is rendered in the current process.
+            context (_Context): Context used to keep track of what was drawn to the map. Defaults to a new context.
+
+        Yields:
+            None: Once each section (such as the header, or a drawable) is written to the file.
         '''
         with _Writer(file) as w:
-            context = _Context()
+            if context is None:
+                context = _Context()
 
             w.write('''
                 <html>
@@ -887,7 +1657,7 @@ class GoogleMapPlotter(object):
                 <meta name="viewport" content="initial-scale=1.0, user-scalable=no" />
                 <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
                 <title>{title}</title>
-                <script type="text/javascript" src="https://maps.googleapis.com/maps/api/js?libraries=visualization{key}"></script>
+                <script type="text/javascript" src="https://maps.googleapis.com/maps/api/js?libraries=visualization,geometry{key}"></script>
                 <script type="text/javascript">
             '''.format(
                 title=self._title,
@@ -897,9 +1667,60 @@ class GoogleMapPlotter(object):
             w.write('function initialize() {')
             w.indent()
             self._map.write(w)
-            [drawable.write(w) for drawable in self._drawables]
-            [marker.write(w, context) for marker in self._markers]
-            if self._marker_dropper: self._marker_dropper.write(w, context)
+            if any(isinstance(drawable, _Text) for drawable in self._drawables):
+                _Text.write_icon(w, context)
+            yield
+
+            # Render the drawables in worker processes if requested, collecting their output in order as it's written:
+            fragments = {}
+            is_cached = lambda drawable: self._incremental and drawable in self._fragments
+            executor = ProcessPoolExecutor(workers) if workers is not None and workers > 1 else None
+            try:
+                if executor is not None:
+                    pending = [drawable for drawable in self._drawables if not is_cached(drawable)]
+                    rendered_fragments = executor.map(
+                        _render_drawable,
+                        pending,
+                        itertools.repeat(self._render_bounds),
+                        itertools.repeat(w.get_indent_level()),
+                        chunksize=max(1, len(pending) // (4 * workers))
+                    )
+
+                for drawable in self._drawables:
+                    def iter_drawable_sections(w, drawable=drawable):
+                        for clipped in _clip_drawables([drawable], self._render_bounds):
+                            clipped.write(w)
+                            yield
+
+                    fragment = next(rendered_fragments) if executor is not None and not is_cached(drawable) else None
+                    for _ in self._iter_cached_sections(w, fragments, drawable, iter_drawable_sections, fragment):
+                        yield
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+            # (markers share the context of what was drawn, so they're always written here, in order)
+
+            def iter_marker_sections(w):
+                markers = _clip_drawables(self._markers, self._render_bounds)
+                if self._marker_clusterer:
+                    self._marker_clusterer.write(w, context, markers)
+                    yield
+                else:
+                    for marker in _MarkerBatch.from_markers(markers):
+                        marker.write(w, context)
+                        yield
+
+                if self._marker_dropper: self._marker_dropper.write(w, context)
+
+            # (markers are only ever added, so their count identifies them)
+            marker_key = ('markers', len(self._markers), self._marker_clusterer, self._marker_dropper, context.icon_url)
+            for _ in self._iter_cached_sections(w, fragments, marker_key, iter_marker_sections, context=context):
+                yield
+
+            if self._incremental:
+                self._fragments = fragments
+
             w.dedent()
             w.write('}')
             w.dedent()
@@ -911,3 +1732,4 @@ class GoogleMapPlotter(object):
                 </body>
                 </html>
             ''')
+            yield
@@ -0,0 +1,156 @@
+/*
+ * gmplot renderer.
+ *
+ * Draws a map from the data file that gmplot writes for it, so that the same script can be shared (and cached)
+ * by every map. Large arrays in the data file are stored as base64-encoded typed arrays, of the form
+ * {typedArray: "Float64Array", base64: "..."}.
+ *
+ * Usage:
+ *     gmplot.load("map.json", document.getElementById("map_canvas"), function(map) { ... });
+ */
+var gmplot = (function() {
+    var TYPED_ARRAYS = {
+        Int8Array: Int8Array,
+        Uint8Array: Uint8Array,
+        Int16Array: Int16Array,
+        Uint16Array: Uint16Array,
+        Int32Array: Int32Array,
+        Uint32Array: Uint32Array,
+        Float32Array: Float32Array,
+        Float64Array: Float64Array
+    };
+
+    var getArray = function(data) {
+        if (!data || !data.typedArray) return data;
+        var bytes = Uint8Array.from(atob(data.base64), function(c) { return c.charCodeAt(0); });
+        return new TYPED_ARRAYS[data.typedArray](bytes.buffer);
+    };
+
+    var getLatLngs = function(data) {
+        var coordinates = getArray(data);
+        var latLngs = new Array(coordinates.length / 2);
+        for (var i = 0; i < latLngs.length; i++) {
+            latLngs[i] = new google.maps.LatLng(coordinates[2 * i], coordinates[2 * i + 1]);
+        }
+        return latLngs;
+    };
+
+    var getPath = function(layer) {
+        if (layer.encodedPath != null) return google.maps.geometry.encoding.decodePath(layer.encodedPath);
+        return getLatLngs(layer.path);
+    };
+
+    var getOptions = function(style, options) {
+        for (var key in style) options[key] = style[key];
+        return options;
+    };
+
+    var renderers = {
+        polyline: function(map, layer) {
+            new google.maps.Polyline(getOptions(layer.options, {clickable: false, geodesic: true, path: getPath(layer), map: map}));
+        },
+
+        polygon: function(map, layer) {
+            new google.maps.Polygon(getOptions(layer.options, {clickable: false, geodesic: true, paths: getPath(layer), map: map}));
+        },
+
+        circle: function(map, layer) {
+            new google.maps.Circle(getOptions(layer.options, {clickable: false, geodesic: true, map: map}));
+        },
+
+        heatmap: function(map, layer) {
+            var locations = getLatLngs(layer.positions);
+            var weights = getArray(layer.weights);
+            var data = new Array(locations.length);
+            for (var i = 0; i < data.length; i++) {
+                data[i] = weights ? {location: locations[i], weight: weights[i]} : locations[i];
+            }
+            new google.maps.visualization.HeatmapLayer(getOptions(layer.options, {data: new google.maps.MVCArray(data), map: map}));
+        },
+
+        symbols: function(map, layer) {
+            var positions = getArray(layer.circles.positions);
+            var radii = getArray(layer.circles.radii);
+            var styles = getArray(layer.circles.styles);
+            for (var i = 0; i < radii.length; i++) {
+                new google.maps.Circle(getOptions(layer.styles[styles[i]], {
+                    clickable: false,
+                    geodesic: true,
+                    center: new google.maps.LatLng(positions[2 * i], positions[2 * i + 1]),
+                    radius: radii[i],
+                    map: map
+                }));
+            }
+
+            for (var i = 0; i < layer.lines.length; i++) {
+                var lineStrokes = getArray(layer.lines[i].strokes);
+                var strokes = [];
+                for (var j = 0; j < lineStrokes.length; j += 4) {
+                    strokes.push([
+                        {lat: lineStrokes[j], lng: lineStrokes[j + 1]},
+                        {lat: lineStrokes[j + 2], lng: lineStrokes[j + 3]}
+                    ]);
+                }
+                var lines = new google.maps.Data({
+                    style: getOptions(layer.styles[layer.lines[i].style], {clickable: false}),
+                    map: map
+                });
+                lines.add({geometry: new google.maps.Data.MultiLineString(strokes)});
+            }
+        },
+
+        markers: function(map, layer, icons) {
+            var positions = getArray(layer.positions);
+            for (var i = 0; i < positions.length / 2; i++) {
+                var options = {
+                    position: new google.maps.LatLng(positions[2 * i], positions[2 * i + 1]),
+                    icon: icons[layer.icon],
+                    draggable: layer.draggable,
+                    map: map
+                };
+                if (layer.titles && layer.titles[i] !== null) options.title = layer.titles[i];
+                if (layer.labels && layer.labels[i] !== null) options.label = layer.labels[i];
+                new google.maps.Marker(options);
+            }
+        },
+
+        text: function(map, layer, icons) {
+            new google.maps.Marker({label: layer.label, icon: icons[layer.icon], position: layer.position, map: map});
+        }
+    };
+
+    var getIcons = function(data) {
+        var icons = {};
+        for (var name in data) {
+            var icon = data[name];
+            icons[name] = icon.labelOrigin ? getOptions(icon, {}) : icon;
+            if (icon.labelOrigin) icons[name].labelOrigin = new google.maps.Point(icon.labelOrigin[0], icon.labelOrigin[1]);
+        }
+        return icons;
+    };
+
+    // Draw a map from its data, returning the map:
+    var render = function(element, data) {
+        var map = new google.maps.Map(element, data.map.options);
+        if (data.map.fitBounds) map.fitBounds(data.map.fitBounds);
+
+        var icons = getIcons(data.icons);
+        for (var i = 0; i < data.layers.length; i++) {
+            renderers[data.layers[i].type](map, data.layers[i], icons);
+        }
+        return map;
+    };
+
+    // Fetch a map's data file, then draw the map and pass it to the (optional) callback:
+    var load = function(url, element, callback) {
+        var request = new XMLHttpRequest();
+        request.open('GET', url);
+        request.onload = function() {
+            var map = render(element, JSON.parse(request.responseText));
+            if (callback) callback(map);
+        };
+        request.send();
+    };
+
+    return {render: render, load: load};
+})();
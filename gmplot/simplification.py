@@ -0,0 +1,94 @@
+import numpy as np
+
+from gmplot.utility import _TILE_SIZE, _WEB_MERCATOR_RADIUS_IN_M, _get_local_coordinates
+
+def _get_meters_per_pixel(zoom, lat):
+    '''
+    Get the ground distance covered by a pixel of the map.
+
+    Args:
+        zoom (int): Zoom level of the map.
+        lat (float): Latitude at which to measure the distance.
+
+    Returns:
+        float: Distance covered by a pixel at the given zoom level and latitude, in meters.
+    '''
+    return 2 * np.pi * _WEB_MERCATOR_RADIUS_IN_M * np.cos(np.radians(lat)) / (_TILE_SIZE * 2 ** zoom)
+
+def _simplify_path(lats, lngs, tolerance, closed=False):
+    '''
+    Simplify a path with the `Ramer-Douglas-Peucker algorithm`_.
+
+    The path is split at its vertex farthest from the segment between the current endpoints, for as long as that
+    vertex is farther than the tolerance. Every open range of the path is split at once on each pass,
+    so the number of passes only grows with the depth of the recursion rather than with the number of vertices.
+
+    Args:
+        lats ([float]): Latitude of each vertex.
+        lngs ([float]): Longitude of each vertex.
+        tolerance (float): Largest distance a vertex can be from the simplified path to be removed, in meters.
+
+    Optional:
+
+    Args:
+        closed (bool): Whether or not the path is a ring (such as a polygon's outline), in which case it's
+            simplified as two halves split at the vertex farthest from the first one, so that it keeps an area.
+            Defaults to False.
+
+    Returns:
+        numpy.ndarray: Boolean mask of the vertices to keep.
+
+    .. _Ramer-Douglas-Peucker algorithm: https://en.wikipedia.org/wiki/Ramer%E2%80%93Douglas%E2%80%93Peucker_algorithm
+    '''
+    num_vertices = len(lats)
+    keep = np.ones(num_vertices, dtype=bool)
+    if num_vertices <= 2:
+        return keep
+
+    _, x, y = _get_local_coordinates(np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float))
+    keep[1:-1] = False
+
+    starts = np.array([0], dtype=np.int64)
+    ends = np.array([num_vertices - 1], dtype=np.int64)
+    if closed:
+        farthest = int(np.argmax(np.hypot(x - x[0], y - y[0])))
+        if 0 < farthest < num_vertices - 1:
+            keep[farthest] = True
+            starts = np.array([0, farthest], dtype=np.int64)
+            ends = np.array([farthest, num_vertices - 1], dtype=np.int64)
+
+    while True:
+        # Only ranges with interior vertices can be split:
+        lengths = ends - starts - 1
+        splittable = lengths > 0
+        starts, ends, lengths = starts[splittable], ends[splittable], lengths[splittable]
+        if len(starts) == 0:
+            break
+
+        # Lay out the interior vertices of all ranges back to back, with the range each one belongs to:
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        ranges = np.repeat(np.arange(len(starts)), lengths)
+        indices = np.arange(lengths.sum()) - offsets[ranges] + starts[ranges] + 1
+
+        # Find each vertex's distance to the segment between its range's endpoints:
+        start_x, start_y = x[starts][ranges], y[starts][ranges]
+        dx, dy = x[ends][ranges] - start_x, y[ends][ranges] - start_y
+        squared_length = dx ** 2 + dy ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.clip(((x[indices] - start_x) * dx + (y[indices] - start_y) * dy) / squared_length, 0, 1)
+        t[squared_length == 0] = 0
+        distances = np.hypot(x[indices] - start_x - t * dx, y[indices] - start_y - t * dy)
+
+        # Split each range at its farthest vertex, if that vertex is beyond the tolerance:
+        max_distances = np.maximum.reduceat(distances, offsets)
+        is_farthest = distances == max_distances[ranges]
+        split_ranges, first = np.unique(ranges[is_farthest], return_index=True)
+        splits = indices[is_farthest][first]
+        beyond = max_distances[split_ranges] > tolerance
+        split_ranges, splits = split_ranges[beyond], splits[beyond]
+
+        keep[splits] = True
+        starts = np.concatenate((starts[split_ranges], splits))
+        ends = np.concatenate((splits, ends[split_ranges]))
+
+    return keep
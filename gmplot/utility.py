@@ -1,37 +1,46 @@
-### Encoding: utf-8 (needed for Python 2)
-
-import sys
 import os
+import io
+import gzip
 import shutil
 import inspect
 import warnings
 import base64
+import hashlib
+import json
 import re
 
+import numpy as np
+
 _INDENT_LEVEL = 4
 _INDENT = ' ' * _INDENT_LEVEL
 # Note: This should match a single indent used in the actual source code.
 
 _COLOR_ICON_PATH = os.path.join(os.path.dirname(__file__), 'markers/%s.png')
 
-if sys.version_info.major == 2:
-    from StringIO import StringIO as _StringIO
+_RENDERER_PATH = os.path.join(os.path.dirname(__file__), 'renderer.js')
+# Note: This is the script shared by every split map, which draws the map from its data file.
+
+_COMPRESSION_EXTENSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+
+_TILE_SIZE = 256
+# Note: This is the size of a map tile (and of the whole world at zoom level 0), in pixels.
+
+_MAX_MERCATOR_LAT = 85.0511287798
+# Note: This is the latitude at which the Web Mercator projection of the world becomes square.
 
-    class StringIO(_StringIO):
-        def __enter__(self):
-            return self
+_EARTH_RADIUS_IN_KM = 6378.8
 
-        def __exit__(self, exception_type, exception_value, traceback):
-            '''
-            Args:
-                exception_type: Type of exception that triggered the exit. 
-                exception_value: Value of exception that triggered the exit.
-                traceback: Traceback when exit was triggered.
-            '''
-            self.close()
+_WEB_MERCATOR_RADIUS_IN_M = 6378137.0
+# Note: This is the radius of the sphere that Google Maps' Web Mercator projection is based on.
 
-else:
-    from io import StringIO # pragma: no coverage
+_MAX_BINARY_PRECISION = 7
+# Note: This is the highest precision at which any lat/lng value still fits in a 32-bit integer.
+
+_COLUMNAR_THRESHOLD = 100
+# Note: Layers with at least this many points are written as a flat coordinate array instead of one LatLng object per point.
 
 def _get(dict, keys, default=None, get_key=False):
     '''
@@ -74,6 +83,270 @@ def _format_LatLng(lat, lng, precision):
     '''
     return 'new google.maps.LatLng(%.*f, %.*f)' % (precision, lat, precision, lng)
 
+def _format_LatLng_array(lats, lngs, precision, weights=None):
+    '''
+    Format the given latitude/longitude locations as a JavaScript expression that builds an array of Google Maps LatLng objects.
+
+    The locations are written as a single flat numeric array that a small loop expands in the browser,
+    which is far more compact than writing out a LatLng object per location.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+        precision (int): Number of digits after the decimal to round to for lat/lng values.
+
+    Optional:
+
+    Args:
+        weights ([float]): Weight of each location. If specified, the array is built out of
+            ``{location: LatLng, weight: float}`` objects instead (as used by heatmaps).
+
+    Returns:
+        str: JavaScript expression that evaluates to the array of locations.
+    '''
+    if weights is None:
+        return (
+            '(function(c) {'
+            ' var p = [];'
+            ' for (var i = 0; i < c.length; i += 2) p.push(new google.maps.LatLng(c[i], c[i + 1]));'
+            ' return p;'
+            ' })([%s])' % ','.join(['%.*f,%.*f' % (precision, lat, precision, lng) for lat, lng in zip(lats, lngs)])
+        )
+
+    return (
+        '(function(c) {'
+        ' var p = [];'
+        ' for (var i = 0; i < c.length; i += 3) p.push({location: new google.maps.LatLng(c[i], c[i + 1]), weight: c[i + 2]});'
+        ' return p;'
+        ' })([%s])' % ','.join(['%.*f,%.*f,%f' % (precision, lat, precision, lng, weight) for lat, lng, weight in zip(lats, lngs, weights)])
+    )
+
+def _get_world_coordinates(lats, lngs):
+    '''
+    Project the given latitude/longitude locations onto the Web Mercator world, as used by Google Maps.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): X and Y world coordinates of each location, each ranging from 0 to 1
+            (where (0, 0) is the north-west corner of the world). Multiply by ``_TILE_SIZE * 2 ** zoom``
+            to get pixel coordinates at a given zoom level.
+    '''
+    lats = np.radians(np.clip(np.asarray(lats, dtype=float), -_MAX_MERCATOR_LAT, _MAX_MERCATOR_LAT))
+    x = (np.asarray(lngs, dtype=float) + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4 + lats / 2)) / (2 * np.pi)
+    return x, y
+
+def _get_lat_lngs(x, y):
+    '''
+    Get the latitude/longitude locations of the given Web Mercator world coordinates.
+
+    This is the inverse of ``_get_world_coordinates()``.
+
+    Args:
+        x ([float]): X world coordinates.
+        y ([float]): Y world coordinates.
+
+    Returns:
+        (numpy.ndarray, numpy.ndarray): Latitudes and longitudes of each location.
+    '''
+    lats = np.degrees(2 * np.arctan(np.exp((0.5 - np.asarray(y, dtype=float)) * 2 * np.pi)) - np.pi / 2)
+    lngs = np.asarray(x, dtype=float) * 360.0 - 180.0
+    return lats, lngs
+
+def _get_local_coordinates(lats, lngs):
+    '''
+    Get the position of the given latitude/longitude locations relative to a local origin at their center.
+
+    Positions are measured in meters along the Web Mercator projection, scaled as at the origin,
+    which matches the local frame of a Google Maps `WebGLOverlayView`_ anchored at the origin.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+
+    Returns:
+        ((float, float), numpy.ndarray, numpy.ndarray): Latitude/longitude of the origin,
+            along with the eastward and northward distance of each location from the origin, in meters.
+
+    .. _WebGLOverlayView: https://developers.google.com/maps/documentation/javascript/webgl/webgl-overlay-view
+    '''
+    x, y = _get_world_coordinates(lats, lngs)
+    origin_x = (x.min() + x.max()) / 2
+    origin_y = (y.min() + y.max()) / 2
+    origin_lat, origin_lng = _get_lat_lngs(origin_x, origin_y)
+
+    meters_per_unit = 2 * np.pi * _WEB_MERCATOR_RADIUS_IN_M * np.cos(np.radians(origin_lat))
+    return (float(origin_lat), float(origin_lng)), (x - origin_x) * meters_per_unit, (origin_y - y) * meters_per_unit
+
+def _encode_polyline(lats, lngs):
+    '''
+    Encode the given latitude/longitude locations using Google's `encoded polyline algorithm`_.
+
+    The encoding is vectorized, so it stays fast even for millions of locations.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+
+    Returns:
+        str: Encoded polyline. Locations are rounded to 5 digits after the decimal, as per the algorithm.
+
+    .. _encoded polyline algorithm: https://developers.google.com/maps/documentation/utilities/polylinealgorithm
+    '''
+    if len(lats) == 0:
+        return ''
+
+    # Round each value to 5 decimals (the way JavaScript's `Math.round()` does) and take the
+    # difference from the previous location:
+    values = np.floor(np.column_stack((lats, lngs)) * 1e5 + 0.5).astype(np.int64)
+    values = np.diff(values, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+
+    # Left-shift each value, inverting it if it's negative:
+    values = np.where(values < 0, ~(values << 1), values << 1)
+
+    # Break each value into 5-bit chunks, from the least significant chunk up:
+    MAX_NUM_CHUNKS = 7 # (enough for any valid lat/lng delta)
+    chunk_indices = np.arange(MAX_NUM_CHUNKS)
+    chunks = (values[:, np.newaxis] >> (5 * chunk_indices)) & 0x1f
+    num_chunks = 1 + np.count_nonzero(values[:, np.newaxis] >> (5 * chunk_indices[1:]), axis=1)
+
+    # Flag every chunk but the last one of each value as being followed by another chunk,
+    # then offset each chunk into the printable ASCII range:
+    chunks |= np.where(chunk_indices < (num_chunks - 1)[:, np.newaxis], 0x20, 0)
+    chunks += 63
+
+    return chunks[chunk_indices < num_chunks[:, np.newaxis]].astype(np.uint8).tobytes().decode('ascii')
+
+def _format_encoded_LatLng_array(lats, lngs):
+    '''
+    Format the given latitude/longitude locations as a JavaScript expression that decodes
+    an encoded polyline into an array of Google Maps LatLng objects.
+
+    Requires the Maps JavaScript API's ``geometry`` library.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+
+    Returns:
+        str: JavaScript expression that evaluates to the array of locations.
+    '''
+    return 'google.maps.geometry.encoding.decodePath(%s)' % json.dumps(_encode_polyline(lats, lngs))
+
+def _format_typed_array(array):
+    '''
+    Format the given NumPy array as a JavaScript expression that decodes it into a typed array.
+
+    The array is embedded as a base64 blob of its raw little-endian bytes, which is much more compact
+    (and much faster for the browser to parse) than a literal array of numbers.
+
+    Args:
+        array (numpy.ndarray): Array to format. Must have one of the following dtypes:
+            int8, uint8, int16, uint16, int32, uint32, float32 or float64.
+
+    Returns:
+        str: JavaScript expression that evaluates to the typed array.
+    '''
+    typed_array, data = _encode_typed_array(array)
+    return 'new %s(Uint8Array.from(atob("%s"), function(c) { return c.charCodeAt(0); }).buffer)' % (typed_array, data)
+
+def _get_typed_array_data(array):
+    '''
+    Get the given NumPy array as JSON data that the renderer script decodes into a typed array.
+
+    Args:
+        array (numpy.ndarray): Array to get. Must have one of the following dtypes:
+            int8, uint8, int16, uint16, int32, uint32, float32 or float64.
+
+    Returns:
+        dict: JSON data of the typed array, with its type and its raw little-endian bytes as base64.
+    '''
+    typed_array, data = _encode_typed_array(array)
+    return {'typedArray': typed_array, 'base64': data}
+
+def _get_array_data(array):
+    '''
+    Get the given NumPy array as JSON data, as a typed array if it's large enough to benefit from one.
+
+    Args:
+        array (numpy.ndarray): Array to get. Must have one of the dtypes supported by ``_get_typed_array_data()``.
+
+    Returns:
+        list or dict: JSON data of the array, as a list of values or as a typed array.
+    '''
+    if len(array) >= _COLUMNAR_THRESHOLD:
+        return _get_typed_array_data(array)
+    return array.tolist()
+
+def _get_LatLng_data(lats, lngs, precision):
+    '''
+    Get the given latitude/longitude locations as JSON data, as a flat array of alternating lat/lng values.
+
+    Args:
+        lats ([float]): Latitudes.
+        lngs ([float]): Longitudes.
+        precision (int): Number of digits after the decimal to round to for lat/lng values.
+
+    Returns:
+        list or dict: JSON data of the locations, as a list of values or as a typed array.
+    '''
+    return _get_array_data(np.round(np.column_stack((lats, lngs)).astype(float).ravel(), precision))
+
+def _encode_typed_array(array):
+    '''
+    Encode the given NumPy array as the raw bytes of a JavaScript typed array.
+
+    Args:
+        array (numpy.ndarray): Array to encode. Must have one of the following dtypes:
+            int8, uint8, int16, uint16, int32, uint32, float32 or float64.
+
+    Returns:
+        (str, str): Name of the typed array's type, and its raw little-endian bytes as base64.
+    '''
+    TYPED_ARRAYS = {
+        'i1': 'Int8Array',
+        'u1': 'Uint8Array',
+        'i2': 'Int16Array',
+        'u2': 'Uint16Array',
+        'i4': 'Int32Array',
+        'u4': 'Uint32Array',
+        'f4': 'Float32Array',
+        'f8': 'Float64Array'
+    }
+    dtype = array.dtype.newbyteorder('<')
+    typed_array = TYPED_ARRAYS['%s%d' % (dtype.kind, dtype.itemsize)]
+    return typed_array, base64.b64encode(np.ascontiguousarray(array, dtype=dtype).tobytes()).decode()
+
+def _write_renderer(folder):
+    '''
+    Write the renderer script of split maps to a folder, unless it's already there.
+
+    The script's file name includes a hash of its content, so that browsers can cache it indefinitely,
+    and so that maps drawn by different versions of gmplot can share a folder.
+
+    Args:
+        folder (str): Folder to write the script to.
+
+    Returns:
+        str: File name of the script.
+    '''
+    with open(_RENDERER_PATH, 'rb') as f:
+        content = f.read()
+
+    name = 'gmplot-renderer-%s.js' % hashlib.sha1(content).hexdigest()[:8]
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    return name
+
+_EMBEDDABLE_IMAGE_CACHE = {}
+# Note: This cache is shared by the whole process, so each image is only ever read and encoded once.
+
 def _get_embeddable_image(path):
     '''
     Get an image as an embeddable base64 image URL.
@@ -84,8 +357,50 @@ def _get_embeddable_image(path):
     Returns:
         str: Base64 image URL that can be embedded in a file.
     '''
-    with open(path, 'rb') as f:
-        return 'data:image/png;base64,' + base64.b64encode(f.read()).decode()
+    if path not in _EMBEDDABLE_IMAGE_CACHE:
+        with open(path, 'rb') as f:
+            _EMBEDDABLE_IMAGE_CACHE[path] = 'data:image/png;base64,' + base64.b64encode(f.read()).decode()
+
+    return _EMBEDDABLE_IMAGE_CACHE[path]
+
+def _open_compressed(path, compression, encoding):
+    '''
+    Open a text file for writing that's compressed as it's written.
+
+    Args:
+        path (str): File path.
+        compression (str): Compression format, as 'gzip' or 'zstd'.
+            'zstd' requires Python 3.14+ or the `zstandard`_ package.
+        encoding (str): Text encoding.
+
+    Returns:
+        handle: Text file handle.
+
+    Raises:
+        ValueError: If the compression format isn't supported.
+        ImportError: If zstd compression is requested but isn't available.
+
+    .. _zstandard: https://pypi.org/project/zstandard/
+    '''
+    if compression == 'gzip':
+        # (the modification time is left out of the header so that the output is reproducible)
+        return io.TextIOWrapper(gzip.GzipFile(path, 'wb', mtime=0), encoding=encoding)
+
+    if compression == 'zstd':
+        try:
+            from compression import zstd
+            return zstd.open(path, 'wt', encoding=encoding)
+        except ImportError:
+            pass
+
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstd compression requires Python 3.14+ or the `zstandard` package!')
+
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')), encoding=encoding)
+
+    raise ValueError("Compression format '%s' isn't supported!" % compression)
 
 def _get_fresh_path(relative_path):
     '''
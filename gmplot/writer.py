@@ -5,13 +5,19 @@ from .utility import _INDENT
 class _Writer(object):
     '''Writer used to format content with consistent indentation.'''
 
-    def __init__(self, file):
+    def __init__(self, file, indent_level=0):
         '''
         Args:
             file (handle): File to write to.
+
+        Optional:
+
+        Args:
+            indent_level (int): Initial indent level of the writer. Defaults to 0.
         '''
         self._file = file
-        self._indent_level = 0
+        self._indent_level = indent_level
+        self._indent = _INDENT * indent_level
         self._start_of_line = True
 
     def __enter__(self):
@@ -20,7 +26,7 @@ class _Writer(object):
     def __exit__(self, exception_type, exception_value, traceback):
         '''
         Args:
-            exception_type: Type of exception that triggered the exit. 
+            exception_type: Type of exception that triggered the exit.
             exception_value: Value of exception that triggered the exit.
             traceback: Traceback when exit was triggered.
         '''
@@ -28,18 +34,29 @@ class _Writer(object):
         if exception_type:
             self._file.truncate(0)
 
+    def get_indent_level(self):
+        '''
+        Get the current indent level of the writer.
+
+        Returns:
+            int: Indent level.
+        '''
+        return self._indent_level
+
     def indent(self):
         '''Indent the writer by one level.'''
         self._indent_level += 1
+        self._indent = _INDENT * self._indent_level
         return self
 
     def dedent(self):
         '''Dedent the writer by one level.'''
         if self._indent_level > 0:
             self._indent_level -= 1
+            self._indent = _INDENT * self._indent_level
         else:
             warnings.warn("Can't dedent further!")
-            
+
         return self
 
     def write(self, content='', end_in_newline=True):
@@ -56,28 +73,69 @@ class _Writer(object):
                 - All tabs are expanded to spaces.
             end_in_newline (bool): Whether or not to write a newline at the end. Defaults to True.
         '''
-        lines = inspect.cleandoc(content).splitlines()
+        # Single-line content (without tabs or line breaks) only needs its leading whitespace stripped,
+        # so skip the comparatively expensive call to `inspect.cleandoc()`:
+        if content.isprintable():
+            line = content.lstrip()
+            lines = [line] if line else []
+        else:
+            lines = inspect.cleandoc(content).splitlines()
 
         # For each line of content...
+        fragments = []
         for index, line in enumerate(lines):
 
             # ...indent if the writer is at the start of a line:
             if self._start_of_line:
-                self._file.write(_INDENT * self._indent_level)
+                fragments.append(self._indent)
 
             # ...write the line:
-            self._file.write(line)
+            fragments.append(line)
 
             # ...write a newline if there's still more content:
             if index < len(lines) - 1:
-                self._file.write('\n')
+                fragments.append('\n')
                 self._start_of_line = True
 
         # If the content should end in a newline, write it:
         if end_in_newline:
-            self._file.write('\n')
+            fragments.append('\n')
             self._start_of_line = True
         else:
             self._start_of_line = False
-          
+
+        self._file.write(''.join(fragments))
+        return self
+
+    def write_lines(self, lines):
+        '''
+        Write lines of content as-is, each followed by a newline.
+
+        Unlike ``write()``, the content isn't cleaned, which makes this much faster when writing many lines.
+
+        Args:
+            lines ([str]): Lines to write. Each line must be a single line without leading whitespace.
+        '''
+        lines = list(lines)
+        if not lines:
+            return self
+
+        separator = '\n' + self._indent
+        self._file.write((self._indent if self._start_of_line else '') + separator.join(lines) + '\n')
+        self._start_of_line = True
+        return self
+
+    def write_fragment(self, fragment):
+        '''
+        Write a fragment of content that was already formatted by another writer, as-is.
+
+        Args:
+            fragment (str): Fragment to write. Must have been written starting at the start of a line,
+                at the writer's current indent level.
+        '''
+        if not fragment:
+            return self
+
+        self._file.write(fragment)
+        self._start_of_line = fragment.endswith('\n')
         return self
@@ -22,7 +22,7 @@ setup(
     packages = find_packages(),
     include_package_data=True,
     package_data = {
-        'gmplot': ['markers/*.png'],
+        'gmplot': ['markers/*.png', 'renderer.js'],
     },
     project_urls = {
         'Documentation': 'https://github.com/gmplot/gmplot/wiki',
@@ -30,5 +30,6 @@ setup(
         'Source': 'https://github.com/gmplot/gmplot'
     },
     install_requires=get_requirements('requirements.txt'),
-    classifiers = ['Programming Language :: Python :: %s' % version for version in ['2', '2.7', '3', '3.5', '3.6', '3.7', '3.8']]
+    python_requires='>=3.5',
+    classifiers = ['Programming Language :: Python :: %s' % version for version in ['3', '3.5', '3.6', '3.7', '3.8']]
 )
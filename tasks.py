@@ -4,3 +4,7 @@ from invoke import task
 def test(c, report=False):
     c.run('coverage run -m unittest discover -v')
     c.run('coverage report' if report else 'coverage html')
+
+@task
+def benchmark(c):
+    c.run('python benchmarks/writer_benchmark.py')
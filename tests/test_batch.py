@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+from gmplot import GoogleMapPlotter, render_many
+
+class RenderManyTest(unittest.TestCase):
+    def _get_plotters(self, num_maps):
+        for i in range(num_maps):
+            map = GoogleMapPlotter(37.428, -122.145, 16)
+            map.plot([37.428, 37.429 + i * 0.001], [-122.145, -122.146])
+            map.marker(37.428, -122.145, color='red')
+            map.text(37.429, -122.145, 'Map %d' % i)
+            yield os.path.join('maps', 'map_%d.html' % i), map
+
+    def test_render_many(self):
+        for workers in [1, 2]:
+            directory = tempfile.mkdtemp()
+            try:
+                stats = render_many(self._get_plotters(5), directory, workers=workers)
+                self.assertEqual(stats['num_maps'], 5)
+
+                with open(os.path.join(directory, 'maps', 'map_3.html')) as f:
+                    output = f.read()
+                self.assertNotIn('data:image/png;base64,', output)
+                self.assertIn('url: "../icons/FF0000.png"', output)
+                self.assertEqual(sorted(os.listdir(os.path.join(directory, 'icons'))), ['FF0000.png', 'clear.png'])
+                self.assertEqual(stats['num_bytes'], sum(
+                    os.path.getsize(os.path.join(directory, 'maps', name)) for name in os.listdir(os.path.join(directory, 'maps'))
+                ))
+            finally:
+                shutil.rmtree(directory)
+
+    def test_incremental_plotter(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16, incremental=True)
+        map.marker(37.428, -122.145, color='red')
+
+        directories = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+        try:
+            for directory in directories:
+                render_many({'map.html': map}, directory, workers=1)
+                self.assertEqual(os.listdir(os.path.join(directory, 'icons')), ['FF0000.png'], 'Reused markers should still share their icons')
+        finally:
+            for directory in directories:
+                shutil.rmtree(directory)
@@ -0,0 +1,32 @@
+import unittest
+from gmplot.clipping import _clip_path, _clip_polygon, _do_bounds_intersect, _get_points_within
+
+class ClippingTest(unittest.TestCase):
+    BOUNDS = {'north': 1, 'south': 0, 'east': 1, 'west': 0}
+
+    def test_get_points_within(self):
+        self.assertEqual(_get_points_within([0.5, 1.5, 1.0], [0.5, 0.5, 0.0], self.BOUNDS).tolist(), [True, False, True])
+
+    def test_do_bounds_intersect(self):
+        self.assertTrue(_do_bounds_intersect({'north': 2, 'south': 0.5, 'east': 2, 'west': 0.5}, self.BOUNDS))
+        self.assertTrue(_do_bounds_intersect({'north': 2, 'south': 1, 'east': 2, 'west': 1}, self.BOUNDS))
+        self.assertFalse(_do_bounds_intersect({'north': 2, 'south': 1.5, 'east': 1, 'west': 0}, self.BOUNDS))
+        self.assertFalse(_do_bounds_intersect({'north': 1, 'south': 0, 'east': 3, 'west': 2}, self.BOUNDS))
+        self.assertTrue(_do_bounds_intersect({'north': 1, 'south': 0, 'east': 0.5, 'west': 170}, self.BOUNDS), 'Boxes can cross the antimeridian')
+        self.assertFalse(_do_bounds_intersect({'north': 1, 'south': 0, 'east': -10, 'west': 170}, self.BOUNDS))
+
+    def test_clip_path(self):
+        parts = _clip_path([0.5, 0.5, 2.0, 0.5, 0.5], [-1.0, 0.5, 0.5, 0.5, 0.7], self.BOUNDS)
+
+        self.assertEqual([(lats.tolist(), lngs.tolist()) for lats, lngs in parts], [
+            ([0.5, 0.5, 1.0], [0.0, 0.5, 0.5]),
+            ([1.0, 0.5, 0.5], [0.5, 0.5, 0.7])
+        ])
+        self.assertEqual(_clip_path([2.0, 3.0], [2.0, 3.0], self.BOUNDS), [])
+
+    def test_clip_polygon(self):
+        lats, lngs = _clip_polygon([-1.0, 2.0, 2.0, -1.0], [-1.0, -1.0, 2.0, 2.0], self.BOUNDS)
+        self.assertEqual(sorted(zip(lats.tolist(), lngs.tolist())), [(0.0, 0.0), (0.0, 1.0), (1.0, 0.0), (1.0, 1.0)])
+
+        lats, lngs = _clip_polygon([5.0, 6.0, 5.0], [5.0, 5.0, 6.0], self.BOUNDS)
+        self.assertEqual(len(lats), 0)
@@ -0,0 +1,51 @@
+import unittest
+from gmplot.clustering import _bin_points, _get_clusters
+
+class GetClustersTest(unittest.TestCase):
+    def test_get_clusters(self):
+        lats = [37.428, 37.4281, 37.8, -33.9]
+        lngs = [-122.145, -122.1451, -122.4, 151.2]
+        levels = _get_clusters(lats, lngs, 0, 18, 60)
+
+        self.assertEqual([level.zoom for level in levels], list(range(19)))
+
+        # At the lowest zoom level, everything in California is a single cluster:
+        self.assertEqual(sorted(levels[0].counts.tolist()), [1, 3])
+        self.assertIn(3, levels[0].indices.tolist(), 'The lone point should be its own cluster')
+
+        # At the highest zoom level, every point is on its own:
+        self.assertEqual(levels[-1].counts.tolist(), [1, 1, 1, 1])
+        self.assertEqual(sorted(levels[-1].indices.tolist()), [0, 1, 2, 3])
+
+        # The number of points is preserved at every zoom level, and clusters only ever merge when zooming out:
+        for level, next_level in zip(levels, levels[1:]):
+            self.assertEqual(level.counts.sum(), len(lats))
+            self.assertLessEqual(len(level.counts), len(next_level.counts))
+
+    def test_cluster_centroid(self):
+        levels = _get_clusters([10.0, 10.2], [20.0, 20.2], 2, 2, 60)
+
+        self.assertEqual(levels[0].counts.tolist(), [2])
+        self.assertAlmostEqual(levels[0].lngs[0], 20.1)
+        self.assertAlmostEqual(levels[0].lats[0], 10.1, places=2)
+
+class BinPointsTest(unittest.TestCase):
+    def test_bin_points_by_degrees(self):
+        lats, lngs, weights = _bin_points([10.01, 10.03, 10.07, 10.2], [20.01, 20.02, 20.01, 20.01], [1, 3, 2, 0], degrees=0.05)
+
+        self.assertEqual(weights.tolist(), [4, 2], 'Cells without any weight should be left out')
+        self.assertAlmostEqual(lats[0], 10.025)
+        self.assertAlmostEqual(lngs[0], 20.0175)
+        self.assertAlmostEqual(lats[1], 10.07)
+
+    def test_bin_points_by_zoom(self):
+        lats = [37.428, 37.428, 37.430]
+        lngs = [-122.145, -122.145, -122.145]
+
+        self.assertEqual(_bin_points(lats, lngs, [1, 1, 1], zoom=16)[2].tolist(), [1, 2])
+        self.assertEqual(_bin_points(lats, lngs, [1, 1, 1], zoom=16.0)[2].tolist(), [1, 2])
+        self.assertEqual(_bin_points(lats, lngs, [1, 1, 1], zoom=6)[2].tolist(), [3])
+
+        for kwargs in [{'zoom': -1}, {'zoom': 24}, {'zoom': 16.5}, {'degrees': 1e-9}, {}, {'zoom': 16, 'degrees': 0.05}]:
+            with self.assertRaises(ValueError):
+                _bin_points(lats, lngs, [1, 1, 1], **kwargs)
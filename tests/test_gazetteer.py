@@ -0,0 +1,92 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from gmplot import Gazetteer, GoogleMapPlotter
+
+class GazetteerTest(unittest.TestCase):
+    PLACES = [
+        ('2969679', 'Versailles', 'Versailles', 'Versalles,Версаль', '48.80359', '2.13424', 'PPLA', 'FR', '11', '85416'),
+        ('4285268', 'Versailles', 'Versailles', '', '38.05229', '-84.72966', 'PPLA2', 'US', 'KY', '2700'),
+        ('1850147', 'Tōkyō', 'Tokyo', 'Tokio,東京', '35.6895', '139.69171', 'PPLC', 'JP', '40', '8336599'),
+        ('2988507', 'Paris', 'Paris', 'Lutetia', '48.85341', '2.3488', 'PPLC', 'FR', '11', '2138551'),
+        ('4717560', 'Paris', 'Paris', '', '33.66094', '-95.55551', 'PPLA2', 'US', 'TX', '24782'),
+        ('6455259', 'Parisot', 'Parisot', '', '44.26471', '1.85821', 'PPL', 'FR', '76', ''),
+        ('4409896', 'Springfield', 'Springfield', '', '37.21533', '-93.29824', 'PPLA2', 'US', 'MO', '166810'),
+        ('4250542', 'Springfield', 'Springfield', '', '39.80172', '-89.64371', 'PPLA', 'US', 'IL', '116565'),
+        ('3017382', 'France', 'France', '', '46', '2', 'PCLI', 'FR', '00', '66987244'),
+        ('4896861', 'Illinois', 'Illinois', '', '40.00032', '-89.25037', 'ADM1', 'US', 'IL', '12830632')
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'places.txt')
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            for geonameid, name, ascii_name, alternate_names, lat, lng, feature_code, country, admin1, population in self.PLACES:
+                columns = [geonameid, name, ascii_name, alternate_names, lat, lng, '', feature_code, country, '', admin1, '', '', '', population]
+                f.write('\t'.join(columns) + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_geocode(self):
+        gazetteer = Gazetteer(self.path)
+        self.assertTrue(os.path.isdir(self.path + '.index'))
+        self.assertEqual(gazetteer.geocode('Versailles, France'), (48.80359, 2.13424), 'The most populous place should be found')
+        self.assertEqual(gazetteer.geocode('  tokyo '), (35.6895, 139.69171))
+        self.assertEqual(gazetteer.geocode('TOKYO'), gazetteer.geocode('Tōkyō'))
+        self.assertIsNone(gazetteer.geocode('Tokio'), 'Alternate names should only be indexed on request')
+        self.assertIsNone(gazetteer.geocode('Atlantis'))
+        gazetteer.close()
+
+        gazetteer = Gazetteer(self.path, index_path=os.path.join(self.directory, 'alternate.index'), alternate_names=True)
+        self.assertEqual(gazetteer.geocode('Tokio'), (35.6895, 139.69171))
+        gazetteer.close()
+
+    def test_rebuild(self):
+        gazetteer = Gazetteer(self.path)
+        self.assertIsNone(gazetteer.geocode('Tokio'))
+        gazetteer.close()
+
+        gazetteer = Gazetteer(self.path, alternate_names=True)
+        self.assertEqual(gazetteer.geocode('Tokio'), (35.6895, 139.69171), 'The index should be rebuilt when its options change')
+        gazetteer.close()
+
+        gazetteer = Gazetteer(self.path)
+        self.assertIsNone(gazetteer.geocode('Tokio'))
+        gazetteer.close()
+
+    def test_qualifiers(self):
+        gazetteer = Gazetteer(self.path)
+        self.assertEqual(gazetteer.geocode('Paris, France'), (48.85341, 2.3488))
+        self.assertEqual(gazetteer.geocode('Paris, TX'), (33.66094, -95.55551))
+        self.assertEqual(gazetteer.geocode('Paris, tx, US'), (33.66094, -95.55551))
+        self.assertEqual(gazetteer.geocode('Versailles, KY'), (38.05229, -84.72966))
+        self.assertEqual(gazetteer.geocode('Springfield, Illinois'), (39.80172, -89.64371))
+        self.assertEqual(gazetteer.geocode('Springfield, IL, US'), (39.80172, -89.64371))
+        self.assertIsNone(gazetteer.geocode('Paris, Texas'), 'Qualifiers that can\'t be checked should fall back')
+        self.assertIsNone(gazetteer.geocode('Paris, TX, USA'))
+        self.assertIsNone(gazetteer.geocode('Paris, FR, TX'))
+        self.assertIsNone(gazetteer.geocode('Tokyo, France'))
+        gazetteer.close()
+
+    def test_search(self):
+        gazetteer = Gazetteer(self.path)
+        self.assertEqual([name for name, _, _ in gazetteer.search('pari')], ['paris', 'paris', 'parisot'])
+        self.assertEqual(gazetteer.search('Par', limit=1), [('paris', 48.85341, 2.3488)])
+        self.assertEqual(gazetteer.search('xyz'), [])
+        gazetteer.close()
+
+    def test_fallback(self):
+        gazetteer = Gazetteer(self.path)
+        with mock.patch('gmplot.google_map_plotter.requests.get') as get:
+            map = GoogleMapPlotter.from_geocode('Paris', geocoder=gazetteer, cache=False)
+            self.assertEqual(map._map._lat, 48.85341)
+            self.assertEqual(get.call_count, 0)
+
+            get.return_value = mock.Mock(text='{"results": [{"geometry": {"location": {"lat": 1.5, "lng": 2.5}}}]}')
+            self.assertEqual(GoogleMapPlotter.geocode('Atlantis', geocoder=gazetteer, cache=False), (1.5, 2.5))
+            self.assertEqual(get.call_count, 1, 'Places that aren\'t in the gazetteer should be requested from Google')
+        gazetteer.close()
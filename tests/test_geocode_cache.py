@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from gmplot import GeocodeCache, GoogleMapPlotter
+
+class GeocodeCacheTest(unittest.TestCase):
+    def test_lru(self):
+        cache = GeocodeCache(max_size=2)
+        cache.set('Versailles, France', (48.801408, 2.130122))
+        cache.set('Chiyoda City, Tokyo', (35.694003, 139.753595))
+
+        self.assertEqual(cache.get('  versailles,   FRANCE '), (48.801408, 2.130122), 'Locations should be normalized')
+        cache.set('Paris, France', (48.856614, 2.352222))
+
+        self.assertIsNone(cache.get('Chiyoda City, Tokyo'), 'The least recently used location should be evicted')
+        self.assertEqual(cache.get('Versailles, France'), (48.801408, 2.130122))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(len(cache), 2)
+
+    def test_persistence(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'geocodes.db')
+            cache = GeocodeCache(max_size=1, path=path)
+            cache.set('Versailles, France', (48.801408, 2.130122))
+            cache.set('Paris, France', (48.856614, 2.352222))
+            self.assertEqual(cache.get('Versailles, France'), (48.801408, 2.130122), 'Evicted locations should stay in the database')
+            cache.close()
+
+            cache = GeocodeCache(path=path)
+            self.assertEqual(cache.get('Paris, France'), (48.856614, 2.352222))
+            cache.close()
+
+            cache = GeocodeCache(path=path, ttl=0)
+            self.assertIsNone(cache.get('Paris, France'), 'Expired locations should be misses')
+            cache.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_geocode(self):
+        response = mock.Mock(text=json.dumps({'results': [{'geometry': {'location': {'lat': 48.801408, 'lng': 2.130122}}}]}))
+        cache = GeocodeCache()
+
+        with mock.patch('gmplot.google_map_plotter.requests.get', return_value=response) as get:
+            self.assertEqual(GoogleMapPlotter.geocode('Versailles, France', cache=cache), (48.801408, 2.130122))
+            map = GoogleMapPlotter.from_geocode('versailles, france', cache=cache)
+            self.assertEqual(get.call_count, 1, 'Cached locations should not be requested again')
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(map._map._lat, 48.801408)
+
+            GoogleMapPlotter.geocode('Versailles, France', cache=False)
+            self.assertEqual(get.call_count, 2)
@@ -0,0 +1,77 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from gmplot import GeocodeCache, GoogleMapPlotter
+from gmplot.google_map_plotter import GoogleAPIError
+
+class _StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class _StubGeocoder(BaseHTTPRequestHandler):
+    '''Stub of the Geocoding API, which geocodes 'Location <n>' to (n, -n) after being over the query limit once.'''
+
+    def do_GET(self):
+        address = parse_qs(urlparse(self.path).query)['address'][0].strip('"')
+        with self.server.lock:
+            self.server.addresses.append(address)
+            is_over_limit = address not in self.server.limited_addresses
+            self.server.limited_addresses.add(address)
+
+        if address == 'Nowhere':
+            response = {'status': 'REQUEST_DENIED', 'error_message': 'Nowhere'}
+        elif is_over_limit:
+            response = {'status': 'OVER_QUERY_LIMIT', 'results': []}
+        else:
+            n = float(address.split()[1])
+            response = {'status': 'OK', 'results': [{'geometry': {'location': {'lat': n, 'lng': -n}}}]}
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class GeocodeManyTest(unittest.TestCase):
+    def setUp(self):
+        self.server = _StubServer(('127.0.0.1', 0), _StubGeocoder)
+        self.server.lock = threading.Lock()
+        self.server.addresses = []
+        self.server.limited_addresses = set()
+        self.base_url = 'http://127.0.0.1:%d/geocode/json' % self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        # (retry quickly, since the stub is over the query limit for the first request of every location)
+        self.retry_delay = mock.patch('gmplot.geocoding._RETRY_DELAY', 0.01)
+        self.retry_delay.start()
+
+    def tearDown(self):
+        self.retry_delay.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_geocode_many(self):
+        cache = GeocodeCache()
+        cache.set('Location 0', (0, 0))
+        locations = ['Location %d' % i for i in range(10)] + ['location 3']
+
+        lat_lngs = GoogleMapPlotter.geocode_many(locations, max_workers=4, base_url=self.base_url, cache=cache)
+        self.assertEqual(lat_lngs, [(i, -i) for i in range(10)] + [(3, -3)])
+        self.assertEqual(len(self.server.addresses), 18, 'Each uncached location should be requested once, then retried once')
+
+        self.assertEqual(GoogleMapPlotter.geocode('Location 5', base_url=self.base_url, cache=cache), (5, -5))
+        self.assertEqual(len(self.server.addresses), 18)
+
+    def test_errors(self):
+        with self.assertRaises(GoogleAPIError):
+            GoogleMapPlotter.geocode_many(['Location 1', 'Nowhere'], base_url=self.base_url, cache=False)
+
+        with self.assertRaises(GoogleAPIError):
+            GoogleMapPlotter.geocode_many(['Location 2'], base_url=self.base_url, cache=False, max_retries=0)
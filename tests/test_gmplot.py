@@ -1,9 +1,17 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
 import unittest
 import warnings
-from gmplot.utility import StringIO, _format_LatLng
+from unittest import mock
+from io import StringIO
+import numpy as np
+from gmplot.utility import _COLUMNAR_THRESHOLD, _format_LatLng, _format_LatLng_array
 from gmplot.writer import _Writer
 from gmplot.drawables.route import _Route
-from gmplot.google_map_plotter import GoogleMapPlotter
+from gmplot.google_map_plotter import GoogleMapPlotter, _clip_drawables
 
 class GMPlotTest(unittest.TestCase):
     def test_format_LatLng(self):
@@ -11,6 +19,10 @@ class GMPlotTest(unittest.TestCase):
         self.assertEqual(_format_LatLng(45.123456, -80.987654, 4), 'new google.maps.LatLng(45.1235, -80.9877)')
         self.assertEqual(_format_LatLng(45.1, -80.9, 3), 'new google.maps.LatLng(45.100, -80.900)')
 
+    def test_format_LatLng_array(self):
+        self.assertTrue(_format_LatLng_array([45.123456, 45.1], [-80.987654, -80.9], 4).endswith('([45.1235,-80.9877,45.1000,-80.9000])'))
+        self.assertTrue(_format_LatLng_array([45.1], [-80.9], 1, weights=[2]).endswith('([45.1,-80.9,2.000000])'))
+
 # Note: This test only ensures that Route's functions can be called without failing,
 #       it doesn't test if the resulting output can actually be rendered properly in a browser.
 class RouteTest(unittest.TestCase):
@@ -85,6 +97,376 @@ class GoogleMapPlotterTest(unittest.TestCase):
 
         map.get()
 
+    def test_columnar_layers(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = [37.428 + i * 0.0001 for i in range(_COLUMNAR_THRESHOLD)]
+        lngs = [-122.145 + i * 0.0001 for i in range(_COLUMNAR_THRESHOLD)]
+
+        map.plot(lats, lngs)
+        map.polygon(lats, lngs)
+        map.heatmap(lats, lngs)
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.LatLng('), 4, 'Large layers should be written as flat coordinate arrays')
+        self.assertIn('path: (function(c)', output)
+        self.assertIn('paths: (function(c)', output)
+        self.assertIn('data: (function(c)', output)
+
+    def test_encoded_paths(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.plot(self.PATH_1[0], self.PATH_1[1], encode=True)
+        map.polygon(self.PATH_3[0], self.PATH_3[1], encode=True)
+        map.directions((37.770776,-122.461689), (37.780776,-122.461689), waypoints=[(37.431257,-122.133121)], encode=True)
+        output = map.get()
+
+        self.assertEqual(output.count('google.maps.geometry.encoding.decodePath('), 3)
+        self.assertIn('libraries=visualization,geometry', output)
+
+    def test_binary_heatmap(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.heatmap(self.PATH_4[0], self.PATH_4[1], binary=True)
+        map.heatmap(self.PATH_4[0], self.PATH_4[1], weights=[1, 1, 1, 0.5, 0.5, 0.5, 1, 1, 1, 2, 2], precision=9, binary=True)
+        output = map.get()
+
+        self.assertEqual(output.count('new Int32Array('), 2)
+        self.assertEqual(output.count('new Float32Array('), 1, 'Only weighted heatmaps should write their weights')
+        self.assertIn('10000000\n', output, 'Precision should be capped so that lat/lng values fit in 32 bits')
+
+    def test_aggregated_heatmap(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = np.tile([37.428, 37.429], 5 * _COLUMNAR_THRESHOLD)
+        lngs = np.tile([-122.145, -122.146], 5 * _COLUMNAR_THRESHOLD)
+        map.heatmap(lats, lngs, aggregate_zoom=16)
+
+        self.assertEqual(map._drawables[0]._weights.tolist(), [5 * _COLUMNAR_THRESHOLD] * 2)
+        self.assertIn('weight: 500.000000}', map.get())
+
+    def test_simplified_paths(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = np.full(1000, 37.428)
+        lngs = np.linspace(-122.145, -122.135, 1000)
+
+        self.assertEqual(map.plot(lats, lngs), 0)
+        self.assertEqual(map.plot(lats, lngs, simplify='auto'), 998)
+        self.assertEqual(len(map._drawables[-1]._lats), 2)
+        self.assertEqual(map.polygon([37.428, 37.428, 37.428, 37.429, 37.429], [-122.145, -122.144, -122.143, -122.143, -122.145], simplify=1), 1)
+        self.assertRaises(ValueError, map.plot, lats, lngs, simplify='fast')
+
+    def test_path_levels(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        angles = np.linspace(0, 2 * np.pi, 10000)
+        lats = 37.428 + 0.1 * np.sin(angles)
+        lngs = -122.145 + 0.1 * np.cos(angles)
+        map.plot(lats, lngs, lod=[4, 10, 16])
+        map.polygon(lats, lngs, lod=True)
+
+        levels = map._drawables[0]._levels
+        self.assertEqual(len(levels), 3)
+        self.assertEqual(len(levels[-1][0]), len(lats))
+        self.assertLess(len(levels[0][0]), len(levels[1][0]))
+        self.assertLess(len(levels[1][0]), len(levels[2][0]))
+        self.assertEqual(len(map._drawables[1]._levels), 10)
+        self.assertIn('new google.maps.Polygon(options)', map.get())
+        self.assertRaises(ValueError, map.plot, lats, lngs, lod=[10, 4])
+
+    def test_render_bounds(self):
+        bounds = {'north': 37.5, 'south': 37.4, 'east': -122.1, 'west': -122.2}
+        map = GoogleMapPlotter(37.428, -122.145, 16, fit_bounds=bounds, render_bounds=True)
+        map.marker(37.45, -122.15, title='Inside')
+        map.marker(38.0, -122.15, title='Outside')
+        map.text(38.0, -122.15, 'Outside')
+        map.scatter([37.45, 38.0] * _COLUMNAR_THRESHOLD, [-122.15, -122.15] * _COLUMNAR_THRESHOLD, marker=False, size=5)
+        map.heatmap([37.45, 38.0], [-122.15, -122.15])
+        map.plot([37.45, 37.6, 37.45, 37.6], [-122.15, -122.15, -122.14, -122.14])
+        map.polygon([37.3, 37.45, 37.45], [-122.15, -122.15, -122.14])
+        output = map.get()
+
+        self.assertIn('Inside', output)
+        self.assertNotIn('Outside', output)
+        self.assertEqual(output.count('new google.maps.Polyline('), 2, 'The polyline should be split where it leaves the bounds')
+        self.assertIn('new google.maps.LatLng(37.400000, -122.143333)', output)
+        self.assertNotIn('38.000000', output)
+        self.assertEqual([len(drawable._lats) for drawable in _clip_drawables(map._drawables, map._render_bounds)], [_COLUMNAR_THRESHOLD, 1, 2, 3, 4])
+        self.assertRaises(ValueError, GoogleMapPlotter, 37.428, -122.145, 16, render_bounds=True)
+        self.assertRaises(ValueError, GoogleMapPlotter, 37.428, -122.145, 16, render_bounds=(37.5, 37.4, -122.1, -122.2))
+        self.assertIsNone(GoogleMapPlotter(37.428, -122.145, 16, fit_bounds=bounds, render_bounds=False)._render_bounds)
+
+        map = GoogleMapPlotter(0.5, 0.5, 10, render_bounds={'north': 1, 'south': 0, 'east': 1, 'west': 0})
+        map.circle(50.123, 50.456, 100)
+        map.circle(1.0005, 0.5, 100)
+        map.ground_overlay('outside.png', {'north': 3, 'south': 2, 'east': 3, 'west': 2})
+        map.ground_overlay('inside.png', {'north': 0.6, 'south': 0.4, 'east': 0.6, 'west': 0.4})
+        output = map.get()
+
+        self.assertNotIn('50.123', output, 'Circles outside of the bounds should be left out')
+        self.assertIn('1.000500', output, 'Circles that reach into the bounds should be kept')
+        self.assertNotIn('outside.png', output)
+        self.assertIn('inside.png', output)
+
+    def test_incremental_draws(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16, incremental=True)
+        map.plot(*self.PATH_1)
+        map.marker(37.428, -122.145, color='red')
+        map.text(37.428, -122.145, 'Text')
+        first_output = map.get()
+
+        reference_map = GoogleMapPlotter(37.428, -122.145, 16)
+        reference_map.plot(*self.PATH_1)
+        reference_map.marker(37.428, -122.145, color='red')
+        reference_map.text(37.428, -122.145, 'Text')
+        self.assertEqual(first_output, reference_map.get())
+
+        # Only the new layer (and the markers, which are written as a whole) should be written again:
+        written = []
+        for drawable in map._drawables:
+            drawable.write = lambda w, drawable=drawable: written.append(drawable)
+        map.polygon(*self.PATH_2)
+        reference_map.polygon(*self.PATH_2)
+        self.assertEqual(map.get(), reference_map.get())
+        self.assertEqual(written, [])
+        self.assertEqual(len(map._fragments), 4)
+
+    def test_parallel_rendering(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16, render_bounds={'north': 37.5, 'south': 37.4, 'east': -122.1, 'west': -122.2})
+        map.plot(*self.PATH_1, color='red')
+        map.polygon(*self.PATH_2)
+        map.scatter(*self.PATH_3, marker=False, size=5)
+        map.heatmap(*self.PATH_4)
+        map.grid({'north': 37.5, 'south': 37.4, 'east': -122.1, 'west': -122.2}, 0.01, 0.01)
+        map.marker(37.428, -122.145, color='red', info_window='Info')
+        expected_output = map.get()
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'map.html')
+            map.draw(path, workers=2)
+            with open(path) as f:
+                self.assertEqual(f.read(), expected_output)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_shared_icons(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        for lat, lng in zip(*self.PATH_3):
+            map.text(lat, lng, 'Text')
+            map.marker(lat, lng, color='red')
+        map.plot(*self.PATH_1)
+        output = map.get()
+
+        self.assertEqual(output.count('data:image/png;base64,'), 2, 'Each icon should only be embedded once')
+        self.assertEqual(output.count('icon: marker_icon_clear,'), len(self.PATH_3[0]))
+        self.assertLess(output.rindex('icon: marker_icon_clear,'), output.index('new google.maps.Polyline('), 'Text labels should be written in order with the other layers')
+
+    def test_marker_batches(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        for i in range(_COLUMNAR_THRESHOLD):
+            map.marker(37.428 + i * 0.0001, -122.145, color='red', title='Marker "%d"' % i if i % 2 else None)
+        map.marker(37.428, -122.145, color='blue')
+        map.marker(37.428, -122.145, color='red', info_window='Info')
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.Marker('), 3, 'Batched markers should be created in a single loop')
+        self.assertIn('[null,"Marker \\"1\\"",null,', output)
+
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        for i in range(_COLUMNAR_THRESHOLD):
+            map.marker(37.428 + i * 0.0001, -122.145, label=i, title=i)
+        self.assertIn('["0","1","2",', map.get(), 'Labels and titles should be written as strings')
+
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        for color in ['red', 'red', 'blue', 'red']:
+            map.marker(37.428, -122.145, color=color)
+        output = map.get()
+        self.assertEqual(output.count('new google.maps.Marker('), 4)
+        self.assertGreater(output.rindex('icon: marker_icon_FF0000,'), output.index('icon: marker_icon_0000FF,'), 'Markers should be created in order')
+
+    def test_scatter_arrays(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = np.linspace(37.42, 37.43, 2 * _COLUMNAR_THRESHOLD)
+        lngs = np.linspace(-122.15, -122.14, 2 * _COLUMNAR_THRESHOLD)
+        is_marker = np.arange(len(lats)) % 2 == 0
+        map.scatter(lats, lngs, marker=is_marker, color=np.where(lats < 37.425, 'red', '#FF0000'), symbol='x')
+
+        self.assertEqual(len(map._markers), 1, 'Markers that share an icon should be stored as a single batch')
+        self.assertEqual(len(map._markers[0]), is_marker.sum())
+        self.assertEqual(len(map._drawables), 1, 'Symbols should be stored as a single batch')
+        self.assertEqual(len(map._drawables[0]), (~is_marker).sum())
+
+        output = map.get()
+        self.assertEqual(output.count('new google.maps.Marker('), 1, 'Batched markers should be created in a single loop')
+
+    def test_scatter_marker_order(self):
+        lats, lngs = [37.401, 37.402, 37.403, 37.404], [-122.1, -122.1, -122.1, -122.1]
+        for kwargs in [{'color': ['red', 'blue', 'red', 'red']}, {'color': 'red', 'info_window': [None, 'x', None, None]}]:
+            map = GoogleMapPlotter(37.428, -122.145, 16)
+            map.scatter(lats, lngs, **kwargs)
+            output = map.get()
+
+            positions = [output.find('%.6f' % lat) for lat in lats]
+            self.assertEqual(positions, sorted(positions), 'Markers should be created in the order they were given')
+            self.assertEqual(len(map._markers), 3, 'Only consecutive markers should be batched')
+
+    def test_symbol_batches(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = np.linspace(37.42, 37.43, 3 * _COLUMNAR_THRESHOLD)
+        lngs = np.linspace(-122.15, -122.14, 3 * _COLUMNAR_THRESHOLD)
+        symbols = np.array(['o', 'x', '+'])[np.arange(len(lats)) % 3]
+        map.scatter(lats, lngs, marker=False, symbol=symbols, color=np.where(lats < 37.425, 'red', 'blue'))
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.Circle('), 1, 'Circles should be created in a single loop')
+        self.assertEqual(output.count('new google.maps.Polyline('), 0, "x's and +'s shouldn't be drawn as individual polylines")
+        self.assertIn('{style: 0, strokes: [', output)
+        self.assertIn('{style: 1, strokes: [', output)
+
+    def test_canvas_scatter(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        lats = np.linspace(37.42, 37.43, 3 * _COLUMNAR_THRESHOLD)
+        lngs = np.linspace(-122.15, -122.14, 3 * _COLUMNAR_THRESHOLD)
+        map.scatter(lats, lngs, marker=False, symbol=np.array(['o', 'x', '+'])[np.arange(len(lats)) % 3], render='canvas')
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.OverlayView()'), 1, 'All symbols should be drawn on a single overlay')
+        self.assertNotIn('new google.maps.Circle(', output)
+
+        with self.assertRaises(ValueError):
+            map.scatter(lats, lngs, marker=False, render='svg')
+
+    def test_webgl_layers(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16, map_id='map_id')
+        lats = np.linspace(37.42, 37.43, 3 * _COLUMNAR_THRESHOLD)
+        lngs = np.linspace(-122.15, -122.14, 3 * _COLUMNAR_THRESHOLD)
+        map.scatter(lats, lngs, marker=False, render='webgl')
+        map.plot(lats, lngs, render='webgl')
+        output = map.get()
+
+        self.assertIn('mapId: "map_id",', output)
+        self.assertEqual(output.count('new google.maps.WebGLOverlayView()'), 2)
+        self.assertNotIn('new google.maps.Circle(', output)
+        self.assertNotIn('new google.maps.Polyline(', output)
+        self.assertIn('max(uWidth * uPixelRatio, 1.0)', output, "Paths should be scaled to device pixels like points")
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            GoogleMapPlotter(37.428, -122.145, 16).plot(lats, lngs, render='webgl')
+            self.assertEqual(len(w), 1, 'WebGL layers should require a vector map')
+
+    def test_marker_clustering(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.scatter(self.PATH_4[0], self.PATH_4[1], title='Point', info_window='Info')
+        map.text(37.428, -122.145, 'Text')
+        map.enable_marker_clustering(color='blue', max_zoom=18)
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.Marker('), 3, 'Clustered markers should be created by the clusterer')
+        self.assertIn('icon: marker_icon_clear,', output, 'Text labels should not be clustered')
+
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.marker(37.428, -122.145, title=3, label=5)
+        map.scatter([37.429, 37.43], [-122.145, -122.145], title=[1, None], label=[2, 4])
+        map.enable_marker_clustering()
+        output = map.get()
+
+        self.assertIn('titles: ["3","1",null]', output, 'Clustered titles should be written as strings')
+        self.assertIn('labels: ["5","2","4"]', output, 'Clustered labels should be written as strings')
+
+    def test_iter_html(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.plot(self.PATH_1[0], self.PATH_1[1])
+        map.marker(37.427, -122.145)
+
+        chunks = list(map.iter_html(chunk_size=100))
+        self.assertEqual(''.join(chunks), map.get())
+        self.assertTrue(all(len(chunk) == 100 for chunk in chunks[:-1]), 'All chunks but the last should be full')
+        self.assertTrue(0 < len(chunks[-1]) <= 100)
+
+        with self.assertRaises(ValueError):
+            next(map.iter_html(chunk_size=0))
+
+    def test_draw(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.plot(self.PATH_1[0], self.PATH_1[1])
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'map.html')
+            map.draw(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), map.get())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_draw_compressed(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.plot(self.PATH_1[0], self.PATH_1[1])
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'map.html.gz')
+            map.draw(path, compress='gzip')
+            with gzip.open(path, 'rt') as f:
+                self.assertEqual(f.read(), map.get())
+
+            path = os.path.join(directory, 'map.html')
+            map.draw(path, compress='gzip', sidecar=True)
+            with open(path) as f, gzip.open(path + '.gz', 'rt') as compressed_f:
+                self.assertEqual(f.read(), compressed_f.read())
+
+            with self.assertRaises(ValueError):
+                map.draw(path, compress='lzma')
+
+            with self.assertRaises(ValueError):
+                map.draw(path, sidecar=True)
+
+            os.remove(path + '.gz')
+            with mock.patch('gmplot.drawables.polyline._Polyline.write', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+                map.draw(path, compress='gzip', sidecar=True)
+            self.assertEqual(os.path.getsize(path), 0)
+            self.assertFalse(os.path.exists(path + '.gz'), 'Partly written compressed files should be removed')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_draw_split(self):
+        map = GoogleMapPlotter(37.428, -122.145, 16)
+        map.plot(self.PATH_1[0], self.PATH_1[1], color='red')
+        map.heatmap(np.repeat(self.PATH_2[0], 30), np.repeat(self.PATH_2[1], 30))
+        map.marker(37.428, -122.145, color='blue', title='Title')
+        map.marker(37.427, -122.145, info_window='Info')
+        map.text(37.429, -122.145, 'Text')
+        map.directions((37.799001, -122.398051), (37.790103, -122.416903))
+
+        directory = tempfile.mkdtemp()
+        try:
+            map.draw(os.path.join(directory, 'map.html'), split=True)
+            renderers = [name for name in os.listdir(directory) if name.startswith('gmplot-renderer-')]
+            self.assertEqual(len(renderers), 1)
+
+            with open(os.path.join(directory, 'map.html')) as f:
+                page = f.read()
+            self.assertIn('src="%s"' % renderers[0], page)
+            self.assertIn('gmplot.load("map.json"', page)
+            self.assertIn('new google.maps.DirectionsService()', page, 'Routes should be written to the page')
+            self.assertIn('info_marker_0', page, 'Markers with info windows should be written to the page')
+            self.assertNotIn('new google.maps.Polyline', page)
+
+            with open(os.path.join(directory, 'map.json')) as f:
+                data = json.load(f)
+            self.assertEqual(data['map']['options']['center'], {'lat': 37.428, 'lng': -122.145})
+            self.assertEqual([layer['type'] for layer in data['layers']], ['polyline', 'heatmap', 'text', 'markers'])
+            self.assertEqual(data['layers'][0]['path'][:2], [round(self.PATH_1[0][0], 6), round(self.PATH_1[1][0], 6)])
+            self.assertEqual(data['layers'][1]['positions']['typedArray'], 'Float64Array')
+            self.assertEqual(data['layers'][3]['titles'], ['Title'])
+            self.assertEqual(sorted(data['icons']), ['marker_icon_0000FF', 'marker_icon_clear'])
+
+            # The renderer is shared by every map in the folder:
+            map.draw(os.path.join(directory, 'other_map.html'), split=True)
+            self.assertEqual(len([name for name in os.listdir(directory) if name.startswith('gmplot-renderer-')]), 1)
+
+            with self.assertRaises(ValueError):
+                map.draw(os.path.join(directory, 'map.html'), compress='gzip', split=True)
+        finally:
+            shutil.rmtree(directory)
+
     def test_scatter_length_mismatch(self):
         map = GoogleMapPlotter(37.428, -122.145, 16)
 
@@ -111,7 +493,10 @@ class GoogleMapPlotterTest(unittest.TestCase):
         map = GoogleMapPlotter(37.428, -122.145, 16)
         bounds = {'north': 37.43, 'south': 37.42, 'east': -122.14, 'west': -122.15}
         map.grid(bounds, 0.001, 0.001)
-        map.get()
+        output = map.get()
+
+        self.assertEqual(output.count('new google.maps.Polyline('), 1, 'Grid lines should be drawn by the page')
+        self.assertIn('{north: 37.430000, south: 37.420000, east: -122.140000, west: -122.150000},', output)
 
     def test_map_styles(self):
         map_styles = [
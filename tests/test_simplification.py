@@ -0,0 +1,27 @@
+import unittest
+import numpy as np
+from gmplot.simplification import _get_meters_per_pixel, _simplify_path
+
+class SimplifyPathTest(unittest.TestCase):
+    def test_simplify_path(self):
+        # A straight line with a small bump, then a large detour:
+        lats = [37.0, 37.0, 37.0, 37.00001, 37.0, 37.01, 37.0]
+        lngs = [-122.0, -121.999, -121.998, -121.997, -121.996, -121.995, -121.994]
+
+        self.assertEqual(_simplify_path(lats, lngs, 5).tolist(), [True, False, False, False, True, True, True])
+        self.assertTrue(_simplify_path(lats, lngs, 0.5)[3], 'The bump is about a meter high')
+        self.assertTrue(_simplify_path(lats[:2], lngs[:2], 1e6).all())
+
+    def test_simplify_closed_path(self):
+        angles = np.linspace(0, 2 * np.pi, 1000)
+        lats = 37 + 0.01 * np.sin(angles)
+        lngs = -122 + 0.01 * np.cos(angles)
+        keep = _simplify_path(lats, lngs, 1e6, closed=True)
+
+        # Even with a huge tolerance, the ring keeps an area:
+        self.assertEqual(keep.sum(), 3)
+        self.assertTrue(keep[0] and keep[-1])
+
+    def test_get_meters_per_pixel(self):
+        self.assertAlmostEqual(_get_meters_per_pixel(0, 0), 156543.034, places=3)
+        self.assertAlmostEqual(_get_meters_per_pixel(1, 60), 156543.034 / 4, places=3)
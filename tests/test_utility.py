@@ -1,10 +1,22 @@
 import unittest
-from gmplot.utility import StringIO
+from gmplot.utility import _encode_polyline, _get_local_coordinates
 
-class StringIOTest(unittest.TestCase):
-    def test_enter_exit(self):
-        with StringIO() as f:
-            f.write('Content')
-            self.assertEqual(f.getvalue(), 'Content')
+class EncodePolylineTest(unittest.TestCase):
+    def test_encode_polyline(self):
+        # Example from Google's encoded polyline algorithm documentation:
+        self.assertEqual(_encode_polyline([38.5, 40.7, 43.252], [-120.2, -120.95, -126.453]), '_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+        self.assertEqual(_encode_polyline([0], [0]), '??')
+        self.assertEqual(_encode_polyline([], []), '')
 
-        self.assertTrue(f.closed) 
+class LocalCoordinatesTest(unittest.TestCase):
+    def test_get_local_coordinates(self):
+        origin, east, north = _get_local_coordinates([37.42, 37.44], [-122.15, -122.13])
+
+        self.assertAlmostEqual(origin[1], -122.14)
+        self.assertAlmostEqual(origin[0], 37.43, places=4)
+        self.assertAlmostEqual(east[0], -east[1])
+        self.assertAlmostEqual(north[0], -north[1])
+
+        # 0.01 degrees of latitude and longitude are about 1112 and 883 meters at this latitude:
+        self.assertAlmostEqual(east[1], 883, delta=2)
+        self.assertAlmostEqual(north[1], 1112, delta=2)
@@ -1,6 +1,6 @@
 import unittest
 import warnings
-from gmplot.utility import StringIO
+from io import StringIO
 from gmplot.writer import _Writer
 
 def _get_comparison_error_message(output, expected_output):
@@ -63,6 +63,25 @@ List of random items:
 
         self.assertEqual(output_string, EXPECTED_OUTPUT, _get_comparison_error_message(output_string, EXPECTED_OUTPUT))
 
+    def test_writing_raw_lines(self):
+        with StringIO() as f:
+            with _Writer(f) as writer:
+                writer.write('List of random items: [', end_in_newline=False)
+                writer.write_lines(['- First', '- Second'])
+                writer.indent().write_lines(['- Third'])
+                writer.write_lines([])
+                writer.dedent().write(']')
+            output_string = f.getvalue()
+
+        EXPECTED_OUTPUT = '''\
+List of random items: [- First
+- Second
+    - Third
+]
+'''
+
+        self.assertEqual(output_string, EXPECTED_OUTPUT, _get_comparison_error_message(output_string, EXPECTED_OUTPUT))
+
     def test_extra_dedentation(self):
         with StringIO() as f:
             with _Writer(f) as writer:
@@ -97,3 +116,23 @@ And here's a third line after the extra dedent.
                     writer.write('Unreachable content')
             except:
                 self.assertEqual(f.getvalue(), '', "The written-to file should be empty if an exception is triggered")
+
+    def test_writing_fragments(self):
+        with StringIO() as f:
+            with _Writer(f) as writer:
+                writer.write('Start:')
+                writer.indent()
+                with StringIO() as fragment_file:
+                    with _Writer(fragment_file, writer.get_indent_level()) as fragment_writer:
+                        fragment_writer.write('- Fragment')
+                    writer.write_fragment(fragment_file.getvalue())
+                writer.write('- After the fragment')
+            output_string = f.getvalue()
+
+        EXPECTED_OUTPUT = '''\
+Start:
+    - Fragment
+    - After the fragment
+'''
+
+        self.assertEqual(output_string, EXPECTED_OUTPUT, _get_comparison_error_message(output_string, EXPECTED_OUTPUT))